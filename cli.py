@@ -3,23 +3,48 @@ import json
 import logging
 import os
 from os.path import dirname, join
+import shutil
 import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from copy import copy
-from contextlib import closing
+from contextlib import closing, ExitStack
 from datetime import date
+from glob import glob, has_magic
+from multiprocessing.util import Finalize
+from typing import List, Optional
+
+import requests
 
 from conversion.biosamples import BioSamplesConverter
 from conversion.biostudies import BioStudyConverter
-from conversion.ena.submission import EnaSubmissionConverter
+from conversion.ena.submission import EnaSubmissionConverter, DEFAULT_MAX_BYTES as ENA_MAX_BYTES, DEFAULT_MAX_OBJECTS as ENA_MAX_OBJECTS
 from conversion.ena.response import EnaResponseConverter
 from conversion.ena.manifest import EnaManifestConverter
+from excel.cache import LoadCache
 from excel.markup import ExcelMarkup
+from excel.reader import READERS
 from excel.validate import ValidatingExcel
 from services.biosamples import BioSamples, AapClient
 from services.biostudies import BioStudies
-from services.ena import EnaAction, Ena
+from services.ena import EnaAction, Ena, EnaError
+from services.file_upload import DEFAULT_UPLOAD_WORKERS, get_upload_state_path
+from services.ratelimit import log_limiters
+from services.taxonomy_cache import TaxonomyCache, DEFAULT_CACHE_PATH as TAXONOMY_CACHE_PATH
+from services.taxonomy_index import TaxonomyIndex
+from services.transport import DEFAULT_BACKOFF as HTTP_BACKOFF, DEFAULT_READ_TIMEOUT as HTTP_TIMEOUT, DEFAULT_RETRIES as HTTP_RETRIES, \
+    METRICS as HTTP_METRICS, configure as configure_http
+from submission.entity import Entity
+from submission.submission import Submission
+from submission.journal import SubmissionJournal, get_journal_path
+from submission.submitter import submit_batches, submit_entities
+from validation.base import BaseValidator
+from validation.cache import ResultCache
 from validation.json import JsonValidator
+from validation.local import LocalJsonValidator
 from validation.docker import JsonValidatorDocker
+from validation.scheduler import run_validations
 from validation.taxonomy import TaxonomyValidator
 from validation.upload import UploadValidator
 from validation.xsd import XMLSchemaValidator
@@ -30,71 +55,155 @@ JSON_VALIDATOR_URL = "http://localhost:3020/validate"
 
 
 class CovidExcelUtils:
-    def __init__(self, file_path, output):
+    def __init__(self, file_path, output, reader='openpyxl', cache: LoadCache = None, result_cache: ResultCache = None,
+                 journal: SubmissionJournal = None):
         self.__file_path = file_path
         self.__output = output
+        self.__reader = reader
+        self.__cache = cache
+        self.__result_cache = result_cache
+        # Accessions are journaled as they are received, so an interrupted run does not submit entities again
+        self.journal = journal
         self.excel = None
         self.webin_manifests = {}
-        self.ena_files = {}
+        # The files of each ENA submission, written to ena_dir
+        self.ena_files = []
+        self.ena_dir = None
         self.ena_response = None
 
     def load(self):
         if 'excel' in self.__output:
             self.excel = ExcelMarkup(self.__file_path)
         else:
-            self.excel = ValidatingExcel(self.__file_path)
+            self.excel = ValidatingExcel(self.__file_path, reader=self.__reader, cache=self.__cache)
+        if self.journal:
+            self.journal.replay(self.excel.data)
 
-    def validate(self, submission_converter: EnaSubmissionConverter = None, secure_key: str = None):
-        docker_error = False
-        try:
-            with closing(JsonValidatorDocker(DOCKER_IMAGE, JSON_VALIDATOR_URL)) as json_validator:
-                self.excel.validate(json_validator)
-        except Exception:
-            logging.warning(f'Error validating using JSON Validator on Docker. Will validate using ENA XML schema instead.')
-            docker_error = True
-        self.excel.validate(TaxonomyValidator())
+    def validate(self, submission_converter: EnaSubmissionConverter = None, secure_key: str = None,
+                 json_validator: JsonValidator = None, taxonomy_validator: TaxonomyValidator = None, use_docker=True,
+                 docker_options: dict = None):
+        # Validators that are passed in are reused, otherwise they are created for this validation only
+        def validate_json(data: Submission) -> bool:
+            try:
+                if json_validator:
+                    self.validate_with(json_validator, data)
+                    return False
+                if use_docker:
+                    with closing(JsonValidatorDocker(DOCKER_IMAGE, JSON_VALIDATOR_URL, **(docker_options or {}))) as docker_validator:
+                        self.validate_with(docker_validator, data)
+                    return False
+            except Exception:
+                logging.warning(f'Error validating using JSON Validator on Docker. Will validate using ENA XML schema instead.')
+            return True
+
+        def validate_taxonomy(data: Submission):
+            self.validate_with(taxonomy_validator if taxonomy_validator else TaxonomyValidator(), data)
+
+        def validate_upload(data: Submission):
+            self.validate_with(UploadValidator(secure_key), data)
+
+        # The JSON, taxonomy and upload validators call different services, so they run at the same time
+        validations = [validate_json, validate_taxonomy]
         if secure_key:
-            self.excel.validate(UploadValidator(secure_key))
+            validations.append(validate_upload)
+        docker_error = run_validations(self.excel.data, validations)[0]
+        # The ENA XML schema is only needed when the JSON Validator could not be used
         if docker_error and submission_converter:
-            self.excel.validate(XMLSchemaValidator(submission_converter))
+            self.validate_with(XMLSchemaValidator(submission_converter))
+
+    def validate_with(self, validator: BaseValidator, data: Submission = None):
+        validator.cache = self.__result_cache
+        if data is None:
+            self.excel.validate(validator)
+        else:
+            validator.validate_data(data)
+            logging.debug(f'{validator.__class__} Validation Complete.')
     
+    def add_accession(self, entity: Entity, service: str, accession: str):
+        entity.add_accession(service, accession)
+        if self.journal:
+            self.journal.record(entity, service, accession)
+
+    def get_unsubmitted(self, entity_type: str, service: str) -> List[Entity]:
+        # Entities brokered by an earlier run that was interrupted are not submitted again
+        entities = list(self.excel.data.get_entities(entity_type))
+        if not self.journal:
+            return entities
+        unsubmitted = [entity for entity in entities if not self.journal.is_recorded(entity, service)]
+        if len(unsubmitted) < len(entities):
+            logging.info(f'Skipping {len(entities) - len(unsubmitted)} {entity_type}(s) already submitted to {service}')
+        return unsubmitted
+
     def make_manifests(self, converter: EnaManifestConverter):
         self.webin_manifests = converter.make_manifests(self.excel.data)
 
-    def submit_to_biosamples(self, converter: BioSamplesConverter, service: BioSamples):
-        for sample in self.excel.data.get_entities('sample'):
-            try:
-                converted_sample = converter.convert_sample(sample)
-                response = service.send_sample(converted_sample)
-                if 'accession' in response:
-                    sample.add_accession('BioSamples', response['accession'])
-            except Exception as e:
-                error_msg = f'BioSamples Error: {e}'
-                sample.add_error('sample_accession', error_msg)
+    def submit_to_biosamples(self, converter: BioSamplesConverter, service: BioSamples, workers: int = 1, bulk_size: int = 1) -> dict:
+        def submit_sample(sample: Entity):
+            converted_sample = converter.convert_sample(sample)
+            response = service.send_sample(converted_sample)
+            if 'accession' in response:
+                self.add_accession(sample, 'BioSamples', response['accession'])
 
-    def submit_to_biostudies(self, service: BioStudies):
-        for study in self.excel.data.get_entities("study"):
+        def send_sample(converted_sample) -> dict:
             try:
-                bio_study_submission = BioStudyConverter.convert_study(study)
-                accession = service.send_submission(bio_study_submission)
-                study.add_accession('BioStudies', accession)
+                return service.send_sample(converted_sample)
             except Exception as e:
-                error_msg = f'BioStudies Error: {e}'
-                study.add_error('study_accession', error_msg)
+                return {'error': str(e)}
 
-    def update_biostudies_links(self, service: BioStudies):
-        for study in self.excel.data.get_entities('study'):
-            biostudies_accession = study.get_accession('BioStudies')
-            if biostudies_accession:
+        def submit_samples(samples: List[Entity]) -> List[Optional[str]]:
+            errors: List[Optional[str]] = [None] * len(samples)
+            converted = {}
+            for position, sample in enumerate(samples):
                 try:
-                    biostudies_submission = service.update_links_in_submission(self.excel.data, study)
-                    service.send_submission(biostudies_submission)
+                    converted[position] = converter.convert_sample(sample)
                 except Exception as e:
-                    error_msg = f'BioStudies Error: {e}'
-                    study.add_error('study_accession', error_msg)
+                    errors[position] = str(e)
+            if not converted:
+                return errors
+            try:
+                responses = service.send_samples(list(converted.values()))
+            except requests.HTTPError:
+                # A rejected batch is sent again one sample at a time, so that only the samples at fault get errors
+                responses = [send_sample(converted_sample) for converted_sample in converted.values()]
+            for position, response in zip(converted, responses):
+                if 'accession' in response:
+                    self.add_accession(samples[position], 'BioSamples', response['accession'])
+                else:
+                    errors[position] = response.get('error', 'No accession returned.')
+            return errors
+
+        samples = self.get_unsubmitted('sample', 'BioSamples')
+        if bulk_size > 1:
+            return submit_batches(samples, submit_samples, bulk_size, workers, 'BioSamples', 'sample_accession')
+        return submit_entities(samples, submit_sample, workers, 'BioSamples', 'sample_accession')
+
+    def submit_to_biostudies(self, service: BioStudies, workers: int = 1) -> dict:
+        def submit_study(study: Entity):
+            bio_study_submission = BioStudyConverter.convert_study(study)
+            accession = service.send_submission(bio_study_submission)
+            self.add_accession(study, 'BioStudies', accession)
 
-    def submit_ena(self, converter: EnaSubmissionConverter, service: Ena, action: EnaAction = None, hold_date: date = None, center: str = None):
-        self.ena_files = converter.get_ena_files(self.excel.data)
+        studies = self.get_unsubmitted('study', 'BioStudies')
+        return submit_entities(studies, submit_study, workers, 'BioStudies', 'study_accession')
+
+    def update_biostudies_links(self, service: BioStudies, workers: int = 1) -> dict:
+        # Each worker fetches, updates and sends one study, so the requests for different studies overlap
+        def update_links(study: Entity):
+            if not service.update_links(self.excel.data, study):
+                unchanged.append(study)
+
+        unchanged = []
+        studies = [study for study in self.excel.data.get_entities('study') if study.get_accession('BioStudies')]
+        report = submit_entities(studies, update_links, workers, 'BioStudies', 'study_accession')
+        if unchanged:
+            logging.info(f'Not sending {len(unchanged)} BioStudies submission(s) with no new links')
+        report['unchanged'] = len(unchanged)
+        return report
+
+    def submit_ena(self, converter: EnaSubmissionConverter, service: Ena, action: EnaAction = None, hold_date: date = None, center: str = None,
+                   max_objects: int = ENA_MAX_OBJECTS, max_bytes: int = ENA_MAX_BYTES):
+        self.ena_dir = tempfile.TemporaryDirectory()
+        self.ena_files = converter.write_ena_submissions(self.excel.data, self.ena_dir.name, max_objects, max_bytes)
         if not action:
             action = EnaAction.ADD
             for key in self.excel.data.get_all_accessions().keys():
@@ -103,8 +212,22 @@ class CovidExcelUtils:
                     break
         if not hold_date:
             hold_date = converter.get_release_date(self.excel.data)
-        self.ena_response = service.submit_files(self.ena_files, action, hold_date, center)
-        EnaResponseConverter().convert_response_file(self.excel.data, self.ena_response)
+        responses = []
+        try:
+            for ena_files in self.ena_files:
+                if len(self.ena_files) > 1:
+                    logging.info(f"Sending ENA submission {len(responses) + 1} of {len(self.ena_files)}: {', '.join(ena_files)}")
+                responses.append(service.submit_files(ena_files, action, hold_date, center))
+                # Later submissions refer to the objects of this one, so they are not sent when it fails
+                if not EnaResponseConverter.is_successful(responses[-1]):
+                    break
+        finally:
+            # Accessions received before a failure are still added
+            if responses:
+                self.ena_response = EnaResponseConverter.merge_responses(responses)
+                EnaResponseConverter().convert_response_file(self.excel.data, self.ena_response)
+        if len(responses) < len(self.ena_files):
+            raise EnaError(f'{len(self.ena_files) - len(responses)} of {len(self.ena_files)} ENA submissions were not sent as an earlier submission failed')
 
     def close(self):
         if self.excel:
@@ -114,6 +237,9 @@ class CovidExcelUtils:
                 self.excel.markup_with_errors()
                 self.excel.close()
                 logging.info(f'Excel file updated: {self.__file_path}')
+                # The accessions are now in the excel file, so the next run will update rather than create them
+                if self.journal:
+                    self.journal.complete()
             if self.webin_manifests:
                 dir = dirname(self.__file_path)
                 for file_name, content in self.webin_manifests.items():
@@ -131,15 +257,18 @@ class CovidExcelUtils:
                     self.write_dict(issues_file_path, self.excel.data.get_all_errors())
                     logging.info(f'JSON issues written to: {issues_file_path}')
             if 'ena_xml' in self.__output:
-                if self.ena_files:
-                    for ena_file_name, xml_bytes in self.ena_files.values():
-                        ena_file_path = input_file_name + '_ena_' + ena_file_name
-                        self.write_bytes(ena_file_path, xml_bytes)
+                for number, ena_files in enumerate(self.ena_files, start=1):
+                    prefix = f'{input_file_name}_ena_' if len(self.ena_files) == 1 else f'{input_file_name}_ena_{number}_'
+                    for ena_file_name, file_path in ena_files.values():
+                        ena_file_path = prefix + ena_file_name
+                        shutil.copyfile(file_path, ena_file_path)
                         logging.info(f'ENA Submission File written to: {ena_file_path}')
                 if self.ena_response:
                     ena_file_path = input_file_name + '_ena_RESPONSE.xml'
                     self.write_bytes(ena_file_path, self.ena_response)
                     logging.info(f'ENA Response File written to: {ena_file_path}')
+        if self.ena_dir:
+            self.ena_dir.cleanup()
 
     @staticmethod
     def write_dict(file_path: str, data: dict):
@@ -173,13 +302,181 @@ def set_logging_level(log_level):
     logging.basicConfig(level=numeric_level)
 
 
+def find_excel_files(paths: List[str]) -> List[str]:
+    file_paths = []
+    for path in paths:
+        if os.path.isdir(path):
+            matches = sorted(glob(join(path, '*.xlsx')))
+        elif has_magic(path):
+            # Patterns the shell did not expand, such as quoted patterns or patterns on Windows
+            matches = sorted(glob(path))
+        else:
+            file_paths.append(path)
+            continue
+        for file_path in matches:
+            # Skip the lock files Excel leaves next to open workbooks
+            if not os.path.basename(file_path).startswith('~$'):
+                file_paths.append(file_path)
+    return file_paths
+
+
+def get_docker_options(args: dict) -> dict:
+    return {
+        'pool_size': args['json_validator_containers'],
+        'batch_size': args['json_validator_batch_size'],
+        'concurrency': args['json_validator_concurrency']
+    }
+
+
+def get_http_options(args: dict) -> dict:
+    return {
+        'retries': args['http_retries'],
+        'backoff': args['http_backoff'],
+        'read_timeout': args['http_timeout']
+    }
+
+
+def get_taxonomy_cache_options(args: dict) -> Optional[dict]:
+    if args['no_cache']:
+        return None
+    return {
+        'cache_path': args['taxonomy_cache'],
+        'ttl': args['taxonomy_cache_days'] * 24 * 60 * 60,
+        'error_ttl': args['taxonomy_cache_error_hours'] * 60 * 60
+    }
+
+
+# Validators shared by every file processed in a batch worker process
+batch_validators = {}
+
+
+def init_batch_worker(json_validator: str, json_validator_urls: List[str], docker_options: dict, no_cache: bool,
+                      taxonomy_cache_options: Optional[dict], taxonomy_index: Optional[str], log_level: str, http_options: dict):
+    # Workers started with spawn rather than fork do not inherit the settings of the parent process
+    set_logging_level(log_level)
+    configure_http(**http_options)
+    batch_validators['cache'] = None if no_cache else ResultCache()
+    if json_validator == 'local':
+        batch_validators['json'] = LocalJsonValidator()
+    elif json_validator_urls:
+        batch_validators['json'] = JsonValidator(
+            json_validator_urls[0], json_validator_urls, docker_options['batch_size'], docker_options['concurrency'])
+    else:
+        batch_validators['json'] = None
+    batch_validators['taxonomy_cache'] = TaxonomyCache(**taxonomy_cache_options) if taxonomy_cache_options else None
+    batch_validators['taxonomy_index'] = TaxonomyIndex(taxonomy_index) if taxonomy_index else None
+    batch_validators['taxonomy'] = TaxonomyValidator(
+        batch_validators['taxonomy_cache'], taxonomy_index=batch_validators['taxonomy_index'])
+    # The pool does not tell its workers that it is shutting down, so the worker is closed as its process exits
+    Finalize(None, close_batch_worker, exitpriority=10)
+
+
+def close_batch_worker():
+    for resource in ('cache', 'taxonomy_cache', 'taxonomy_index'):
+        if batch_validators.get(resource):
+            batch_validators.pop(resource).close()
+    logging.info(f'Batch worker {os.getpid()} finished')
+    HTTP_METRICS.log_report()
+    log_limiters()
+
+
+def process_batch_file(file_path: str, outputs: List[str], args: dict) -> dict:
+    summary = {'file': file_path, 'entities': 0, 'issues': {}, 'status': 'OK', 'cache_hits': 0, 'cache_misses': 0}
+    start = time.perf_counter()
+    result_cache = batch_validators['cache']
+    if result_cache:
+        cache_hits, cache_misses = result_cache.total('hits'), result_cache.total('misses')
+    try:
+        load_cache = None if args['no_cache'] else LoadCache()
+        with closing(CovidExcelUtils(file_path, outputs, args['excel_reader'], load_cache, result_cache)) as excel_utils:
+            excel_utils.load()
+            if not excel_utils.excel.data.has_data():
+                summary['status'] = 'No Data'
+                return summary
+            # Counted before validation, so that files with errors still report what was loaded
+            for entities in excel_utils.excel.data.get_all_entities().values():
+                summary['entities'] += len(entities)
+            if args['webin_manifests']:
+                ena_converter = EnaSubmissionConverter(['ENA_Study', 'ENA_Sample'])
+            else:
+                ena_converter = EnaSubmissionConverter()
+            excel_utils.validate(
+                ena_converter, args['secure_key'],
+                json_validator=batch_validators['json'],
+                taxonomy_validator=batch_validators['taxonomy'],
+                use_docker=False
+            )
+            if args['webin_manifests']:
+                manifest_converter = EnaManifestConverter(JsonValidator('').schema_by_type['run_experiment'])
+                excel_utils.make_manifests(manifest_converter)
+            for entity_type, indexed_entities in excel_utils.excel.data.get_all_errors().items():
+                summary['issues'][entity_type] = len(indexed_entities)
+            if summary['issues']:
+                summary['status'] = 'Issues'
+    except Exception as error:
+        logging.error(f'Error processing {file_path}: {error}')
+        summary['status'] = f'Error: {error}'
+    finally:
+        summary['seconds'] = time.perf_counter() - start
+        if result_cache:
+            summary['cache_hits'] = result_cache.total('hits') - cache_hits
+            summary['cache_misses'] = result_cache.total('misses') - cache_misses
+    return summary
+
+
+def run_batch(file_paths: List[str], outputs: List[str], args: dict) -> List[dict]:
+    with ExitStack() as stack:
+        # The JSON Validator containers are started once and shared by every worker
+        json_validator_urls = None
+        if args['json_validator'] == 'docker':
+            try:
+                docker_validator = stack.enter_context(closing(JsonValidatorDocker(
+                    DOCKER_IMAGE, JSON_VALIDATOR_URL, **get_docker_options(args))))
+                json_validator_urls = docker_validator.validator_urls
+            except Exception:
+                logging.warning(f'Error starting JSON Validator on Docker. Will validate using ENA XML schema instead.')
+        logging.info(f"Processing {len(file_paths)} excel file(s) with {args['workers']} worker(s)")
+        with ProcessPoolExecutor(
+                max_workers=args['workers'],
+                initializer=init_batch_worker,
+                initargs=(args['json_validator'], json_validator_urls, get_docker_options(args), args['no_cache'],
+                          get_taxonomy_cache_options(args), args['taxonomy_index'], args['log_level'],
+                          get_http_options(args))) as pool:
+            futures = [pool.submit(process_batch_file, file_path, outputs, args) for file_path in file_paths]
+            return [future.result() for future in futures]
+
+
+def print_batch_summary(summaries: List[dict]):
+    file_width = max([len('File')] + [len(summary['file']) for summary in summaries])
+    print(f"{'File':<{file_width}}  {'Entities':>8}  {'Seconds':>7}  Status")
+    for summary in summaries:
+        status = summary['status']
+        if summary['issues']:
+            issues = ', '.join(f'{count} {entity_type}(s)' for entity_type, count in summary['issues'].items())
+            status = f'{status}: {issues}'
+        print(f"{summary['file']:<{file_width}}  {summary['entities']:>8}  {summary['seconds']:>7.1f}  {status}")
+    cache_hits = sum(summary['cache_hits'] for summary in summaries)
+    cache_misses = sum(summary['cache_misses'] for summary in summaries)
+    if cache_hits or cache_misses:
+        print(f'Validation cache: {cache_hits} hit(s) {cache_misses} miss(es)')
+
+
+def process_batch(file_paths: List[str], outputs: List[str], args: dict) -> int:
+    # Returns the exit code, which is 2 if any file could not be processed
+    summaries = run_batch(file_paths, outputs, args)
+    print_batch_summary(summaries)
+    if any(summary['status'].startswith('Error') for summary in summaries):
+        return 2
+    return 0
+
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(
         description='Parse, Validate and Submit excel files to EBI Resources'
     )
     parser.add_argument(
-        'file_path', type=str,
-        help='path of excel file to load'
+        'file_paths', type=str, nargs='+',
+        help='path of excel file(s) to load, directories will load every .xlsx file they contain'
     )
     accepted_outputs = ['all', 'excel', 'json', 'ena_xml']
     parser.add_argument(
@@ -195,6 +492,14 @@ if __name__ == '__main__':
         '--biosamples_domain', type=str,
         help='Set the default BioSamples domain to use when the domain is not found in the excel file.'
     )
+    parser.add_argument(
+        '--biosamples_workers', type=int, default=4,
+        help='Number of samples sent to BioSamples at the same time, default is 4'
+    )
+    parser.add_argument(
+        '--biosamples_bulk_size', type=int, default=1,
+        help='Number of samples sent in each request to the BioSamples bulk-submit endpoint, default is 1 which sends each sample on its own'
+    )
     parser.add_argument(
         '--biosamples_url', type=str, default='https://www.ebi.ac.uk/biosamples',
         help='Override the default URL for BioSamples API: https://www.ebi.ac.uk/biosamples'
@@ -208,6 +513,14 @@ if __name__ == '__main__':
         '--biostudies_url', type=str, default='http://biostudy-bia.ebi.ac.uk:8788',
         help='Override the default URL for BioStudies REST API: http://biostudy-bia.ebi.ac.uk:8788'
     )
+    parser.add_argument(
+        '--biostudies_workers', type=int, default=4,
+        help='Number of studies sent to BioStudies at the same time, default is 4'
+    )
+    parser.add_argument(
+        '--biostudies_upload_workers', type=int, default=DEFAULT_UPLOAD_WORKERS,
+        help=f'Number of files uploaded to BioStudies at the same time, default is {DEFAULT_UPLOAD_WORKERS}'
+    )
     parser.add_argument(
         '--aap_url', type=str, default='https://api.aai.ebi.ac.uk',
         help='Override the default URL for AAP API: https://api.aai.ebi.ac.uk'
@@ -236,10 +549,74 @@ if __name__ == '__main__':
         '--ena_center_name', type=str,
         help='Define a submitting center name to use when submitting to ENA'
     )
+    parser.add_argument(
+        '--ena_max_objects', type=int, default=ENA_MAX_OBJECTS,
+        help=f'Split the ENA submission so that each submission has at most this many objects, default is {ENA_MAX_OBJECTS}'
+    )
+    parser.add_argument(
+        '--ena_max_mb', type=float, default=ENA_MAX_BYTES / 1024 / 1024,
+        help=f'Split the ENA submission so that the files of each submission are at most about this many megabytes, default is {ENA_MAX_BYTES // 1024 // 1024}'
+    )
     parser.add_argument(
         '--secure_key', type=str,
         help='The secure key used when uploading files to the drag-and-drop data submission tool, if this is present we will validate that all the files are accounted for. Format: xxxxx-xxx-xxxx-xxxxx'
     )
+    parser.add_argument(
+        '--excel_reader', type=str, default='openpyxl', choices=list(READERS),
+        help='Override the backend used to read excel files when the excel file is not updated: openpyxl. "xlsx" streams values directly from the xlsx file, which is faster for large spreadsheets'
+    )
+    parser.add_argument(
+        '--no_cache', action='store_true',
+        help='Do not use or update the caches of previously loaded excel files, validation results and taxonomy answers. The excel cache is only used when the excel file is not updated'
+    )
+    parser.add_argument(
+        '--taxonomy_cache', type=str, default=TAXONOMY_CACHE_PATH,
+        help=f'Override the file that keeps answers from the ENA Taxonomy service between runs: {TAXONOMY_CACHE_PATH}'
+    )
+    parser.add_argument(
+        '--taxonomy_cache_days', type=float, default=30,
+        help='Number of days a taxonomy found by the ENA Taxonomy service is kept, default is 30'
+    )
+    parser.add_argument(
+        '--taxonomy_cache_error_hours', type=float, default=24,
+        help='Number of hours a taxonomy not found by the ENA Taxonomy service is kept, default is 24'
+    )
+    parser.add_argument(
+        '--taxonomy_index', type=str,
+        help='Validate taxonomy against a local index instead of the ENA Taxonomy service, build the index with: python3 -m services.taxonomy_index'
+    )
+    parser.add_argument(
+        '--workers', type=int, default=1,
+        help='Number of processes used to load and validate multiple excel files in parallel, default is 1'
+    )
+    parser.add_argument(
+        '--json_validator', type=str, default='docker', choices=['docker', 'local'],
+        help='Override the JSON Schema validator: docker. "local" validates in process without Docker, giving the same errors'
+    )
+    parser.add_argument(
+        '--json_validator_batch_size', type=int, default=1,
+        help='Number of entities sent to the JSON Validator in each request, with the schema sent once. Falls back to one entity per request if the validator does not accept batches, default is 1'
+    )
+    parser.add_argument(
+        '--json_validator_concurrency', type=int, default=1,
+        help='Number of requests sent to the JSON Validator at the same time, default is 1'
+    )
+    parser.add_argument(
+        '--json_validator_containers', type=int, default=1,
+        help='Number of JSON Validator containers started on consecutive ports, requests are spread across them, default is 1'
+    )
+    parser.add_argument(
+        '--http_retries', type=int, default=HTTP_RETRIES,
+        help=f'Number of times a request to an EBI service or the JSON Validator is sent again after a server error or a failed connection, default is {HTTP_RETRIES}. Submissions are only sent again after a failed connection'
+    )
+    parser.add_argument(
+        '--http_backoff', type=float, default=HTTP_BACKOFF,
+        help=f'Seconds to wait before the first retry of a request, doubled for each retry after, default is {HTTP_BACKOFF}'
+    )
+    parser.add_argument(
+        '--http_timeout', type=float, default=HTTP_TIMEOUT,
+        help=f'Seconds to wait for a response from an EBI service or the JSON Validator, default is {HTTP_TIMEOUT}'
+    )
     parser.add_argument(
         '--log_level', '-l', type=str, default='INFO',
         help='Override the default logging level: INFO',
@@ -247,6 +624,7 @@ if __name__ == '__main__':
     )
     args = vars(parser.parse_args())
     set_logging_level(args['log_level'])
+    configure_http(**get_http_options(args))
     outputs = args['output'].split(',')
     for out in outputs:
         if out not in accepted_outputs:
@@ -255,16 +633,44 @@ if __name__ == '__main__':
     if 'all' in outputs:
         outputs = copy(accepted_outputs)
         outputs.remove('all')
-    with closing(CovidExcelUtils(args['file_path'], outputs)) as excel_utils:
+    file_paths = find_excel_files(args['file_paths'])
+    if not file_paths:
+        logging.error(f"No excel files found in: {args['file_paths']}")
+        sys.exit(2)
+    if len(file_paths) > 1:
+        if args['biosamples'] or args['biostudies'] or args['ena']:
+            logging.error('Brokering is only supported for a single excel file.')
+            sys.exit(2)
+        sys.exit(process_batch(file_paths, outputs, args))
+    file_path = file_paths[0]
+    load_cache = None if args['no_cache'] else LoadCache()
+    result_cache = None if args['no_cache'] else ResultCache()
+    taxonomy_cache_options = get_taxonomy_cache_options(args)
+    with ExitStack() as exit_stack:
+        # Registered first so that they are logged last, once every service is done
+        exit_stack.callback(log_limiters)
+        exit_stack.callback(HTTP_METRICS.log_report)
+        if result_cache:
+            exit_stack.enter_context(closing(result_cache))
+        taxonomy_cache = exit_stack.enter_context(closing(TaxonomyCache(**taxonomy_cache_options))) if taxonomy_cache_options else None
+        taxonomy_index = exit_stack.enter_context(closing(TaxonomyIndex(args['taxonomy_index']))) if args['taxonomy_index'] else None
+        journal = None
+        if args['biosamples'] or args['biostudies'] or args['ena']:
+            journal = exit_stack.enter_context(closing(SubmissionJournal(get_journal_path(file_path))))
+        excel_utils = exit_stack.enter_context(closing(
+            CovidExcelUtils(file_path, outputs, args['excel_reader'], load_cache, result_cache, journal)))
         excel_utils.load()
         if args['webin_manifests']:
             ena_converter = EnaSubmissionConverter(['ENA_Study','ENA_Sample'])
         else:
             ena_converter = EnaSubmissionConverter()
-        if not excel_utils.excel.data.has_data:
-            logging.info(f"No Data imported from: {args['file_path']}")
+        if not excel_utils.excel.data.has_data():
+            logging.info(f"No Data imported from: {file_path}")
             sys.exit(0)
-        excel_utils.validate(ena_converter, args['secure_key'])
+        json_validator = LocalJsonValidator() if args['json_validator'] == 'local' else None
+        excel_utils.validate(ena_converter, args['secure_key'], json_validator=json_validator,
+                             taxonomy_validator=TaxonomyValidator(taxonomy_cache, taxonomy_index=taxonomy_index),
+                             docker_options=get_docker_options(args))
         if excel_utils.excel.data.has_errors():
             message = 'Issues detected:'
             for entity_type, indexed_entities in excel_utils.excel.data.get_all_errors().items():
@@ -290,7 +696,8 @@ if __name__ == '__main__':
                 aap_client = AapClient(url=args['aap_url'], username=os.environ['AAP_USERNAME'], password=os.environ['AAP_PASSWORD'])
                 biosamples_service = BioSamples(aap_client, args['biosamples_url'])
                 biosamples_converter = BioSamplesConverter(excel_utils.excel.column_map, args['biosamples_domain'])
-                excel_utils.submit_to_biosamples(biosamples_converter, biosamples_service)
+                excel_utils.submit_to_biosamples(
+                    biosamples_converter, biosamples_service, args['biosamples_workers'], args['biosamples_bulk_size'])
             except Exception as error:
                 logging.error(f'BioSamples Error: {error}')
                 sys.exit(2)
@@ -306,8 +713,10 @@ if __name__ == '__main__':
                 sys.exit(2)
             logging.info(f"Attempting to Submit to BioStudies: {args['biostudies_url']}")
             try:
-                biostudies_service = BioStudies(args['biostudies_url'], os.environ['BIOSTUDIES_USERNAME'], os.environ['BIOSTUDIES_PASSWORD'])
-                excel_utils.submit_to_biostudies(biostudies_service)
+                biostudies_service = BioStudies(
+                    args['biostudies_url'], os.environ['BIOSTUDIES_USERNAME'], os.environ['BIOSTUDIES_PASSWORD'],
+                    args['biostudies_upload_workers'], get_upload_state_path(file_path))
+                excel_utils.submit_to_biostudies(biostudies_service, args['biostudies_workers'])
             except Exception as error:
                 logging.error(f'BioStudies Error: {error}')
                 sys.exit(2)
@@ -325,7 +734,9 @@ if __name__ == '__main__':
             logging.info(f"Attempting to Submit to ENA: {args['ena_url']}")
             try:
                 ena_service = Ena(os.environ['ENA_USERNAME'], os.environ['ENA_PASSWORD'], args['ena_url'])
-                excel_utils.submit_ena(ena_converter, ena_service, ena_action, args['ena_hold_date'], args['ena_center_name'])
+                excel_utils.submit_ena(
+                    ena_converter, ena_service, ena_action, args['ena_hold_date'], args['ena_center_name'],
+                    args['ena_max_objects'], int(args['ena_max_mb'] * 1024 * 1024))
             except Exception as error:
                 logging.error(f'ENA Error: {error}')
                 sys.exit(2)
@@ -336,4 +747,4 @@ if __name__ == '__main__':
 
         if biostudies_service:
             logging.info(f"Updating BioStudies Links: {args['biostudies_url']}")
-            excel_utils.update_biostudies_links(biostudies_service)
+            excel_utils.update_biostudies_links(biostudies_service, args['biostudies_workers'])
@@ -2,6 +2,7 @@ import logging
 import re
 from re import Match
 from io import BytesIO
+from typing import List
 from xml.etree.ElementTree import Element
 
 from lxml import etree
@@ -34,6 +35,36 @@ class EnaResponseConverter:
             self.__add_accessions(submission, response, submission_entity)
         self.__add_errors(submission, response)
 
+    @staticmethod
+    def is_successful(ena_response_file: bytes) -> bool:
+        return etree.parse(BytesIO(ena_response_file)).getroot().get('success') == 'true'
+
+    @staticmethod
+    def merge_responses(ena_response_files: List[bytes]) -> bytes:
+        # Merges the receipts of a submission that was split into several ENA submissions into one receipt.
+        # The receipt is successful when any of the submissions was, so that the accessions it received are kept.
+        # Only a successful submission is kept as the submission of the receipt.
+        receipts = [etree.parse(BytesIO(ena_response_file)).getroot() for ena_response_file in ena_response_files]
+        if len(receipts) == 1:
+            return ena_response_files[0]
+        merged = etree.Element(receipts[0].tag, receipts[0].attrib)
+        merged.set('success', 'true' if any(receipt.get('success') == 'true' for receipt in receipts) else 'false')
+        messages = []
+        actions = []
+        for receipt in receipts:
+            for element in list(receipt):
+                if element.tag == 'MESSAGES':
+                    messages.extend(element)
+                elif element.tag == 'ACTIONS':
+                    if element.text not in actions:
+                        actions.append(element.text)
+                elif element.tag != 'SUBMISSION' or receipt.get('success') == 'true':
+                    merged.append(element)
+        etree.SubElement(merged, 'MESSAGES').extend(messages)
+        for action in actions:
+            etree.SubElement(merged, 'ACTIONS').text = action
+        return etree.tostring(merged, xml_declaration=True, pretty_print=True, encoding='UTF-8')
+
     @staticmethod
     def __add_excel_submission(submission: ExcelSubmission, response: Element) -> Entity:
         ena_entity = list(response.iter('SUBMISSION')).pop()
@@ -1,6 +1,7 @@
 from conversion.ena.base import BaseEnaConverter
 from datetime import date
-from typing import Dict, List, Tuple
+from os.path import join
+from typing import BinaryIO, Dict, List, Tuple
 from xml.etree.ElementTree import Element
 
 from lxml import etree
@@ -13,6 +14,9 @@ from .sample import EnaSampleConverter
 from .experiment import EnaExperimentConverter
 from .run import EnaRunConverter
 
+DEFAULT_MAX_OBJECTS = 5000
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
 
 class EnaSubmissionConverter:
     def __init__(self, target_objects: List[str] = None):
@@ -43,6 +47,47 @@ class EnaSubmissionConverter:
                 ena_files[ena_type] = (f'{ena_type}.xml', self.make_ena_file(ena_set))
         return ena_files
 
+    def write_ena_submissions(self, data: Submission, directory: str, max_objects: int = DEFAULT_MAX_OBJECTS,
+                              max_bytes: int = DEFAULT_MAX_BYTES) -> List[Dict[str, Tuple[str, str]]]:
+        # Writes the ENA files to directory, one object at a time, split into submissions of at most max_objects objects
+        # and about max_bytes. Objects are written in the order of conversion_map, so the projects and samples that an
+        # experiment or run refers to are always in the same or an earlier submission.
+        # Returns the files of each submission, by ENA type: (file name, file path)
+        submissions: List[Dict[str, Tuple[str, str]]] = [{}]
+        open_files: Dict[str, BinaryIO] = {}
+        objects = size = 0
+        try:
+            for entity_type, converter in self.conversion_map:
+                ena_type = converter.ena_type.upper()
+                for entity in data.get_entities(entity_type):
+                    ena_conversion = self.convert_entity(converter, data, entity)
+                    if ena_conversion is None:
+                        continue
+                    xml_bytes = etree.tostring(ena_conversion, pretty_print=True, encoding='UTF-8')
+                    if objects and (objects >= max_objects or size + len(xml_bytes) > max_bytes):
+                        self.close_ena_files(open_files)
+                        submissions.append({})
+                        objects = size = 0
+                    if ena_type not in open_files:
+                        file_name = f'{ena_type}.xml'
+                        file_path = join(directory, f'{len(submissions)}_{file_name}')
+                        open_files[ena_type] = open(file_path, 'wb')
+                        open_files[ena_type].write(f"<?xml version='1.0' encoding='UTF-8'?>\n<{ena_type}_SET>\n".encode('utf-8'))
+                        submissions[-1][ena_type] = (file_name, file_path)
+                    open_files[ena_type].write(xml_bytes)
+                    objects += 1
+                    size += len(xml_bytes)
+        finally:
+            self.close_ena_files(open_files)
+        return [submission for submission in submissions if submission]
+
+    @staticmethod
+    def close_ena_files(open_files: Dict[str, BinaryIO]):
+        for ena_type, open_file in open_files.items():
+            open_file.write(f'</{ena_type}_SET>\n'.encode('utf-8'))
+            open_file.close()
+        open_files.clear()
+
     @staticmethod
     def convert_entity(converter: BaseEnaConverter, data, entity):
         if isinstance(converter, EnaExperimentConverter):
@@ -0,0 +1,94 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import time
+from os.path import expanduser, join
+from typing import Optional
+
+DEFAULT_CACHE_DIR = join(expanduser('~'), '.cache', 'covid-excel-utils', 'load')
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60
+CACHE_VERSION = 1
+ENTRY_SUFFIX = '.pickle'
+
+
+class LoadCache:
+    # On-disk cache of loaded spreadsheets, keyed by the content of the workbook and the loader settings
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES, max_age: float = DEFAULT_MAX_AGE):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(excel_path: str, sheet_index: int, header_rows: int) -> str:
+        digest = hashlib.sha256()
+        with open(excel_path, 'rb') as excel_file:
+            for chunk in iter(lambda: excel_file.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return f'{digest.hexdigest()}-{sheet_index}-{header_rows}-v{CACHE_VERSION}'
+
+    def get(self, key: str) -> Optional[object]:
+        entry_path = self.__entry_path(key)
+        try:
+            if time.time() - os.path.getmtime(entry_path) > self.max_age:
+                self.__remove(entry_path)
+                return None
+            with open(entry_path, 'rb') as entry_file:
+                value = pickle.load(entry_file)
+        except FileNotFoundError:
+            return None
+        except Exception as error:
+            logging.warning(f'Discarding unreadable load cache entry {entry_path}: {error}')
+            self.__remove(entry_path)
+            return None
+        # Recently used entries are the last to be evicted
+        os.utime(entry_path)
+        logging.debug(f'Load cache hit: {key}')
+        return value
+
+    def put(self, key: str, value: object):
+        # Written to a temporary file first so that readers never see a partial entry
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as temp_file:
+                pickle.dump(value, temp_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.__entry_path(key))
+        except Exception:
+            self.__remove(temp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        entries = []
+        now = time.time()
+        for file_name in os.listdir(self.cache_dir):
+            if not file_name.endswith(ENTRY_SUFFIX):
+                continue
+            entry_path = join(self.cache_dir, file_name)
+            try:
+                stat = os.stat(entry_path)
+            except FileNotFoundError:
+                continue
+            if now - stat.st_mtime > self.max_age:
+                self.__remove(entry_path)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, entry_path))
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            self.__remove(entry_path)
+            total_bytes -= size
+
+    def __entry_path(self, key: str) -> str:
+        return join(self.cache_dir, key + ENTRY_SUFFIX)
+
+    @staticmethod
+    def __remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
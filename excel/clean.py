@@ -1,4 +1,4 @@
-from datetime import date
+from datetime import date, datetime, time
 from typing import List
 
 
@@ -48,6 +48,19 @@ def is_value_populated(value: str) -> bool:
     return stripped_value
 
 
+def clean_cell_value(value):
+    # Dates are stored as ISO dates, everything else as stripped text, blank text is discarded
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, str):
+        if not is_value_populated(value):
+            return None
+        return value.strip()
+    return str(value).strip()
+
+
 def is_valid_date(value: str) -> bool:
     try:
         date.fromisoformat(value)
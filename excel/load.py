@@ -1,13 +1,17 @@
 import logging
-from contextlib import closing
-from typing import List
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, List, Tuple
 
-from openpyxl import load_workbook
+from openpyxl.utils import column_index_from_string, get_column_letter
 
 from submission.entity import Entity
-from .clean import clean_entity_name, clean_name, is_value_populated
+from .cache import LoadCache
+from .clean import clean_cell_value, clean_entity_name, clean_name
+from .reader import READERS
+from .session import WorkbookSession
 from .submission import ExcelSubmission
 
+HEADER_ROWS = 5
 POSSIBLE_KEYS = ['alias', 'index', 'name']
 SERVICE_MAP = {
     'study': 'BioStudies',
@@ -28,75 +32,142 @@ SERVICE_NAMES = {
 
 
 class ExcelLoader:
-    def __init__(self, excel_path: str, sheet_index=0):
+    def __init__(self, excel_path: str, sheet_index=0, session: WorkbookSession = None, reader='openpyxl', cache: LoadCache = None):
         # ToDo: Accept param for number of header rows, columns
+        if reader not in READERS:
+            raise ValueError(f'Unknown excel reader: {reader}, accepted readers: {list(READERS)}')
         self.__path = excel_path
         self.__sheet_index = sheet_index
-        with closing(load_workbook(filename=self.__path, read_only=True, keep_links=False)) as workbook:
-            worksheet = workbook.worksheets[self.__sheet_index]
+        self.__session = session
+        self.__reader = READERS[reader]
+        self.__data = None
+        self.__rows = None
+        # A shared session may hold changes that are not yet saved, so is never cached
+        self.__cache = cache if not session else None
+        if self.__cache:
+            self.__cache_key = self.__cache.key(excel_path, sheet_index, HEADER_ROWS)
+            cached = self.__cache.get(self.__cache_key)
+            if cached:
+                self.column_map, self.__rows = cached
+                return
+        with self.__open_worksheet() as worksheet:
             self.column_map = self.get_column_map(worksheet)
-            self.data = self.get_data(worksheet, self.column_map)
+
+    @property
+    def data(self) -> ExcelSubmission:
+        # The full submission is only built when a stage needs the links between rows
+        if self.__data is None:
+            self.__data = self.map_rows(self.iter_entities())
+        return self.__data
+
+    def iter_entities(self) -> Iterator[Tuple[int, str, dict]]:
+        # Streams (row_index, entity_type, attributes) as the worksheet is parsed
+        if self.__rows is not None:
+            for row_index, entity_type, attributes in self.__rows:
+                yield row_index, entity_type, dict(attributes)
+            return
+        rows = [] if self.__cache else None
+        with self.__open_worksheet() as worksheet:
+            for row_index, entity_type, attributes in self.iter_rows(worksheet, self.column_map):
+                if rows is not None:
+                    rows.append((row_index, entity_type, dict(attributes)))
+                yield row_index, entity_type, attributes
+        if rows is not None:
+            self.__rows = rows
+            self.__cache.put(self.__cache_key, (self.column_map, rows))
+
+    @contextmanager
+    def __open_worksheet(self):
+        # A shared session is left open for its owner to close
+        if self.__session:
+            yield self.__session.worksheet(self.__sheet_index)
+        else:
+            with self.__reader(self.__path, self.__sheet_index) as worksheet:
+                yield worksheet
 
     @staticmethod
     def get_column_map(worksheet) -> dict:
-        # Uses iter_rows for faster reads, requires workbook read_only=True
+        # Uses iter_rows(values_only=True) for faster reads
         column_map = {}
         header_rows = []
         object_name = False
-        for row in worksheet.iter_rows(min_col=2, max_row=5):
+        for row in worksheet.iter_rows(min_col=2, max_row=HEADER_ROWS, values_only=True):
             header_rows.append(row)
         for column_index in range(0, len(header_rows[0])):
-            object_cell = header_rows[0][column_index]
-            attribute_cell = header_rows[1][column_index]
-            units_cell = header_rows[4][column_index]
+            column_letter = get_column_letter(column_index + 2)
+            object_value = header_rows[0][column_index]
+            attribute_value = header_rows[1][column_index]
+            units_value = header_rows[4][column_index]
             column_info = {}
 
             # Update Object Name otherwise use most recent Object found
-            if object_cell.value is not None:
-                object_name = clean_entity_name(object_cell.value)
+            if object_value is not None:
+                object_name = clean_entity_name(object_value)
             if object_name:
                 column_info['object'] = object_name
-            if units_cell.value is not None:
-                column_info['units'] = units_cell.value
-            if attribute_cell.value is not None:
-                column_info['attribute'] = clean_name(attribute_cell.value)
-                column_map[attribute_cell.column_letter] = column_info
+            if units_value is not None:
+                column_info['units'] = units_value
+            if attribute_value is not None:
+                column_info['attribute'] = clean_name(attribute_value)
+                column_map[column_letter] = column_info
             else:
-                logging.warning(f'No heading found for column: {attribute_cell.column_letter}, values will not be imported.')
+                logging.warning(f'No heading found for column: {column_letter}, values will not be imported.')
         return column_map
 
     @staticmethod
     def get_data(worksheet, column_map: dict) -> ExcelSubmission:
+        return ExcelLoader.map_rows(ExcelLoader.iter_rows(worksheet, column_map))
+
+    @staticmethod
+    def map_rows(rows: Iterable[Tuple[int, str, dict]]) -> ExcelSubmission:
         data = ExcelSubmission()
-        # Import cell values into data object
-        # Uses .iter_rows for faster reads, requires workbook read_only=True
-        row_index = 6
-        for row in worksheet.iter_rows(min_row=row_index, min_col=2):
+        for row_index, entity_type, attributes in rows:
+            ExcelLoader.map_row_entity(data, row_index, entity_type, attributes)
+        return data
+
+    @staticmethod
+    def get_column_plan(column_map: dict) -> Tuple[Tuple[int, str, str, Callable], ...]:
+        # Compiles the column map into (position, object, attribute, converter) slots,
+        # positions are relative to column B and columns without a heading are left out
+        plan = []
+        for column_letter, column_info in column_map.items():
+            if 'object' in column_info and 'attribute' in column_info:
+                position = column_index_from_string(column_letter) - 2
+                plan.append((position, column_info['object'], column_info['attribute'], clean_cell_value))
+        plan.sort(key=lambda slot: slot[0])
+        return tuple(plan)
+
+    @staticmethod
+    def iter_rows(worksheet, column_map: dict) -> Iterator[Tuple[int, str, dict]]:
+        # Import cell values one row at a time
+        # Uses .iter_rows(values_only=True) so no cell objects are needed,
+        # dates are already converted by openpyxl according to each cell's number format
+        plan = ExcelLoader.get_column_plan(column_map)
+        if not plan:
+            return
+        width = plan[-1][0] + 1
+        row_index = HEADER_ROWS + 1
+        for row in worksheet.iter_rows(min_row=row_index, min_col=2, max_col=width + 1, values_only=True):
             row_data = {}
-            for cell in row:
-                if cell.value is not None and (cell.is_date or not isinstance(cell.value, str) or is_value_populated(cell.value)):
-                    if cell.is_date:
-                        value = cell.value.date().isoformat()
-                    else:
-                        value = str(cell.value).strip()
-                    if cell.column_letter in column_map:
-                        object_name = column_map[cell.column_letter]['object']
-                        attribute_name = column_map[cell.column_letter]['attribute']
+            row_width = len(row)
+            for position, object_name, attribute_name, converter in plan:
+                if position >= row_width:
+                    break
+                value = row[position]
+                if value is not None:
+                    value = converter(value)
+                    if value is not None:
                         row_data.setdefault(object_name, {})[attribute_name] = value
             for entity_type, attributes in row_data.items():
-                ExcelLoader.map_row_entity(data, row_index, entity_type, attributes)
+                yield row_index, entity_type, attributes
 
             row_index = row_index + 1
-        return data
 
     @staticmethod
     def map_row_entity(submission: ExcelSubmission, row: int, entity_type: str, attributes: dict) -> Entity:
         accession_attribute = ExcelLoader.default_accession_attribute(entity_type)
         accession = attributes.get(accession_attribute, None)
-        if accession:
-            index = accession
-        else:
-            index = ExcelLoader.get_index(entity_type, row, attributes)
+        index = ExcelLoader.get_row_index(entity_type, row, attributes)
         entity = submission.map_row(row, entity_type, index, attributes)
         if accession and entity_type in SERVICE_MAP:
             entity.add_accession(SERVICE_MAP[entity_type], accession)
@@ -118,6 +189,14 @@ class ExcelLoader:
     def service_accession_attribute(entity_type: str, service: str):
         return f'{entity_type.lower()}_{service.lower()}_accession'
 
+    @staticmethod
+    def get_row_index(entity_type: str, row: int, attributes: dict) -> str:
+        # Accessions take priority over any other index
+        accession = attributes.get(ExcelLoader.default_accession_attribute(entity_type), None)
+        if accession:
+            return accession
+        return ExcelLoader.get_index(entity_type, row, attributes)
+
     @staticmethod
     def get_index(entity_type: str, row: int, attributes: dict) -> str:
         # Find index in the form 'study_alias', study_index, study_name, ect
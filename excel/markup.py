@@ -1,26 +1,26 @@
-from contextlib import closing
 from typing import List
 
-from openpyxl import load_workbook
 from openpyxl.styles import PatternFill
 from openpyxl.comments import Comment
 from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.worksheet import Worksheet
+from .session import WorkbookSession
 from .validate import ValidatingExcel
 
 
 class ExcelMarkup(ValidatingExcel):
-    def __init__(self, excel_path: str, sheet_index=0):
-        self.__clear_markup(excel_path, sheet_index)
-        super().__init__(excel_path, sheet_index)
-        self.__path = excel_path
-        self.__sheet_index = sheet_index
-        self.__book = load_workbook(filename=excel_path, keep_links=False)
-        self.__sheet = self.__book.worksheets[self.__sheet_index]
+    def __init__(self, excel_path: str, sheet_index=0, session: WorkbookSession = None):
+        self.__owns_session = session is None
+        self.session = session if session else WorkbookSession(excel_path)
+        self.__sheet = self.session.worksheet(sheet_index)
+        self.__clear_markup(self.__sheet)
+        self.session.modified = True
+        super().__init__(excel_path, sheet_index, self.session)
         self.attribute_map = self.reverse_column_map(self.column_map)
     
     def close(self):
-        self.__book.save(self.__path)
-        self.__book.close()
+        if self.__owns_session:
+            self.session.close()
 
     def markup_with_errors(self):
         error_fill = PatternFill(fill_type='solid', start_color='FF0000')
@@ -93,17 +93,14 @@ class ExcelMarkup(ValidatingExcel):
         return attribute_map
 
     @staticmethod
-    def __clear_markup(excel_path, sheet_index):
-        with closing(load_workbook(filename=excel_path, keep_links=False)) as book:
-            sheet = book.worksheets[sheet_index]
-            sheet.delete_cols(1, 1)
-            sheet.insert_cols(1, 1)
+    def __clear_markup(sheet: Worksheet):
+        sheet.delete_cols(1, 1)
+        sheet.insert_cols(1, 1)
 
-            for row in sheet.iter_rows():
-                for cell in row:
-                    cell.fill = PatternFill()
-                    cell.comment = None
-            book.save(excel_path)
+        for row in sheet.iter_rows():
+            for cell in row:
+                cell.fill = PatternFill()
+                cell.comment = None
 
     @staticmethod
     def __get_error_comment(errors: List[str], existing_comment: Comment = None):
@@ -0,0 +1,259 @@
+import posixpath
+from contextlib import closing, contextmanager
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from zipfile import ZipFile
+
+from lxml import etree
+from openpyxl import load_workbook
+from openpyxl.formula.translate import Translator
+from openpyxl.styles.numbers import builtin_format_code, is_date_format, is_timedelta_format
+from openpyxl.utils import column_index_from_string
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, from_excel, from_ISO8601
+from openpyxl.worksheet.formula import ArrayFormula
+
+SHEET_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+RELATIONSHIP_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+SHARED_STRINGS_TYPE = f'{RELATIONSHIP_NS}/sharedStrings'
+STYLES_TYPE = f'{RELATIONSHIP_NS}/styles'
+
+ROW_TAG = f'{{{SHEET_NS}}}row'
+CELL_TAG = f'{{{SHEET_NS}}}c'
+VALUE_TAG = f'{{{SHEET_NS}}}v'
+FORMULA_TAG = f'{{{SHEET_NS}}}f'
+INLINE_STRING_TAG = f'{{{SHEET_NS}}}is'
+TEXT_TAG = f'{{{SHEET_NS}}}t'
+RUN_TAG = f'{{{SHEET_NS}}}r'
+STRING_ITEM_TAG = f'{{{SHEET_NS}}}si'
+DIMENSION_TAG = f'{{{SHEET_NS}}}dimension'
+SHEET_DATA_TAG = f'{{{SHEET_NS}}}sheetData'
+
+
+class XlsxReader:
+    # Streams cell values straight from the worksheet xml inside the xlsx zip,
+    # giving the same values as openpyxl's read-only iter_rows(values_only=True)
+    # without creating a cell object for every cell
+    def __init__(self, excel_path: str, sheet_index=0):
+        self.__zip = ZipFile(excel_path)
+        try:
+            workbook = etree.fromstring(self.__zip.read('xl/workbook.xml'))
+            relationships = self.__read_relationships('xl/_rels/workbook.xml.rels', 'xl')
+            self.epoch = CALENDAR_WINDOWS_1900
+            properties = workbook.find(f'{{{SHEET_NS}}}workbookPr')
+            if properties is not None and properties.get('date1904') in ('1', 'true'):
+                self.epoch = CALENDAR_MAC_1904
+            sheets = workbook.find(f'{{{SHEET_NS}}}sheets')
+            sheet_id = sheets[sheet_index].get(f'{{{RELATIONSHIP_NS}}}id')
+            self.__sheet_path = relationships[sheet_id][1]
+            self.__shared_strings = self.__read_shared_strings(self.__find_part(relationships, SHARED_STRINGS_TYPE))
+            self.__date_styles, self.__timedelta_styles = self.__read_styles(self.__find_part(relationships, STYLES_TYPE))
+            self.max_row, self.max_column = self.__read_dimension()
+        except Exception:
+            self.__zip.close()
+            raise
+
+    def iter_rows(self, min_row=None, max_row=None, min_col=None, max_col=None, values_only=True) -> Iterator[tuple]:
+        if not values_only:
+            raise NotImplementedError('XlsxReader only reads cell values, use openpyxl for cell objects.')
+        # Mirrors openpyxl's read-only row handling: missing rows and cells are filled with None
+        min_row = min_row or 1
+        min_col = min_col or 1
+        max_row = max_row or self.max_row
+        max_col = max_col or self.max_column
+        empty_row = (None,) * (max_col + 1 - min_col) if max_col is not None else ()
+        counter = min_row
+        for row_index, cells in self.__parse_rows(min_col, max_col):
+            if max_row is not None and row_index > max_row:
+                break
+            for _ in range(counter, row_index):
+                counter += 1
+                yield empty_row
+            if counter <= row_index:
+                counter += 1
+                yield self.__get_row(cells, min_col, max_col)
+
+    def close(self):
+        self.__zip.close()
+
+    @staticmethod
+    def __get_row(cells: List[Tuple[int, object]], min_col: int, max_col: Optional[int]) -> tuple:
+        if not cells and not max_col:
+            return ()
+        max_col = max_col or cells[-1][0]
+        row = [None] * (max_col + 1 - min_col)
+        for column, value in cells:
+            if min_col <= column <= max_col:
+                row[column - min_col] = value
+        return tuple(row)
+
+    def __parse_rows(self, min_col: int, max_col: Optional[int]) -> Iterator[Tuple[int, List[Tuple[int, object]]]]:
+        shared_formulae: Dict[str, Translator] = {}
+        row_counter = 0
+        with self.__zip.open(self.__sheet_path) as source:
+            for _, row_element in etree.iterparse(source, events=('end',), tag=ROW_TAG):
+                row_index = row_element.get('r')
+                row_counter = int(row_index) if row_index else row_counter + 1
+                column_counter = 0
+                cells = []
+                for cell_element in row_element.iterchildren(CELL_TAG):
+                    coordinate = cell_element.get('r')
+                    if coordinate:
+                        column_counter = column_index_from_string(coordinate.rstrip('0123456789'))
+                    else:
+                        column_counter += 1
+                    # Values outside the requested columns are never decoded,
+                    # apart from shared formulae that cells in range may refer to
+                    if column_counter < min_col or (max_col and column_counter > max_col):
+                        formula = cell_element.find(FORMULA_TAG)
+                        if formula is not None and formula.get('t') == 'shared':
+                            self.__parse_formula(cell_element, formula, shared_formulae)
+                        continue
+                    value = self.__parse_cell(cell_element, shared_formulae)
+                    if value is not None:
+                        cells.append((column_counter, value))
+                # Discard parsed rows so memory does not grow with the sheet
+                row_element.clear()
+                while row_element.getprevious() is not None:
+                    del row_element.getparent()[0]
+                yield row_counter, cells
+
+    def __parse_cell(self, element, shared_formulae: Dict[str, Translator]):
+        value = formula = inline_string = None
+        for child in element:
+            tag = child.tag
+            if tag == VALUE_TAG:
+                value = child.text
+            elif tag == FORMULA_TAG:
+                formula = child
+            elif tag == INLINE_STRING_TAG:
+                inline_string = child
+        if formula is not None:
+            return self.__parse_formula(element, formula, shared_formulae)
+        data_type = element.get('t', 'n')
+        if data_type == 'inlineStr':
+            return self.__read_text(inline_string) if inline_string is not None else None
+        if not value:
+            return None
+        if data_type == 's':
+            value = self.__shared_strings[int(value)]
+        elif data_type == 'n':
+            value = float(value) if '.' in value or 'E' in value or 'e' in value else int(value)
+            style_id = element.get('s')
+            if style_id and int(style_id) in self.__date_styles:
+                try:
+                    value = from_excel(value, self.epoch, timedelta=int(style_id) in self.__timedelta_styles)
+                except (OverflowError, ValueError):
+                    value = '#VALUE!'
+        elif data_type == 'b':
+            value = bool(int(value))
+        elif data_type == 'd':
+            value = from_ISO8601(value)
+        return value
+
+    @staticmethod
+    def __parse_formula(element, formula, shared_formulae: Dict[str, Translator]):
+        # Formulae are returned as text, as openpyxl does when data_only=False
+        value = '='
+        if formula.text is not None:
+            value += formula.text
+        formula_type = formula.get('t')
+        if formula_type == 'array':
+            return ArrayFormula(ref=formula.get('ref'), text=value)
+        if formula_type == 'shared':
+            index = formula.get('si')
+            if index in shared_formulae:
+                return shared_formulae[index].translate_formula(element.get('r'))
+            if value != '=':
+                shared_formulae[index] = Translator(value, element.get('r'))
+        return value
+
+    def __read_dimension(self) -> Tuple[Optional[int], Optional[int]]:
+        # The dimension, if present, is declared before any cell data
+        with self.__zip.open(self.__sheet_path) as source:
+            for _, element in etree.iterparse(source, events=('start',)):
+                if element.tag == SHEET_DATA_TAG:
+                    break
+                if element.tag == DIMENSION_TAG:
+                    last_cell = element.get('ref', '').rpartition(':')[2]
+                    letters = last_cell.rstrip('0123456789')
+                    digits = last_cell[len(letters):]
+                    if letters and digits:
+                        return int(digits), column_index_from_string(letters)
+                    break
+        return None, None
+
+    def __read_shared_strings(self, path: Optional[str]) -> List[str]:
+        # Shared strings are resolved once into a list indexed by the cell value
+        strings = []
+        if not path:
+            return strings
+        with self.__zip.open(path) as source:
+            for _, element in etree.iterparse(source, events=('end',), tag=STRING_ITEM_TAG):
+                strings.append(self.__read_text(element).replace('x005F_', ''))
+                element.clear()
+        return strings
+
+    def __read_styles(self, path: Optional[str]) -> Tuple[Set[int], Set[int]]:
+        date_styles = set()
+        timedelta_styles = set()
+        if not path:
+            return date_styles, timedelta_styles
+        styles = etree.fromstring(self.__zip.read(path))
+        custom_formats = {}
+        for number_format in styles.iterfind(f'{{{SHEET_NS}}}numFmts/{{{SHEET_NS}}}numFmt'):
+            custom_formats[int(number_format.get('numFmtId'))] = number_format.get('formatCode')
+        for style_id, style in enumerate(styles.iterfind(f'{{{SHEET_NS}}}cellXfs/{{{SHEET_NS}}}xf')):
+            format_id = int(style.get('numFmtId', 0))
+            format_code = custom_formats.get(format_id, None) or builtin_format_code(format_id)
+            if format_code and is_date_format(format_code):
+                date_styles.add(style_id)
+            if format_code and is_timedelta_format(format_code):
+                timedelta_styles.add(style_id)
+        return date_styles, timedelta_styles
+
+    def __read_relationships(self, path: str, base: str) -> Dict[str, Tuple[str, str]]:
+        relationships = {}
+        for relationship in etree.fromstring(self.__zip.read(path)):
+            target = relationship.get('Target')
+            if target.startswith('/'):
+                target = target.lstrip('/')
+            else:
+                target = posixpath.normpath(posixpath.join(base, target))
+            relationships[relationship.get('Id')] = (relationship.get('Type'), target)
+        return relationships
+
+    @staticmethod
+    def __find_part(relationships: Dict[str, Tuple[str, str]], part_type: str) -> Optional[str]:
+        for relationship_type, target in relationships.values():
+            if relationship_type == part_type:
+                return target
+        return None
+
+    @staticmethod
+    def __read_text(element) -> str:
+        # Plain and rich text runs are joined, phonetic runs are ignored
+        text = []
+        for child in element:
+            if child.tag == TEXT_TAG:
+                text.append(child.text or '')
+            elif child.tag == RUN_TAG:
+                text.append(child.findtext(TEXT_TAG) or '')
+        return ''.join(text)
+
+
+@contextmanager
+def openpyxl_worksheet(excel_path: str, sheet_index=0):
+    # Reference implementation
+    with closing(load_workbook(filename=excel_path, read_only=True, keep_links=False)) as workbook:
+        yield workbook.worksheets[sheet_index]
+
+
+@contextmanager
+def xlsx_worksheet(excel_path: str, sheet_index=0):
+    with closing(XlsxReader(excel_path, sheet_index)) as worksheet:
+        yield worksheet
+
+
+READERS = {
+    'openpyxl': openpyxl_worksheet,
+    'xlsx': xlsx_worksheet
+}
@@ -0,0 +1,21 @@
+from openpyxl import load_workbook
+from openpyxl.workbook import Workbook
+from openpyxl.worksheet.worksheet import Worksheet
+
+
+class WorkbookSession:
+    # Parses a workbook once so that it can be shared by the loader, markup and validators
+    def __init__(self, excel_path: str, read_only=False):
+        self.path = excel_path
+        self.read_only = read_only
+        self.modified = False
+        self.workbook: Workbook = load_workbook(filename=excel_path, read_only=read_only, keep_links=False)
+
+    def worksheet(self, sheet_index=0) -> Worksheet:
+        return self.workbook.worksheets[sheet_index]
+
+    def close(self):
+        # Changes are only written back to the file once, when the session is closed
+        if self.modified and not self.read_only:
+            self.workbook.save(self.path)
+        self.workbook.close()
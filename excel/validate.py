@@ -1,13 +1,25 @@
 import logging
+from typing import Iterator, Tuple
 
+from submission.entity import Entity
 from validation.base import BaseValidator
+from .cache import LoadCache
 from .load import ExcelLoader
+from .session import WorkbookSession
 
 
 class ValidatingExcel(ExcelLoader):
-    def __init__(self, excel_path: str, sheet_index=0):
-        super().__init__(excel_path, sheet_index)
+    def __init__(self, excel_path: str, sheet_index=0, session: WorkbookSession = None, reader='openpyxl', cache: LoadCache = None):
+        super().__init__(excel_path, sheet_index, session, reader, cache)
 
     def validate(self, validator: BaseValidator):
         validator.validate_data(self.data)
         logging.debug(f'{validator.__class__} Validation Complete.')
+
+    def iter_validated(self, *validators: BaseValidator) -> Iterator[Tuple[int, Entity]]:
+        # Validates each row as it is read, only suitable for validators that do not need links between rows
+        for row_index, entity_type, attributes in self.iter_entities():
+            entity = Entity(entity_type, self.get_row_index(entity_type, row_index, attributes), attributes)
+            for validator in validators:
+                validator.validate_entity(entity)
+            yield row_index, entity
@@ -0,0 +1,223 @@
+import argparse
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import closing, ExitStack
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from cli import CovidExcelUtils, DOCKER_IMAGE, JSON_VALIDATOR_URL, get_docker_options, get_taxonomy_cache_options, \
+    set_logging_level
+from conversion.ena.submission import EnaSubmissionConverter
+from excel.cache import LoadCache
+from excel.reader import READERS
+from services.taxonomy_cache import TaxonomyCache, DEFAULT_CACHE_PATH as TAXONOMY_CACHE_PATH
+from services.taxonomy_index import TaxonomyIndex
+from validation.cache import ResultCache
+from validation.docker import JsonValidatorDocker
+from validation.local import LocalJsonValidator
+from validation.taxonomy import TaxonomyValidator
+from validation.xsd import XMLSchemaValidator
+
+DEFAULT_MAX_UPLOAD_BYTES = 100 * 1024 * 1024
+OUTPUTS = ['json', 'issues']
+
+
+class ValidationService:
+    # Keeps validators, schemas and HTTP sessions resident between spreadsheets
+    def __init__(self, reader='openpyxl', cache: LoadCache = None, json_validator='docker', docker_options: dict = None,
+                 result_cache: ResultCache = None, taxonomy_cache: TaxonomyCache = None, taxonomy_index: TaxonomyIndex = None):
+        self.reader = reader
+        self.cache = cache
+        self.result_cache = result_cache
+        self.__stack = ExitStack()
+        if result_cache:
+            self.__stack.enter_context(closing(result_cache))
+        if taxonomy_cache:
+            self.__stack.enter_context(closing(taxonomy_cache))
+        if taxonomy_index:
+            self.__stack.enter_context(closing(taxonomy_index))
+        self.json_validator = None
+        if json_validator == 'local':
+            self.json_validator = LocalJsonValidator()
+        elif json_validator == 'docker':
+            try:
+                self.json_validator = self.__stack.enter_context(closing(JsonValidatorDocker(
+                    DOCKER_IMAGE, JSON_VALIDATOR_URL, **(docker_options or {}))))
+            except Exception:
+                logging.warning(f'Error starting JSON Validator on Docker. Will validate using ENA XML schema instead.')
+        self.taxonomy_validator = TaxonomyValidator(taxonomy_cache, taxonomy_index=taxonomy_index)
+        self.ena_converter = EnaSubmissionConverter()
+        # Parse the ENA XML schemas before the first spreadsheet arrives
+        XMLSchemaValidator(self.ena_converter)
+        # The validators are not thread safe, so spreadsheets are validated one at a time
+        self.__lock = threading.Lock()
+
+    def validate(self, excel_path: str, secure_key: str = None) -> CovidExcelUtils:
+        excel_utils = CovidExcelUtils(excel_path, ['json'], self.reader, self.cache, self.result_cache)
+        excel_utils.load()
+        if excel_utils.excel.data.has_data():
+            with self.__lock:
+                excel_utils.validate(
+                    self.ena_converter, secure_key,
+                    json_validator=self.json_validator,
+                    taxonomy_validator=self.taxonomy_validator,
+                    use_docker=False
+                )
+        return excel_utils
+
+    def close(self):
+        self.__stack.close()
+
+
+class ValidationRequestHandler(BaseHTTPRequestHandler):
+    # POST /validate with the bytes of an .xlsx file as the request body
+    # Query parameters: output=json|issues, secure_key=xxxxx-xxx-xxxx-xxxxx
+    service: ValidationService = None
+    max_upload_bytes = DEFAULT_MAX_UPLOAD_BYTES
+
+    def do_GET(self):
+        if urlparse(self.path).path == '/health':
+            self.send_json(HTTPStatus.OK, {'status': 'OK'})
+        else:
+            self.send_json(HTTPStatus.NOT_FOUND, {'error': f'Not found: {self.path}'})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != '/validate':
+            self.send_json(HTTPStatus.NOT_FOUND, {'error': f'Not found: {self.path}'})
+            return
+        query = parse_qs(url.query)
+        output = query.get('output', ['json'])[0]
+        if output not in OUTPUTS:
+            self.send_json(HTTPStatus.BAD_REQUEST, {'error': f'Unaccepted output parameter: {output}, accepts: {OUTPUTS}'})
+            return
+        content_length = int(self.headers.get('Content-Length', 0))
+        if not content_length:
+            self.send_json(HTTPStatus.LENGTH_REQUIRED, {'error': 'Request body must contain an excel file.'})
+            return
+        if content_length > self.max_upload_bytes:
+            self.send_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {'error': f'Excel file is larger than {self.max_upload_bytes} bytes.'})
+            return
+        secure_key = query.get('secure_key', [None])[0]
+        start = time.perf_counter()
+        file_descriptor, excel_path = tempfile.mkstemp(suffix='.xlsx')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as excel_file:
+                excel_file.write(self.rfile.read(content_length))
+            try:
+                excel_utils = self.service.validate(excel_path, secure_key)
+            except Exception as error:
+                logging.error(f'Error validating uploaded excel file: {error}')
+                self.send_json(HTTPStatus.UNPROCESSABLE_ENTITY, {'error': f'Could not validate excel file: {error}'})
+                return
+            data = excel_utils.excel.data
+            if output == 'issues':
+                self.send_json(HTTPStatus.OK, data.get_all_errors())
+            else:
+                self.send_json(HTTPStatus.OK, data.as_dict(string_lists=True))
+        finally:
+            os.remove(excel_path)
+            logging.info(f'Validated uploaded excel file in {time.perf_counter() - start:.2f} seconds')
+
+    def send_json(self, status: HTTPStatus, body: dict):
+        content = json.dumps(body, indent=2).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        logging.debug(f'{self.address_string()} {format % args}')
+
+
+def make_server(service: ValidationService, host: str, port: int, max_upload_bytes=DEFAULT_MAX_UPLOAD_BYTES) -> ThreadingHTTPServer:
+    handler = type('BoundValidationRequestHandler', (ValidationRequestHandler,), {
+        'service': service,
+        'max_upload_bytes': max_upload_bytes
+    })
+    return ThreadingHTTPServer((host, port), handler)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Serve validation of excel files over HTTP, keeping validators loaded between requests'
+    )
+    parser.add_argument(
+        '--host', type=str, default='127.0.0.1',
+        help='Override the default address to listen on: 127.0.0.1'
+    )
+    parser.add_argument(
+        '--port', type=int, default=8020,
+        help='Override the default port to listen on: 8020'
+    )
+    parser.add_argument(
+        '--max_upload_bytes', type=int, default=DEFAULT_MAX_UPLOAD_BYTES,
+        help=f'Override the largest excel file accepted: {DEFAULT_MAX_UPLOAD_BYTES}'
+    )
+    parser.add_argument(
+        '--json_validator', type=str, default='docker', choices=['docker', 'local'],
+        help='Override the JSON Schema validator: docker. "local" validates in process without Docker, giving the same errors'
+    )
+    parser.add_argument(
+        '--json_validator_batch_size', type=int, default=1,
+        help='Number of entities sent to the JSON Validator in each request, default is 1'
+    )
+    parser.add_argument(
+        '--json_validator_concurrency', type=int, default=1,
+        help='Number of requests sent to the JSON Validator at the same time, default is 1'
+    )
+    parser.add_argument(
+        '--json_validator_containers', type=int, default=1,
+        help='Number of JSON Validator containers started on consecutive ports, default is 1'
+    )
+    parser.add_argument(
+        '--excel_reader', type=str, default='openpyxl', choices=list(READERS),
+        help='Override the backend used to read excel files: openpyxl'
+    )
+    parser.add_argument(
+        '--taxonomy_cache', type=str, default=TAXONOMY_CACHE_PATH,
+        help=f'Override the file that keeps answers from the ENA Taxonomy service: {TAXONOMY_CACHE_PATH}'
+    )
+    parser.add_argument(
+        '--taxonomy_cache_days', type=float, default=30,
+        help='Number of days a taxonomy found by the ENA Taxonomy service is kept, default is 30'
+    )
+    parser.add_argument(
+        '--taxonomy_cache_error_hours', type=float, default=24,
+        help='Number of hours a taxonomy not found by the ENA Taxonomy service is kept, default is 24'
+    )
+    parser.add_argument(
+        '--taxonomy_index', type=str,
+        help='Validate taxonomy against a local index instead of the ENA Taxonomy service, build the index with: python3 -m services.taxonomy_index'
+    )
+    parser.add_argument(
+        '--no_cache', action='store_true',
+        help='Do not use or update the caches of previously loaded excel files, validation results and taxonomy answers'
+    )
+    parser.add_argument(
+        '--log_level', '-l', type=str, default='INFO',
+        help='Override the default logging level: INFO',
+        choices=['CRITICAL', 'ERROR', 'WARNING', 'INFO', 'DEBUG']
+    )
+    args = vars(parser.parse_args())
+    set_logging_level(args['log_level'])
+    load_cache = None if args['no_cache'] else LoadCache()
+    result_cache = None if args['no_cache'] else ResultCache()
+    taxonomy_cache_options = get_taxonomy_cache_options(args)
+    taxonomy_cache = TaxonomyCache(**taxonomy_cache_options) if taxonomy_cache_options else None
+    taxonomy_index = TaxonomyIndex(args['taxonomy_index']) if args['taxonomy_index'] else None
+    with closing(ValidationService(
+            args['excel_reader'], load_cache, args['json_validator'], get_docker_options(args), result_cache,
+            taxonomy_cache, taxonomy_index)) as validation_service:
+        with make_server(validation_service, args['host'], args['port'], args['max_upload_bytes']) as server:
+            logging.info(f"Serving excel validation on http://{args['host']}:{args['port']}/validate")
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                logging.info('Stopping excel validation server')
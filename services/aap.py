@@ -0,0 +1,38 @@
+import base64
+import json
+import threading
+import time
+
+# Tokens are fetched again this many seconds before they expire, so a request never carries an expired token
+DEFAULT_REFRESH_MARGIN = 5 * 60
+# Assumed lifetime of a token that does not state when it expires
+DEFAULT_TOKEN_LIFETIME = 60 * 60
+
+
+class AapTokenCache:
+    # Shares one AAP token between threads, only asking the AAP client for a new one when it is about to expire
+    def __init__(self, aap_client, refresh_margin: float = DEFAULT_REFRESH_MARGIN):
+        self.aap = aap_client
+        self.refresh_margin = refresh_margin
+        self.refreshes = 0
+        self.__token = None
+        self.__expires = 0.0
+        self.__lock = threading.Lock()
+
+    def get_token(self) -> str:
+        with self.__lock:
+            if self.__token is None or time.time() >= self.__expires - self.refresh_margin:
+                self.__token = self.aap.get_token()
+                self.__expires = get_token_expiry(self.__token)
+                self.refreshes += 1
+            return self.__token
+
+
+def get_token_expiry(token: str) -> float:
+    # The expiry is read from the JWT payload, the signature is checked by the services that receive the token
+    try:
+        payload = token.split('.')[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        return float(claims['exp'])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return time.time() + DEFAULT_TOKEN_LIFETIME
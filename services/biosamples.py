@@ -1,17 +1,70 @@
+from typing import Dict, List
+
 from biosamples_v4.api import Client as BioSamplesClient
 from biosamples_v4.aap import Client as AapClient
 from biosamples_v4.encoders import SampleEncoder
 from biosamples_v4.models import Sample
 
+from .aap import AapTokenCache
+from .ratelimit import get_limiter
+from .transport import create_session
+
 
 class BioSamples:
     def __init__(self, aap_client: AapClient, url):
         self.aap = aap_client
+        # Samples are sent from several threads, which share one token
+        self.tokens = AapTokenCache(aap_client)
         self.biosamples = BioSamplesClient(url)
         self.encoder = SampleEncoder()
+        self.bulk_url = f'{url.rstrip("/")}/v2/samples/bulk-submit'
+        # Samples sent one at a time and in bulk are throttled together
+        self.limiter = get_limiter('BioSamples')
+        # Bulk submissions are not retried by the session, as a retried request could store the samples twice
+        self.session = create_session('BioSamples', pool_size=16, limiter=self.limiter)
 
     def send_sample(self, sample: Sample):
         payload = self.encoder.default(sample)
         if sample.accession:
-            return self.biosamples.update_sample(sample=payload, jwt=self.aap.get_token())
-        return self.biosamples.persist_sample(sample=payload, jwt=self.aap.get_token())
+            return self.limiter.call(lambda: self.biosamples.update_sample(sample=payload, jwt=self.tokens.get_token()))
+        return self.limiter.call(lambda: self.biosamples.persist_sample(sample=payload, jwt=self.tokens.get_token()))
+
+    def send_samples(self, samples: List[Sample]) -> List[dict]:
+        # Sends new and updated samples in one request to the bulk-submit endpoint.
+        # Returns one response for each sample, in the order given: the stored sample with its accession, or {'error': message}
+        payloads = [self.encoder.default(sample) for sample in samples]
+        headers = {
+            'Authorization': f'Bearer {self.tokens.get_token()}',
+            'Content-Type': 'application/json'
+        }
+        response = self.session.post(self.bulk_url, json=payloads, headers=headers)
+        response.raise_for_status()
+        return self.map_bulk_response(payloads, response.json())
+
+    @staticmethod
+    def map_bulk_response(payloads: List[dict], stored_samples: List[dict]) -> List[dict]:
+        # Stored samples are matched by name, or by position when the names of the samples sent are not unique.
+        # If some samples were not stored, samples sharing a name cannot be told apart, so they are given an error.
+        if not isinstance(stored_samples, list):
+            stored_samples = []
+        names = [payload.get('name') for payload in payloads]
+        duplicate_names = {name for name in names if names.count(name) > 1}
+        if duplicate_names and len(stored_samples) == len(payloads):
+            matched_samples = stored_samples
+            duplicate_names = set()
+        else:
+            by_name: Dict[str, dict] = {stored.get('name'): stored for stored in stored_samples if isinstance(stored, dict)}
+            matched_samples = [by_name.get(name, {}) for name in names]
+        responses = []
+        for name, stored in zip(names, matched_samples):
+            if name in duplicate_names:
+                responses.append({'error': f'Sample name {name} is not unique in the bulk submission, its accession cannot be matched.'})
+            elif isinstance(stored, dict) and 'accession' in stored:
+                responses.append(stored)
+            elif isinstance(stored, dict) and stored.get('error'):
+                responses.append({'error': str(stored['error'])})
+            elif isinstance(stored, dict) and stored.get('errors'):
+                responses.append({'error': '; '.join(str(error) for error in stored['errors'])})
+            else:
+                responses.append({'error': 'No accession returned by bulk submission.'})
+        return responses
@@ -1,8 +1,15 @@
+import os
 import uuid
-from typing import List
+from typing import List, Tuple
 
-from biostudiesclient.api import Api
+from biostudiesclient.api import Api, CREATE_FOLDER, CREATE_SUBMISSION, GET_SUBMISSION_BY_ACCESSION_ID, UPLOAD_FILE
 from biostudiesclient.auth import Auth
+from biostudiesclient.response_utils import ResponseUtils
+
+from services.file_upload import DEFAULT_UPLOAD_WORKERS, UploadManager, UploadState
+from services.multipart import MultipartStream
+from services.ratelimit import get_limiter
+from services.transport import create_session
 
 from submission.entity import Entity
 from submission.submission import Submission
@@ -19,29 +26,65 @@ ENTITY_TYPE_SERVICE = {
 }
 
 
+class BioStudiesApi(Api):
+    # The requests used while submitting are sent with a pooled session, rather than a new connection each time
+    def __init__(self, auth: Auth, pool_size: int):
+        super().__init__(auth)
+        self.session = create_session('BioStudies', pool_size=pool_size, limiter=get_limiter('BioStudies'))
+
+    def create_user_sub_folder(self, folder_name):
+        url = self.base_url + CREATE_FOLDER.format(folder_name=folder_name)
+        return ResponseUtils.handle_response(self.session.post(url, headers=self.get_basic_headers(), endpoint='folder'))
+
+    def create_submission(self, metadata):
+        url = self.base_url + CREATE_SUBMISSION
+        headers = self.get_basic_headers()
+        headers.update({'Submission_Type': 'application/json'})
+        return ResponseUtils.handle_response(self.session.post(url, headers=headers, json=metadata))
+
+    def get_submission(self, accession_id):
+        url = self.base_url + GET_SUBMISSION_BY_ACCESSION_ID.format(accession_id=accession_id)
+        return ResponseUtils.handle_response(self.session.get(url, headers=self.get_basic_headers(), endpoint='submission'))
+
+
 class BioStudies:
-    def __init__(self, base_url=None, username=None, password=None):
+    # The session from a single login is shared by every worker submitting with this service
+    def __init__(self, base_url=None, username=None, password=None, upload_workers: int = DEFAULT_UPLOAD_WORKERS,
+                 upload_state_path: str = None):
         self.base_url = base_url
         self.auth = Auth(base_url)
 
         self.session_id = self.__get_session_id(username, password)
-        self.api = Api(self.auth)
-        self.submission_folder_name = uuid.uuid1()
+        self.upload_workers = upload_workers
+        self.api = BioStudiesApi(self.auth, max(upload_workers, 10))
+        # A resumed run uploads to the folder that already holds the files uploaded before it was interrupted
+        self.upload_state = UploadState(upload_state_path)
+        if not self.upload_state.folder:
+            self.upload_state.folder = str(uuid.uuid1())
+        self.submission_folder_name = self.upload_state.folder
 
     def create_submission_folder(self):
         return self.api.create_user_sub_folder(self.submission_folder_name)
 
     def upload_file(self, file_path):
-        return self.api.upload_file(
-            file_path,
-            self.submission_folder_name)
+        # Streamed from disk, as biostudiesclient reads the whole file into memory before sending it
+        url = f'{self.api.base_url}{UPLOAD_FILE}/{self.submission_folder_name}'
+        body = MultipartStream(files=[('files', os.path.basename(file_path), file_path)])
+        headers = self.api.get_basic_headers()
+        headers['Content-Type'] = body.content_type
+        try:
+            return ResponseUtils.handle_response(self.api.session.post(url, headers=headers, data=body, endpoint='files'))
+        finally:
+            body.close()
 
     def send_submission(self, submission: dict):
         files = self.__get_files_info(submission)
+        file_paths = [file["path"] for file in files]
         if len(files) > 0:
-            self.__process_files(files)
+            self.__process_files(file_paths)
 
         response = self.api.create_submission(submission)
+        self.upload_state.forget(file_paths)
 
         return response.json['accno']
 
@@ -49,24 +92,39 @@ class BioStudies:
         return self.api.get_submission(accession_id)
 
     def update_links_in_submission(self, submission: Submission, study: Entity) -> dict:
+        biostudies_submission, _ = self.__add_links_to_submission(submission, study)
+        return biostudies_submission
+
+    def update_links(self, submission: Submission, study: Entity) -> bool:
+        # The study is only sent again when it is missing some of the links
+        biostudies_submission, links_added = self.__add_links_to_submission(submission, study)
+        if not links_added:
+            return False
+        self.send_submission(biostudies_submission)
+        return True
+
+    def __add_links_to_submission(self, submission: Submission, study: Entity) -> Tuple[dict, int]:
         study_accession = study.get_accession('BioStudies')
         biostudies_submission = self.get_submission_by_accession(study_accession).json
         links_section = self.__get_links_section_from_submission(biostudies_submission)
-        self.__update_links_section(links_section, study, submission)
-        return biostudies_submission
+        links_added = self.__update_links_section(links_section, study, submission)
+        return biostudies_submission, links_added
 
     @staticmethod
     def __get_links_section_from_submission(submission: dict) -> List:
         section = submission['section']
         return section.setdefault('links', [])
 
-    def __update_links_section(self, links_section: List, study: Entity, submission: Submission):
+    def __update_links_section(self, links_section: List, study: Entity, submission: Submission) -> int:
+        links_added = 0
         for entity_type, biostudies_type in BIOSTUDIES_LINK_TYPES.items():
             for linked_entity in submission.get_linked_entities(study, entity_type):
                 accession = linked_entity.get_accession(ENTITY_TYPE_SERVICE[entity_type])
                 if accession and not self.__accession_in_list(links_section, accession):
                     link_to_add = self.__create_link_element(biostudies_type, accession)
                     links_section.append(link_to_add)
+                    links_added += 1
+        return links_added
 
     @staticmethod
     def __create_link_element(link_type, accession):
@@ -99,11 +157,11 @@ class BioStudies:
         section = submission["section"]
         return section["files"] if "files" in section else []
 
-    def __process_files(self, files):
+    def __process_files(self, file_paths: List[str]):
         self.create_submission_folder()
 
-        for file in files:
-            file_path = file["path"]
-            self.upload_file(file_path)
-
-        # TODO: wait while file uploads finished - not needed for COVID-19 template
+        with UploadManager(self.upload_file, self.upload_workers, self.upload_state) as uploads:
+            for file_path in file_paths:
+                uploads.submit(file_path)
+            # The submission refers to the files, so it is only created once all of them are uploaded
+            uploads.wait()
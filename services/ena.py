@@ -3,10 +3,13 @@ from enum import Enum
 from http import HTTPStatus
 from typing import Dict, Tuple
 
-import requests
 from requests.auth import HTTPBasicAuth
 from requests.models import Response
 
+from services.multipart import MultipartStream
+from services.ratelimit import get_limiter
+from services.transport import create_session
+
 
 class EnaAction(Enum):
     ADD = 'ADD'
@@ -20,8 +23,10 @@ class Ena:
     def __init__(self, username: str, password: str, url: str = 'https://www.ebi.ac.uk/ena'):
         self.url = f"{url.rstrip('/')}/submit/drop-box/submit/"
         self.auth = HTTPBasicAuth(username, password)
+        self.session = create_session('ENA', limiter=get_limiter('ENA'))
     
     def submit_files(self, ena_files: Dict[str, Tuple[str, str]], action: EnaAction = None, hold_date: date = None, center: str = None):
+        # ena_files are the (file name, file path) of each ENA type, streamed from disk rather than held in memory
         data = {}
         if action:
             data['ACTION'] = action.value
@@ -29,7 +34,11 @@ class Ena:
             data['HOLD_DATE'] = hold_date.isoformat()
         if center:
             data['CENTER_NAME'] = center
-        response: Response = requests.post(self.url, auth=self.auth, data=data, files=ena_files)
+        body = MultipartStream(data, [(ena_type, file_name, file_path) for ena_type, (file_name, file_path) in ena_files.items()])
+        try:
+            response: Response = self.session.post(self.url, auth=self.auth, data=body, headers={'Content-Type': body.content_type})
+        finally:
+            body.close()
         if response.status_code == HTTPStatus(200):
             return response.content
         else:
@@ -1,5 +1,9 @@
 from http import HTTPStatus
-import requests
+
+from .taxonomy_cache import TaxonomyCache
+from .taxonomy_index import TaxonomyIndex
+from .ratelimit import THROTTLE_STATUSES, get_limiter
+from .transport import create_session
 
 
 TAX_ID_KEY = 'tax_id'
@@ -7,19 +11,33 @@ SPECIES_KEY = 'scientific_name'
 
 
 class EnaTaxonomy:
-    def __init__(self, ena_url='https://www.ebi.ac.uk/ena'):
+    def __init__(self, ena_url='https://www.ebi.ac.uk/ena', cache: TaxonomyCache = None, index: TaxonomyIndex = None):
         self.tax_id_url = f'{ena_url.rstrip("/")}/taxonomy/rest/tax-id/'
         self.species_url = f'{ena_url.rstrip("/")}/data/taxonomy/v1/taxon/scientific-name/'
+        self.session = create_session('ENA Taxonomy', limiter=get_limiter('ENA Taxonomy'))
+        self.cache = cache
+        # A local index answers instead of the ENA Taxonomy service
+        self.index = index
 
     def validate_tax_id(self, tax_id: str):
+        if self.index:
+            if not str(tax_id).isdigit():
+                return EnaTaxonomy.format_error(TAX_ID_KEY, tax_id, 'Taxon Id must be numeric.')
+            return EnaTaxonomy.index_response(self.index.get_tax_id(tax_id), TAX_ID_KEY, tax_id)
         return self.__validate(self.tax_id_url, TAX_ID_KEY, tax_id)
 
     def validate_scientific_name(self, scientific_name: str):
+        if self.index:
+            return EnaTaxonomy.index_response(self.index.get_scientific_name(scientific_name), SPECIES_KEY, scientific_name)
         return self.__validate(self.species_url, SPECIES_KEY, scientific_name)
 
     def validate_taxonomy(self, scientific_name: str, tax_id: str):
         species_response = self.validate_scientific_name(scientific_name)
         tax_id_response = self.validate_tax_id(tax_id)
+        return EnaTaxonomy.compare_taxonomy(scientific_name, tax_id, species_response, tax_id_response)
+
+    @staticmethod
+    def compare_taxonomy(scientific_name: str, tax_id: str, species_response: dict, tax_id_response: dict) -> dict:
         response = {
             SPECIES_KEY: species_response,
             TAX_ID_KEY: tax_id_response
@@ -31,13 +49,34 @@ class EnaTaxonomy:
         return response
 
     @staticmethod
-    def __validate(url, data_type, value):
-        get_response = requests.get(f'{url.rstrip("/")}/{value}')
-        json_response = EnaTaxonomy.ena_json_response(get_response, data_type, value)
+    def index_response(json_response, data_type, value):
+        if not json_response:
+            return EnaTaxonomy.format_error(data_type, value)
+        return EnaTaxonomy.submittable_response(json_response, data_type, value)
+
+    def __validate(self, url, data_type, value):
+        value_url = f'{url.rstrip("/")}/{value}'
+        json_response = self.cache.get(value_url) if self.cache else None
+        if json_response is None:
+            get_response = self.session.get(value_url, endpoint=data_type)
+            json_response = EnaTaxonomy.ena_json_response(get_response, data_type, value)
+            if self.cache and EnaTaxonomy.is_answer(get_response.status_code):
+                self.cache.put(value_url, json_response, error=isinstance(json_response, dict) and 'error' in json_response)
 
         if isinstance(json_response, dict) and 'error' in json_response:
             return json_response
+        return EnaTaxonomy.submittable_response(json_response, data_type, value)
+
+    @staticmethod
+    def is_answer(status_code: int) -> bool:
+        # Only answers that will not change are cached. Server errors, timeouts and throttling are asked again next time
+        if status_code == HTTPStatus.OK:
+            return True
+        return HTTPStatus.BAD_REQUEST <= status_code < HTTPStatus.INTERNAL_SERVER_ERROR and \
+            status_code not in (HTTPStatus.REQUEST_TIMEOUT,) + THROTTLE_STATUSES
 
+    @staticmethod
+    def submittable_response(json_response, data_type, value):
         if isinstance(json_response, list):
             json_response = json_response[0]
         if 'submittable' in json_response and json_response['submittable'] == "false":
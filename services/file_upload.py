@@ -0,0 +1,130 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_UPLOAD_WORKERS = 4
+DEFAULT_ATTEMPTS = 3
+DEFAULT_BACKOFF = 1.0
+
+
+def get_upload_state_path(excel_path: str) -> str:
+    return f'{os.path.splitext(excel_path)[0]}.uploads.json'
+
+
+class UploadState:
+    # The files already uploaded and the folder they were uploaded to, kept in a JSON file so that an interrupted
+    # run uploads only the files that are left. The file is removed once no uploads are waiting for a submission.
+    def __init__(self, state_path: str = None):
+        self.state_path = state_path
+        self.folder: Optional[str] = None
+        self.__files: Dict[str, dict] = {}
+        self.__lock = threading.Lock()
+        if state_path and os.path.exists(state_path):
+            with open(state_path, encoding='utf-8') as state_file:
+                state = json.load(state_file)
+            self.folder = state.get('folder')
+            self.__files = state.get('files', {})
+
+    def is_uploaded(self, file_path: str) -> bool:
+        # A file that changed since it was uploaded is uploaded again
+        if not os.path.exists(file_path):
+            return False
+        with self.__lock:
+            return self.__files.get(os.path.abspath(file_path)) == self.__file_info(file_path)
+
+    def mark_uploaded(self, file_path: str):
+        if not os.path.exists(file_path):
+            return
+        with self.__lock:
+            self.__files[os.path.abspath(file_path)] = self.__file_info(file_path)
+            self.__save()
+
+    def forget(self, file_paths: List[str]):
+        with self.__lock:
+            for file_path in file_paths:
+                self.__files.pop(os.path.abspath(file_path), None)
+            self.__save()
+
+    def __save(self):
+        if not self.state_path:
+            return
+        if not self.__files:
+            if os.path.exists(self.state_path):
+                os.remove(self.state_path)
+            return
+        # Written aside and renamed, so the state is never left half written
+        temp_path = f'{self.state_path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as state_file:
+            json.dump({'folder': self.folder, 'files': self.__files}, state_file)
+        os.replace(temp_path, self.state_path)
+
+    @staticmethod
+    def __file_info(file_path: str) -> dict:
+        stat = os.stat(file_path)
+        return {'size': stat.st_size, 'mtime': stat.st_mtime}
+
+
+class UploadError(Exception):
+    pass
+
+
+class UploadManager:
+    # Uploads files with up to workers at once, retrying each failed upload with exponential backoff.
+    # wait() returns once every file is uploaded, or raises an UploadError naming the files that could not be.
+    def __init__(self, upload: Callable[[str], None], workers: int = DEFAULT_UPLOAD_WORKERS, state: UploadState = None,
+                 attempts: int = DEFAULT_ATTEMPTS, backoff: float = DEFAULT_BACKOFF):
+        self.upload = upload
+        self.state = state if state else UploadState()
+        self.attempts = max(attempts, 1)
+        self.backoff = backoff
+        self.uploaded = 0
+        self.skipped = 0
+        self.__pool = ThreadPoolExecutor(max_workers=max(workers, 1))
+        self.__futures: Dict[str, Future] = {}
+
+    def submit(self, file_path: str):
+        if file_path in self.__futures:
+            return
+        if self.state.is_uploaded(file_path):
+            logging.info(f'Skipping file already uploaded: {file_path}')
+            self.skipped += 1
+            return
+        self.__futures[file_path] = self.__pool.submit(self.__upload_with_retry, file_path)
+
+    def wait(self):
+        errors = []
+        for file_path, future in self.__futures.items():
+            try:
+                future.result()
+                self.uploaded += 1
+            except Exception as error:
+                errors.append(f'{file_path}: {error}')
+        self.__futures.clear()
+        if errors:
+            raise UploadError(f"{len(errors)} file(s) could not be uploaded. {' '.join(errors)}")
+
+    def close(self):
+        self.__pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __upload_with_retry(self, file_path: str):
+        for attempt in range(1, self.attempts + 1):
+            try:
+                self.upload(file_path)
+                break
+            except Exception as error:
+                if attempt == self.attempts:
+                    raise
+                delay = self.backoff * 2 ** (attempt - 1)
+                logging.warning(f'Upload of {file_path} failed, attempt {attempt} of {self.attempts}, retrying in {delay:.1f}s: {error}')
+                time.sleep(delay)
+        self.state.mark_uploaded(file_path)
@@ -0,0 +1,73 @@
+import os
+import uuid
+from typing import Dict, List, Tuple, Union
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class MultipartStream:
+    # A multipart/form-data body that reads its files from disk as it is sent, so a file is never held in memory.
+    # The length is known up front, so requests sends a Content-Length rather than a chunked body.
+    def __init__(self, fields: Dict[str, str] = None, files: List[Tuple[str, str, str]] = None, chunk_size: int = CHUNK_SIZE):
+        # files are (field name, file name, path on disk)
+        self.boundary = uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self.__parts: List[Union[bytes, str]] = []
+        for name, value in (fields or {}).items():
+            self.__parts.append(self.__part_header(f'form-data; name="{name}"'))
+            self.__parts.append(f'{value}\r\n'.encode('utf-8'))
+        for name, file_name, file_path in files or []:
+            self.__parts.append(self.__part_header(f'form-data; name="{name}"; filename="{file_name}"'))
+            self.__parts.append(file_path)
+            self.__parts.append(b'\r\n')
+        self.__parts.append(f'--{self.boundary}--\r\n'.encode('utf-8'))
+        self.__length = sum(len(part) if isinstance(part, bytes) else os.path.getsize(part) for part in self.__parts)
+        self.__part_index = 0
+        self.__open_file = None
+        # The chunk being read and how much of it was returned, so that small reads do not copy the rest of the chunk
+        self.__chunk = b''
+        self.__offset = 0
+
+    @property
+    def content_type(self) -> str:
+        return f'multipart/form-data; boundary={self.boundary}'
+
+    def __len__(self) -> int:
+        return self.__length
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = self.__length
+        pieces = []
+        while size > 0:
+            if self.__offset >= len(self.__chunk):
+                if self.__part_index >= len(self.__parts):
+                    break
+                self.__chunk, self.__offset = self.__read_part(), 0
+                continue
+            piece = self.__chunk[self.__offset:self.__offset + size]
+            self.__offset += len(piece)
+            size -= len(piece)
+            pieces.append(piece)
+        return b''.join(pieces)
+
+    def close(self):
+        if self.__open_file:
+            self.__open_file.close()
+            self.__open_file = None
+
+    def __read_part(self) -> bytes:
+        part = self.__parts[self.__part_index]
+        if isinstance(part, bytes):
+            self.__part_index += 1
+            return part
+        if not self.__open_file:
+            self.__open_file = open(part, 'rb')
+        data = self.__open_file.read(self.chunk_size)
+        if not data:
+            self.close()
+            self.__part_index += 1
+        return data
+
+    def __part_header(self, disposition: str) -> bytes:
+        return f'--{self.boundary}\r\nContent-Disposition: {disposition}\r\n\r\n'.encode('utf-8')
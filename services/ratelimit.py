@@ -0,0 +1,121 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional, TypeVar
+
+import requests
+
+THROTTLE_STATUSES = (429, 503)
+DEFAULT_INITIAL_LIMIT = 4
+DEFAULT_MIN_LIMIT = 1
+DEFAULT_MAX_LIMIT = 64
+DEFAULT_THROTTLE_RETRIES = 5
+DEFAULT_THROTTLE_BACKOFF = 1.0
+# A Retry-After longer than this is not waited for
+MAX_RETRY_AFTER = 300
+
+T = TypeVar('T')
+
+
+class AdaptiveLimiter:
+    # Limits the requests in flight to a service with additive increase, multiplicative decrease:
+    # each answered request raises the limit by 1/limit, so by about one for each full window of requests,
+    # and a throttling answer (429 or 503) halves it. Throttled requests only halve the limit once for each window,
+    # as the requests already in flight were sent before the limit was lowered. A Retry-After pauses every request.
+    def __init__(self, service: str, initial_limit: float = DEFAULT_INITIAL_LIMIT, min_limit: float = DEFAULT_MIN_LIMIT,
+                 max_limit: float = DEFAULT_MAX_LIMIT):
+        self.service = service
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self.__paused_until = 0.0
+        self.__decreased_at = 0
+        self.__condition = threading.Condition()
+
+    def acquire(self) -> int:
+        # Blocks until a request may be sent, returns a ticket that is given back to release()
+        with self.__condition:
+            while True:
+                wait = self.__paused_until - time.monotonic()
+                if wait <= 0 and self.in_flight < int(self.limit):
+                    break
+                self.__condition.wait(wait if wait > 0 else None)
+            self.in_flight += 1
+            self.requests += 1
+            return self.requests
+
+    def release(self, ticket: int, throttled: bool = False, retry_after: float = None):
+        with self.__condition:
+            self.in_flight -= 1
+            if throttled:
+                self.throttled += 1
+                if ticket > self.__decreased_at:
+                    self.limit = max(self.limit / 2, self.min_limit)
+                    self.__decreased_at = self.requests
+                    logging.debug(f'{self.service} throttled, limit lowered to {int(self.limit)} request(s) at once')
+                if retry_after:
+                    self.__paused_until = max(self.__paused_until, time.monotonic() + min(retry_after, MAX_RETRY_AFTER))
+            else:
+                self.limit = min(self.limit + 1 / self.limit, self.max_limit)
+            self.__condition.notify_all()
+
+    def call(self, send: Callable[[], T], retries: int = DEFAULT_THROTTLE_RETRIES, backoff: float = DEFAULT_THROTTLE_BACKOFF) -> T:
+        # For clients that raise requests.HTTPError rather than returning the response. A request answered with 429
+        # was not processed, so it is sent again. Other errors are raised as they are.
+        for attempt in range(retries + 1):
+            ticket = self.acquire()
+            try:
+                result = send()
+            except requests.HTTPError as error:
+                status = error.response.status_code if error.response is not None else None
+                throttled = status in THROTTLE_STATUSES
+                self.release(ticket, throttled, get_retry_after(error.response) if throttled else None)
+                if status != 429 or attempt == retries:
+                    raise
+                self.wait_before_retry(attempt, backoff, error.response)
+                continue
+            except Exception:
+                self.release(ticket)
+                raise
+            self.release(ticket)
+            return result
+
+    @staticmethod
+    def wait_before_retry(attempt: int, backoff: float, response: Optional[requests.Response]):
+        # Requests that were throttled without a Retry-After wait for themselves, the limiter only pauses for a Retry-After
+        if get_retry_after(response) is None:
+            time.sleep(backoff * 2 ** attempt)
+
+    def report(self) -> str:
+        return f'{self.service}: {self.requests} request(s), {self.throttled} throttled, limit {int(self.limit)} request(s) at once'
+
+
+def get_retry_after(response: Optional[requests.Response]) -> Optional[float]:
+    # Only the number of seconds is read, an HTTP date is treated as if there was no Retry-After
+    if response is None:
+        return None
+    try:
+        return max(float(response.headers.get('Retry-After')), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+LIMITERS: Dict[str, AdaptiveLimiter] = {}
+LIMITERS_LOCK = threading.Lock()
+
+
+def get_limiter(service: str) -> AdaptiveLimiter:
+    # Every client of a service shares its limiter, as the service throttles them together
+    with LIMITERS_LOCK:
+        if service not in LIMITERS:
+            LIMITERS[service] = AdaptiveLimiter(service)
+        return LIMITERS[service]
+
+
+def log_limiters():
+    for limiter in LIMITERS.values():
+        if limiter.requests:
+            logging.info(f'Rate limit {limiter.report()}')
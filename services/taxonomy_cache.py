@@ -0,0 +1,78 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from os.path import dirname, expanduser, join
+from typing import Optional, Tuple
+
+DEFAULT_CACHE_PATH = join(expanduser('~'), '.cache', 'covid-excel-utils', 'taxonomy.sqlite')
+DEFAULT_TTL = 30 * 24 * 60 * 60
+DEFAULT_ERROR_TTL = 24 * 60 * 60
+DEFAULT_MEMORY_ENTRIES = 1024
+
+
+class TaxonomyCache:
+    # Answers from the ENA Taxonomy service, kept in memory and in a SQLite file shared between runs.
+    # Answers that a taxonomy was not found expire sooner, as it may be registered later.
+    def __init__(self, cache_path: str = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_TTL, error_ttl: float = DEFAULT_ERROR_TTL,
+                 memory_entries: int = DEFAULT_MEMORY_ENTRIES):
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.memory_entries = memory_entries
+        self.hits = 0
+        self.misses = 0
+        self.__memory: 'OrderedDict[str, Tuple[object, float]]' = OrderedDict()
+        self.__lock = threading.Lock()
+        os.makedirs(dirname(cache_path) or '.', exist_ok=True)
+        self.__connection = sqlite3.connect(cache_path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.__connection.execute('PRAGMA journal_mode=WAL')
+        self.__connection.execute(
+            'CREATE TABLE IF NOT EXISTS answers (url TEXT PRIMARY KEY, answer TEXT NOT NULL, expires REAL NOT NULL)'
+        )
+
+    def get(self, url: str) -> Optional[object]:
+        now = time.time()
+        with self.__lock:
+            entry = self.__memory.get(url)
+            if entry is None:
+                row = self.__connection.execute('SELECT answer, expires FROM answers WHERE url = ?', (url,)).fetchone()
+                if row:
+                    entry = (json.loads(row[0]), row[1])
+                    self.__remember(url, entry)
+            else:
+                self.__memory.move_to_end(url)
+            if entry is None or entry[1] <= now:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[0]
+
+    def put(self, url: str, answer, error: bool = False):
+        expires = time.time() + (self.error_ttl if error else self.ttl)
+        with self.__lock:
+            self.__remember(url, (answer, expires))
+            self.__connection.execute(
+                'INSERT OR REPLACE INTO answers (url, answer, expires) VALUES (?, ?, ?)', (url, json.dumps(answer), expires)
+            )
+
+    def report(self) -> str:
+        return f'Taxonomy cache {self.hits} hit(s) {self.misses} miss(es)'
+
+    def close(self):
+        logging.info(self.report())
+        try:
+            with self.__lock:
+                self.__connection.execute('DELETE FROM answers WHERE expires <= ?', (time.time(),))
+        except sqlite3.Error as error:
+            logging.warning(f'Could not remove expired answers from taxonomy cache {self.cache_path}: {error}')
+        self.__connection.close()
+
+    def __remember(self, url: str, entry: Tuple[object, float]):
+        self.__memory[url] = entry
+        self.__memory.move_to_end(url)
+        while len(self.__memory) > self.memory_entries:
+            self.__memory.popitem(last=False)
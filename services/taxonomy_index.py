@@ -0,0 +1,143 @@
+import argparse
+import logging
+import os
+import sqlite3
+import threading
+from itertools import islice
+from os.path import join
+from typing import Iterator, List, Optional
+
+# Rows are written in chunks so that a full NCBI dump is never held in memory
+CHUNK_SIZE = 50000
+COMMON_NAME_CLASSES = ('genbank common name', 'common name')
+
+
+class TaxonomyIndex:
+    # Answers taxonomy lookups the way the ENA Taxonomy service does, from an index built by build_index
+    def __init__(self, index_path: str):
+        self.index_path = index_path
+        # Opened read only, so a missing index is an error rather than an empty database
+        self.__connection = sqlite3.connect(f'file:{index_path}?mode=ro', uri=True, check_same_thread=False)
+        self.__connection.row_factory = sqlite3.Row
+        self.__lock = threading.Lock()
+
+    def get_tax_id(self, tax_id: str) -> Optional[dict]:
+        with self.__lock:
+            row = self.__connection.execute('SELECT * FROM taxa WHERE tax_id = ?', (int(tax_id),)).fetchone()
+        return self.as_response(row) if row else None
+
+    def get_scientific_name(self, scientific_name: str) -> List[dict]:
+        with self.__lock:
+            rows = self.__connection.execute(
+                'SELECT * FROM taxa WHERE name_lower = ? ORDER BY tax_id', (str(scientific_name).lower(),)).fetchall()
+        return [self.as_response(row) for row in rows]
+
+    @staticmethod
+    def as_response(row: sqlite3.Row) -> dict:
+        # The lineage is not kept in the index, as the validator does not use it
+        response = {
+            'taxId': str(row['tax_id']),
+            'scientificName': row['scientific_name'],
+            'rank': row['rank'],
+            'division': row['division'],
+            'geneticCode': row['genetic_code'],
+            'mitochondrialGeneticCode': row['mitochondrial_genetic_code'],
+            'submittable': 'true' if row['submittable'] else 'false'
+        }
+        if row['common_name']:
+            response['commonName'] = row['common_name']
+        return response
+
+    def close(self):
+        self.__connection.close()
+
+
+def read_dump(file_path: str) -> Iterator[List[str]]:
+    # Fields of NCBI taxonomy dumps are separated by "\t|\t" and each line ends with "\t|"
+    with open(file_path, encoding='utf-8') as dump_file:
+        for line in dump_file:
+            line = line.rstrip('\n')
+            if line.endswith('\t|'):
+                line = line[:-2]
+            yield line.split('\t|\t')
+
+
+def chunks(rows: Iterator, size: int = CHUNK_SIZE) -> Iterator[list]:
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def build_index(dump_dir: str, index_path: str):
+    # Builds next to the index and replaces it when complete, so validators never see a partial index
+    building_path = f'{index_path}.building'
+    if os.path.exists(building_path):
+        os.remove(building_path)
+    connection = sqlite3.connect(building_path)
+    connection.execute('PRAGMA journal_mode=OFF')
+    connection.execute('PRAGMA synchronous=OFF')
+    connection.execute(
+        'CREATE TABLE taxa (tax_id INTEGER PRIMARY KEY, parent_id INTEGER, rank TEXT, division TEXT, genetic_code TEXT, '
+        'mitochondrial_genetic_code TEXT, scientific_name TEXT, name_lower TEXT, common_name TEXT, submittable INTEGER NOT NULL DEFAULT 0)'
+    )
+    divisions = {}
+    division_path = join(dump_dir, 'division.dmp')
+    if os.path.exists(division_path):
+        divisions = {fields[0]: fields[1] for fields in read_dump(division_path)}
+    nodes = (
+        (int(fields[0]), int(fields[1]), fields[2], divisions.get(fields[4], fields[4]), fields[6], fields[8])
+        for fields in read_dump(join(dump_dir, 'nodes.dmp'))
+    )
+    for chunk in chunks(nodes):
+        connection.executemany(
+            'INSERT INTO taxa (tax_id, parent_id, rank, division, genetic_code, mitochondrial_genetic_code) VALUES (?, ?, ?, ?, ?, ?)', chunk)
+    names = (fields for fields in read_dump(join(dump_dir, 'names.dmp')) if fields[3] in ('scientific name',) + COMMON_NAME_CLASSES)
+    for chunk in chunks(names):
+        connection.executemany(
+            'UPDATE taxa SET scientific_name = ?, name_lower = ? WHERE tax_id = ?',
+            [(fields[1], fields[1].lower(), int(fields[0])) for fields in chunk if fields[3] == 'scientific name'])
+        # A GenBank common name is preferred to any other common name
+        connection.executemany(
+            'UPDATE taxa SET common_name = ? WHERE tax_id = ?',
+            [(fields[1], int(fields[0])) for fields in chunk if fields[3] == 'genbank common name'])
+        connection.executemany(
+            'UPDATE taxa SET common_name = ? WHERE tax_id = ? AND common_name IS NULL',
+            [(fields[1], int(fields[0])) for fields in chunk if fields[3] == 'common name'])
+    connection.execute('CREATE INDEX taxa_parent ON taxa (parent_id)')
+    # The dump does not say what ENA accepts, so taxa at or below the rank of species are marked submittable
+    connection.execute(
+        "WITH RECURSIVE below_species (tax_id) AS ("
+        " SELECT tax_id FROM taxa WHERE rank = 'species'"
+        " UNION SELECT taxa.tax_id FROM taxa JOIN below_species ON taxa.parent_id = below_species.tax_id"
+        ") UPDATE taxa SET submittable = 1 WHERE tax_id IN below_species"
+    )
+    connection.execute('CREATE INDEX taxa_name ON taxa (name_lower)')
+    connection.commit()
+    count = connection.execute('SELECT COUNT(*) FROM taxa').fetchone()[0]
+    connection.close()
+    os.replace(building_path, index_path)
+    logging.info(f'Taxonomy index of {count} taxa written to: {index_path}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Build a local taxonomy index from an NCBI taxonomy dump, for validating taxonomy without the ENA Taxonomy service'
+    )
+    parser.add_argument(
+        'dump_dir', type=str,
+        help='Directory of the extracted taxonomy dump, containing names.dmp, nodes.dmp and optionally division.dmp'
+    )
+    parser.add_argument(
+        'index_path', type=str,
+        help='Path of the index file to write, passed to cli.py with --taxonomy_index'
+    )
+    parser.add_argument(
+        '--log_level', '-l', type=str, default='INFO',
+        help='Override the default logging level: INFO',
+        choices=['CRITICAL', 'ERROR', 'WARNING', 'INFO', 'DEBUG']
+    )
+    args = vars(parser.parse_args())
+    logging.basicConfig(level=getattr(logging, args['log_level']))
+    build_index(args['dump_dir'], args['index_path'])
@@ -0,0 +1,164 @@
+import logging
+import threading
+import time
+from typing import Dict, List
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .ratelimit import AdaptiveLimiter, DEFAULT_THROTTLE_BACKOFF, DEFAULT_THROTTLE_RETRIES, THROTTLE_STATUSES, get_retry_after
+
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+CONNECT_TIMEOUT = 10
+DEFAULT_READ_TIMEOUT = 600
+DEFAULT_POOL_SIZE = 10
+RETRY_STATUSES = (500, 502, 503, 504)
+
+# Set once from the command line with configure(), used by every session created after
+SETTINGS = {
+    'retries': DEFAULT_RETRIES,
+    'backoff': DEFAULT_BACKOFF,
+    'read_timeout': DEFAULT_READ_TIMEOUT
+}
+
+
+def configure(retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF, read_timeout: float = DEFAULT_READ_TIMEOUT):
+    SETTINGS['retries'] = retries
+    SETTINGS['backoff'] = backoff
+    SETTINGS['read_timeout'] = read_timeout
+
+
+class TransportMetrics:
+    # Count, errors, bytes and latency of the requests to each endpoint, from every session
+    def __init__(self):
+        self.__endpoints: Dict[str, dict] = {}
+        self.__lock = threading.Lock()
+
+    def record(self, endpoint: str, seconds: float, sent: int = 0, received: int = 0, error: bool = False):
+        with self.__lock:
+            metrics = self.__endpoints.setdefault(endpoint, {'requests': 0, 'errors': 0, 'sent': 0, 'received': 0, 'latencies': []})
+            metrics['requests'] += 1
+            metrics['errors'] += 1 if error else 0
+            metrics['sent'] += sent
+            metrics['received'] += received
+            metrics['latencies'].append(seconds)
+
+    def get_metrics(self) -> Dict[str, dict]:
+        with self.__lock:
+            return {endpoint: dict(metrics, latencies=list(metrics['latencies'])) for endpoint, metrics in self.__endpoints.items()}
+
+    def report(self) -> List[str]:
+        lines = []
+        for endpoint, metrics in sorted(self.get_metrics().items()):
+            latencies = sorted(metrics['latencies'])
+            percentiles = ' '.join(
+                f'p{percentile} {get_percentile(latencies, percentile) * 1000:.0f}ms' for percentile in (50, 95, 99))
+            lines.append(
+                f"{endpoint}: {metrics['requests']} request(s), {metrics['errors']} error(s), "
+                f"{format_bytes(metrics['sent'])} sent, {format_bytes(metrics['received'])} received, {percentiles}")
+        return lines
+
+    def log_report(self):
+        for line in self.report():
+            logging.info(f'HTTP {line}')
+
+    def clear(self):
+        with self.__lock:
+            self.__endpoints.clear()
+
+
+METRICS = TransportMetrics()
+
+
+class TransportSession(requests.Session):
+    # Sets a timeout on every request and records it in the metrics. Requests may name their endpoint,
+    # for URLs that end with a value, so that they are counted together: session.get(url, endpoint='tax-id')
+    # With a limiter, requests wait for their turn and throttled requests are sent again when that is safe.
+    def __init__(self, service: str, read_timeout: float, metrics: TransportMetrics, limiter: AdaptiveLimiter = None,
+                 resend_methods: frozenset = Retry.DEFAULT_ALLOWED_METHODS):
+        super().__init__()
+        self.service = service
+        self.timeout = (CONNECT_TIMEOUT, read_timeout)
+        self.metrics = metrics
+        self.limiter = limiter
+        self.resend_methods = resend_methods
+
+    def request(self, method, url, *args, endpoint: str = None, **kwargs):
+        if not self.limiter:
+            return self.__send(method, url, endpoint, *args, **kwargs)
+        for attempt in range(DEFAULT_THROTTLE_RETRIES + 1):
+            ticket = self.limiter.acquire()
+            try:
+                response = self.__send(method, url, endpoint, *args, **kwargs)
+            except Exception:
+                self.limiter.release(ticket)
+                raise
+            throttled = response.status_code in THROTTLE_STATUSES
+            self.limiter.release(ticket, throttled, get_retry_after(response) if throttled else None)
+            if not throttled or attempt == DEFAULT_THROTTLE_RETRIES or not self.can_resend(method, response, kwargs):
+                return response
+            self.limiter.wait_before_retry(attempt, DEFAULT_THROTTLE_BACKOFF, response)
+
+    def can_resend(self, method: str, response: requests.Response, kwargs: dict) -> bool:
+        # A body streamed from a file cannot be sent again. A request answered with 429 was not processed,
+        # other throttled requests are only sent again when sending them twice has no effect.
+        if hasattr(kwargs.get('data'), 'read'):
+            return False
+        return response.status_code == 429 or method.upper() in self.resend_methods
+
+    def __send(self, method, url, endpoint: str, *args, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        endpoint = f'{self.service} {method.upper()} {endpoint if endpoint else urlparse(url).path}'
+        start = time.perf_counter()
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except requests.RequestException:
+            self.metrics.record(endpoint, time.perf_counter() - start, error=True)
+            raise
+        received = 0 if kwargs.get('stream') else len(response.content)
+        self.metrics.record(endpoint, time.perf_counter() - start, get_body_size(response.request.body), received, not response.ok)
+        return response
+
+
+def create_session(service: str, pool_size: int = DEFAULT_POOL_SIZE, pool_connections: int = DEFAULT_POOL_SIZE,
+                   retry_post: bool = False, metrics: TransportMetrics = METRICS, limiter: AdaptiveLimiter = None) -> TransportSession:
+    # Connections are kept alive and shared by threads. Server errors and failed connections are retried with backoff,
+    # POST is only retried for services where sending a request twice has no effect
+    allowed_methods = Retry.DEFAULT_ALLOWED_METHODS | {'POST'} if retry_post else Retry.DEFAULT_ALLOWED_METHODS
+    session = TransportSession(service, SETTINGS['read_timeout'], metrics, limiter, allowed_methods)
+    # Throttling answers are left to the limiter, which slows down every request to the service
+    status_forcelist = [status for status in RETRY_STATUSES if not limiter or status not in THROTTLE_STATUSES]
+    retry = Retry(
+        total=SETTINGS['retries'], backoff_factor=SETTINGS['backoff'], status_forcelist=status_forcelist,
+        allowed_methods=allowed_methods, raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_body_size(body) -> int:
+    try:
+        return len(body) if body else 0
+    except TypeError:
+        return 0
+
+
+def get_percentile(values: List[float], percentile: int) -> float:
+    # Nearest rank of values, which are sorted
+    if not values:
+        return 0.0
+    rank = max(int(round(percentile / 100 * len(values))), 1)
+    return values[min(rank, len(values)) - 1]
+
+
+def format_bytes(size: int) -> str:
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f'{size:.0f}{unit}' if unit == 'B' else f'{size:.1f}{unit}'
+        size /= 1024
+    return f'{size:.1f}GB'
@@ -0,0 +1,82 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Set, Tuple
+
+from submission.entity import Entity
+from submission.submission import Submission
+
+
+def get_journal_path(excel_path: str) -> str:
+    return f'{os.path.splitext(excel_path)[0]}.journal.ndjson'
+
+
+class SubmissionJournal:
+    # Append-only record of every accession received while brokering, one JSON object per line.
+    # Each line is on disk before the next entity is submitted, so a run that is killed can be resumed
+    # by replaying the journal into the submission and skipping the entities it already brokered.
+    def __init__(self, journal_path: str):
+        self.journal_path = journal_path
+        self.__recorded: Set[Tuple[str, str, str]] = set()
+        self.__lock = threading.Lock()
+        self.truncate_torn_line(journal_path)
+        self.__file = open(journal_path, 'a', encoding='utf-8')
+
+    @staticmethod
+    def truncate_torn_line(journal_path: str):
+        # A run killed while writing leaves a line without its newline, which is cut off
+        # so that the next record starts on a line of its own
+        if not os.path.exists(journal_path):
+            return
+        with open(journal_path, 'rb+') as journal_file:
+            content = journal_file.read()
+            if content and not content.endswith(b'\n'):
+                journal_file.truncate(content.rfind(b'\n') + 1)
+
+    def replay(self, data: Submission) -> int:
+        replayed = 0
+        with open(self.journal_path, encoding='utf-8') as journal_file:
+            for line in journal_file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # The last line is incomplete when the run was killed while writing it
+                    continue
+                entity = data.get_entity(record['entity_type'], record['index'])
+                if not entity:
+                    continue
+                entity.add_accession(record['service'], record['accession'])
+                self.__recorded.add((record['entity_type'], record['index'], record['service']))
+                replayed += 1
+        if replayed:
+            logging.info(f'Replayed {replayed} accession(s) from journal: {self.journal_path}')
+        return replayed
+
+    def record(self, entity: Entity, service: str, accession: str):
+        line = json.dumps({
+            'entity_type': entity.identifier.entity_type,
+            'index': entity.identifier.index,
+            'service': service,
+            'accession': accession,
+            'time': time.time()
+        })
+        with self.__lock:
+            self.__file.write(line + '\n')
+            self.__file.flush()
+            os.fsync(self.__file.fileno())
+            self.__recorded.add((entity.identifier.entity_type, entity.identifier.index, service))
+
+    def is_recorded(self, entity: Entity, service: str) -> bool:
+        return (entity.identifier.entity_type, entity.identifier.index, service) in self.__recorded
+
+    def complete(self):
+        # Called once the accessions are saved in the excel file, after which the journal is not needed
+        self.close()
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+
+    def close(self):
+        if not self.__file.closed:
+            self.__file.close()
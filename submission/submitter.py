@@ -0,0 +1,67 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Collection, List, Optional
+
+from submission.entity import Entity
+
+
+def submit_entities(entities: Collection[Entity], submit: Callable[[Entity], None], workers: int, service: str,
+                    error_attribute: str) -> dict:
+    # Submits each entity with up to workers at once. An error is added to the entity that failed,
+    # the other entities are still submitted. Returns a report of the run, which is also logged.
+    def submit_entity(entity: Entity) -> bool:
+        try:
+            submit(entity)
+            return True
+        except Exception as e:
+            add_submission_error(entity, service, error_attribute, e)
+            return False
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        submitted = sum(pool.map(submit_entity, entities))
+    return make_report(service, len(entities), submitted, time.perf_counter() - start, workers)
+
+
+def submit_batches(entities: Collection[Entity], submit_batch: Callable[[List[Entity]], List[Optional[str]]], batch_size: int,
+                   workers: int, service: str, error_attribute: str) -> dict:
+    # Submits up to batch_size entities in each request, with up to workers requests at once.
+    # submit_batch returns an error message, or None, for each entity in the batch. A batch that fails as a whole
+    # adds its error to each of its entities.
+    def submit_batch_entities(batch: List[Entity]) -> int:
+        try:
+            errors = submit_batch(batch)
+        except Exception as e:
+            errors = [e] * len(batch)
+        for entity, error in zip(batch, errors):
+            if error:
+                add_submission_error(entity, service, error_attribute, error)
+        return sum(1 for error in errors if not error)
+
+    entities = list(entities)
+    batch_size = max(batch_size, 1)
+    batches = [entities[start:start + batch_size] for start in range(0, len(entities), batch_size)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        submitted = sum(pool.map(submit_batch_entities, batches))
+    return make_report(service, len(entities), submitted, time.perf_counter() - start, workers, len(batches))
+
+
+def add_submission_error(entity: Entity, service: str, error_attribute: str, error):
+    error_msg = f'{service} Error: {error}'
+    entity.add_error(error_attribute, error_msg)
+
+
+def make_report(service: str, entities: int, submitted: int, seconds: float, workers: int, requests: int = None) -> dict:
+    report = {
+        'service': service,
+        'submitted': submitted,
+        'errors': entities - submitted,
+        'requests': entities if requests is None else requests,
+        'seconds': seconds
+    }
+    rate = submitted / seconds if seconds else 0
+    logging.info(f"{service}: submitted {submitted} of {entities} in {report['requests']} request(s) and {seconds:.1f}s "
+                 f"({rate:.1f}/s) with {max(workers, 1)} worker(s), {report['errors']} error(s)")
+    return report
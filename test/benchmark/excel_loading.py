@@ -0,0 +1,105 @@
+"""
+Compares the cell by cell row decoder against ExcelLoader's compiled column plan on a generated wide sheet,
+and the openpyxl reader against the direct xlsx stream reader.
+Run with: python3 -m test.benchmark.excel_loading [rows] [columns]
+"""
+import os
+import sys
+import tempfile
+import time
+from contextlib import closing
+from datetime import datetime
+
+from openpyxl import Workbook, load_workbook
+
+from excel.clean import is_value_populated
+from excel.load import ExcelLoader
+from excel.reader import xlsx_worksheet
+
+
+def make_workbook(file_path: str, rows: int, columns: int):
+    workbook = Workbook()
+    worksheet = workbook.active
+    objects = [None]
+    attributes = [None]
+    for column in range(columns):
+        objects.append('Sample' if column == 0 else None)
+        # Every third column has no heading, so will not be imported
+        attributes.append(None if column % 3 == 2 else f'attribute_{column}')
+    worksheet.append(objects)
+    worksheet.append(attributes)
+    for header in ['M', 'format', 'units']:
+        worksheet.append([None] + [header] * columns)
+    for row in range(rows):
+        values = [None]
+        for column in range(columns):
+            if column % 10 == 1:
+                values.append(datetime(2020, 1, 1 + row % 28))
+            elif column % 10 == 2:
+                values.append(row * column)
+            else:
+                values.append(f' value {row}.{column} ')
+        worksheet.append(values)
+    workbook.save(file_path)
+
+
+def cell_decoder(worksheet, column_map: dict):
+    # The decoder used before the column plan, visiting every cell object
+    row_index = 6
+    for row in worksheet.iter_rows(min_row=row_index, min_col=2):
+        row_data = {}
+        for cell in row:
+            if cell.value is not None and (cell.is_date or not isinstance(cell.value, str) or is_value_populated(cell.value)):
+                if cell.is_date:
+                    value = cell.value.date().isoformat()
+                else:
+                    value = str(cell.value).strip()
+                if cell.column_letter in column_map:
+                    object_name = column_map[cell.column_letter]['object']
+                    attribute_name = column_map[cell.column_letter]['attribute']
+                    row_data.setdefault(object_name, {})[attribute_name] = value
+        for entity_type, attributes in row_data.items():
+            yield row_index, entity_type, attributes
+        row_index = row_index + 1
+
+
+class PreloadedWorksheet:
+    # Holds the parsed rows in memory so that only the decoding is timed
+    def __init__(self, worksheet):
+        self.cells = list(worksheet.iter_rows(min_row=6, min_col=2))
+        self.values = list(worksheet.iter_rows(min_row=6, min_col=2, values_only=True))
+
+    def iter_rows(self, values_only=False, **kwargs):
+        return iter(self.values if values_only else self.cells)
+
+
+def time_decoder(worksheet, column_map: dict, decoder) -> (float, list):
+    start = time.perf_counter()
+    rows = list(decoder(worksheet, column_map))
+    return time.perf_counter() - start, rows
+
+
+def main(rows: int = 2000, columns: int = 150):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, 'benchmark.xlsx')
+        make_workbook(file_path, rows, columns)
+        with closing(load_workbook(filename=file_path, read_only=True, keep_links=False)) as workbook:
+            worksheet = workbook.worksheets[0]
+            column_map = ExcelLoader.get_column_map(worksheet)
+            cell_load, cell_rows = time_decoder(worksheet, column_map, cell_decoder)
+            plan_load, plan_rows = time_decoder(worksheet, column_map, ExcelLoader.iter_rows)
+            preloaded = PreloadedWorksheet(worksheet)
+        with xlsx_worksheet(file_path) as worksheet:
+            xlsx_load, xlsx_rows = time_decoder(worksheet, column_map, ExcelLoader.iter_rows)
+        cell_decode, _ = time_decoder(preloaded, column_map, cell_decoder)
+        plan_decode, _ = time_decoder(preloaded, column_map, ExcelLoader.iter_rows)
+    assert cell_rows == plan_rows == xlsx_rows, 'Decoders disagree'
+    print(f'{rows} rows x {columns} columns')
+    print(f'{"":14}{"cell decoder":>14}{"column plan":>14}{"speedup":>10}')
+    print(f'{"decode only":14}{cell_decode:>13.3f}s{plan_decode:>13.3f}s{cell_decode / plan_decode:>9.1f}x')
+    print(f'{"parse+decode":14}{cell_load:>13.3f}s{plan_load:>13.3f}s{cell_load / plan_load:>9.1f}x')
+    print(f'{"xlsx reader":14}{"":>14}{xlsx_load:>13.3f}s{cell_load / xlsx_load:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,59 @@
+"""
+Measures JsonValidator throughput against a local stub of the json-schema-validator container,
+sequentially and with concurrent and batched requests.
+Run with: python3 -m test.benchmark.json_validation [samples] [latency_ms]
+"""
+import json
+import sys
+import time
+from datetime import date, timedelta
+from os.path import dirname, join
+
+from submission.submission import Submission
+from test.stub_validator import stub_validator_process
+from validation.json import JsonValidator
+
+SETTINGS = [
+    # (batch_size, concurrency)
+    (1, 1),
+    (1, 4),
+    (1, 16),
+    (25, 1),
+    (25, 4)
+]
+
+
+def make_submission(samples: int) -> Submission:
+    with open(join(dirname(__file__), '../resources/data_for_test_issues.json')) as test_data_file:
+        sample = json.load(test_data_file)['sample']
+    submission = Submission()
+    for number in range(samples):
+        attributes = dict(sample)
+        attributes['sample_alias'] = f'sample_{number}'
+        # Identical samples would be validated once, so each is given its own receipt date
+        attributes['receipt_date'] = str(date(2000, 1, 1) + timedelta(days=number))
+        submission.map('sample', f'sample_{number}', attributes)
+    return submission
+
+
+def main(samples: int = 1000, latency_ms: int = 5):
+    results = {}
+    with stub_validator_process(latency=latency_ms / 1000) as validator_url:
+        for batch_size, concurrency in SETTINGS:
+            submission = make_submission(samples)
+            validator = JsonValidator(validator_url, batch_size=batch_size, concurrency=concurrency)
+            start = time.perf_counter()
+            validator.validate_data(submission)
+            seconds = time.perf_counter() - start
+            requests = -(-samples // batch_size)
+            results[(batch_size, concurrency)] = (seconds, requests, json.dumps(submission.get_all_errors()))
+    assert len({errors for _, _, errors in results.values()}) == 1, 'Settings disagree on errors'
+    sequential_seconds = results[(1, 1)][0]
+    print(f'{samples} samples, {latency_ms}ms stub latency per request')
+    print(f'{"batch size":>10}{"concurrency":>13}{"requests":>10}{"seconds":>9}{"entities/s":>12}{"speedup":>9}')
+    for (batch_size, concurrency), (seconds, requests, _) in results.items():
+        print(f'{batch_size:>10}{concurrency:>13}{requests:>10}{seconds:>9.2f}{samples / seconds:>12.0f}{sequential_seconds / seconds:>8.1f}x')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,75 @@
+import json
+import threading
+from contextlib import contextmanager
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+
+class StubBioSamplesServer(ThreadingHTTPServer):
+    # Stand-in for the BioSamples bulk-submit endpoint, samples named "invalid..." are rejected.
+    # Stored samples are returned in reverse order without the rejected ones, so they can only be matched by name.
+    # With item_errors a rejected sample is answered with its error, otherwise the whole request is rejected.
+    daemon_threads = True
+
+    def __init__(self, item_errors=True):
+        super().__init__(('127.0.0.1', 0), StubBioSamplesHandler)
+        self.item_errors = item_errors
+        self.requests = 0
+        self.samples = 0
+        self.tokens = set()
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}/biosamples'
+
+
+class StubBioSamplesHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        server: StubBioSamplesServer = self.server
+        samples = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        with server.lock:
+            server.requests += 1
+            server.samples += len(samples)
+            server.tokens.add(self.headers.get('Authorization'))
+        if self.path != '/biosamples/v2/samples/bulk-submit':
+            self.send_json(HTTPStatus.NOT_FOUND, {'error': f'Not found: {self.path}'})
+            return
+        rejected = [sample for sample in samples if sample['name'].startswith('invalid')]
+        if rejected and not server.item_errors:
+            self.send_json(HTTPStatus.BAD_REQUEST, {'errors': [f"Sample {sample['name']} is not valid" for sample in rejected]})
+            return
+        stored = []
+        for sample in reversed(samples):
+            if sample in rejected:
+                stored.append({'name': sample['name'], 'errors': [f"Sample {sample['name']} is not valid"]})
+            else:
+                stored.append(dict(sample, accession=sample.get('accession') or f"SAMEA_{sample['name']}"))
+        self.send_json(HTTPStatus.CREATED, stored)
+
+    def send_json(self, status: HTTPStatus, body):
+        content = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def stub_biosamples(item_errors=True) -> Iterator[StubBioSamplesServer]:
+    server = StubBioSamplesServer(item_errors)
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
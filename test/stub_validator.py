@@ -0,0 +1,116 @@
+import json
+import multiprocessing
+import threading
+import time
+from contextlib import contextmanager
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator
+
+from validation.local import LocalJsonValidator
+
+
+class StubValidatorServer(ThreadingHTTPServer):
+    # Stand-in for the json-schema-validator container, answering with the errors of the local validator.
+    # With batching, {"schema": ..., "objects": [...]} is answered with a list of errors for each object.
+    daemon_threads = True
+
+    def __init__(self, batching=True, latency=0.0):
+        super().__init__(('127.0.0.1', 0), StubValidatorHandler)
+        self.batching = batching
+        self.latency = latency
+        self.format_checker = LocalJsonValidator.get_format_checker()
+        self.validators: Dict[str, object] = {}
+        self.requests = 0
+        self.objects = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}/validate'
+
+    def validate(self, schema: dict, instance: dict) -> list:
+        schema_key = json.dumps(schema, sort_keys=True)
+        with self.lock:
+            if schema_key not in self.validators:
+                self.validators[schema_key] = LocalJsonValidator.compile_schema(schema, self.format_checker)
+            validator = self.validators[schema_key]
+        errors_by_path = {}
+        for data_path, message in LocalJsonValidator.iter_messages(validator, instance):
+            errors_by_path.setdefault(data_path, []).append(message)
+        return [{'dataPath': data_path, 'errors': errors} for data_path, errors in errors_by_path.items()]
+
+
+class StubValidatorHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        server: StubValidatorServer = self.server
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            if server.latency:
+                time.sleep(server.latency)
+            if 'objects' in payload:
+                if not server.batching:
+                    self.send_json(HTTPStatus.BAD_REQUEST, {'error': 'object is required'})
+                    return
+                with server.lock:
+                    server.objects += len(payload['objects'])
+                self.send_json(HTTPStatus.OK, [server.validate(payload['schema'], instance) for instance in payload['objects']])
+            else:
+                with server.lock:
+                    server.objects += 1
+                self.send_json(HTTPStatus.OK, server.validate(payload['schema'], payload['object']))
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def send_json(self, status: HTTPStatus, body):
+        content = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def stub_validator(batching=True, latency=0.0) -> Iterator[StubValidatorServer]:
+    server = StubValidatorServer(batching, latency)
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@contextmanager
+def stub_validator_process(batching=True, latency=0.0) -> Iterator[str]:
+    # Runs the stub in its own process, so that it does not share the interpreter lock with the client
+    context = multiprocessing.get_context('spawn')
+    url_queue = context.Queue()
+    process = context.Process(target=serve_stub_validator, args=(url_queue, batching, latency), daemon=True)
+    process.start()
+    try:
+        yield url_queue.get(timeout=30)
+    finally:
+        process.terminate()
+        process.join()
+
+
+def serve_stub_validator(url_queue, batching: bool, latency: float):
+    server = StubValidatorServer(batching, latency)
+    url_queue.put(server.url)
+    server.serve_forever()
@@ -0,0 +1,82 @@
+import tempfile
+import unittest
+
+from lxml import etree
+
+from conversion.ena.response import EnaResponseConverter
+from conversion.ena.submission import EnaSubmissionConverter
+from submission.entity import Entity
+from submission.submission import Submission
+
+
+class StubEnaConverter:
+    def __init__(self, ena_type: str):
+        self.ena_type = ena_type
+
+    def convert(self, entity: Entity):
+        return etree.XML(f'<{self.ena_type.upper()} alias="{entity.identifier.index}" />')
+
+
+class TestEnaSubmissionSplit(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.submission = Submission()
+        self.submission.map('study', 'project_1', {})
+        for number in range(5):
+            self.submission.map('sample', f'sample_{number}', {})
+        self.converter = EnaSubmissionConverter()
+        self.converter.conversion_map = [('study', StubEnaConverter('Project')), ('sample', StubEnaConverter('Sample'))]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    @staticmethod
+    def read_aliases(file_path: str) -> list:
+        return [element.get('alias') for element in etree.parse(file_path).getroot()]
+
+    def test_small_submission_is_not_split(self):
+        submissions = self.converter.write_ena_submissions(self.submission, self.temp_dir.name)
+
+        self.assertEqual(1, len(submissions))
+        self.assertListEqual(['PROJECT', 'SAMPLE'], list(submissions[0]))
+        file_name, file_path = submissions[0]['SAMPLE']
+        self.assertEqual('SAMPLE.xml', file_name)
+        self.assertEqual(5, len(self.read_aliases(file_path)))
+
+    def test_submission_is_split_in_dependency_order(self):
+        submissions = self.converter.write_ena_submissions(self.submission, self.temp_dir.name, max_objects=4)
+
+        self.assertEqual(2, len(submissions))
+        self.assertListEqual(['project_1'], self.read_aliases(submissions[0]['PROJECT'][1]))
+        self.assertListEqual(['sample_0', 'sample_1', 'sample_2'], self.read_aliases(submissions[0]['SAMPLE'][1]))
+        self.assertListEqual(['SAMPLE'], list(submissions[1]))
+        self.assertListEqual(['sample_3', 'sample_4'], self.read_aliases(submissions[1]['SAMPLE'][1]))
+
+    def test_submission_is_split_by_size(self):
+        submissions = self.converter.write_ena_submissions(self.submission, self.temp_dir.name, max_bytes=1)
+
+        self.assertEqual(6, len(submissions))
+
+    def test_accessions_from_every_response_are_added(self):
+        # Given
+        first_response = b'<RECEIPT success="true"><PROJECT alias="project_1" accession="PRJEB1"/>' \
+                         b'<SAMPLE alias="sample_0" accession="ERS1"/><SUBMISSION alias="first" accession="ERA1"/>' \
+                         b'<MESSAGES><INFO>Submission has been committed.</INFO></MESSAGES><ACTIONS>ADD</ACTIONS></RECEIPT>'
+        second_response = b'<RECEIPT success="false"><SAMPLE alias="sample_1"/><SUBMISSION alias="second"/>' \
+                          b'<MESSAGES><ERROR>In sample, alias:"sample_1", accession:"". Invalid taxon.</ERROR></MESSAGES>' \
+                          b'<ACTIONS>ADD</ACTIONS></RECEIPT>'
+
+        # When
+        response = EnaResponseConverter.merge_responses([first_response, second_response])
+        EnaResponseConverter().convert_response_file(self.submission, response)
+
+        # Then
+        self.assertTrue(EnaResponseConverter.is_successful(response))
+        self.assertEqual('PRJEB1', self.submission.get_entity('study', 'project_1').get_accession('ENA_Project'))
+        self.assertEqual('ERS1', self.submission.get_entity('sample', 'sample_0').get_accession('ENA_Sample'))
+        self.assertEqual('ERA1', self.submission.get_entity('submission', 'first').get_accession('ENA_Submission'))
+        self.assertIn('sample_1', self.submission.get_errors('sample'))
+
+
+if __name__ == '__main__':
+    unittest.main()
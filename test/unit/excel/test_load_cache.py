@@ -0,0 +1,81 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from openpyxl import Workbook
+
+from excel import load
+from excel.cache import LoadCache
+from excel.load import ExcelLoader
+
+
+class TestLoadCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, 'cache')
+        self.excel_path = os.path.join(self.temp_dir.name, 'test.xlsx')
+        self.save_workbook('SAME1')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def save_workbook(self, sample_alias: str):
+        workbook = Workbook()
+        worksheet = workbook.active
+        worksheet['B1'] = 'Sample'
+        worksheet['B2'] = 'sample_alias'
+        worksheet['C2'] = 'collection_date'
+        worksheet['A5'] = '#Units'
+        worksheet.append([None, sample_alias, datetime(2020, 12, 25)])
+        workbook.save(self.excel_path)
+
+    def test_unchanged_workbook_loaded_from_cache(self):
+        cache = LoadCache(self.cache_dir)
+        expected = ExcelLoader(self.excel_path, cache=cache).data.as_dict()
+
+        with patch.dict(load.READERS, {'openpyxl': None}):
+            loader = ExcelLoader(self.excel_path, cache=cache)
+            self.assertDictEqual(expected, loader.data.as_dict())
+
+    def test_changed_workbook_not_loaded_from_cache(self):
+        cache = LoadCache(self.cache_dir)
+        ExcelLoader(self.excel_path, cache=cache).data
+        self.save_workbook('SAME2')
+
+        loader = ExcelLoader(self.excel_path, cache=cache)
+
+        self.assertIsNotNone(loader.data.get_entity('sample', 'SAME2'))
+
+    def test_partially_read_workbook_not_cached(self):
+        cache = LoadCache(self.cache_dir)
+        loader = ExcelLoader(self.excel_path, cache=cache)
+        next(loader.iter_entities())
+
+        self.assertIsNone(cache.get(LoadCache.key(self.excel_path, 0, load.HEADER_ROWS)))
+
+    def test_expired_entries_evicted(self):
+        cache = LoadCache(self.cache_dir, max_age=60)
+        cache.put('old', 'value')
+        old_time = time.time() - 120
+        os.utime(os.path.join(self.cache_dir, 'old.pickle'), (old_time, old_time))
+
+        self.assertIsNone(cache.get('old'))
+
+    def test_least_recently_used_entries_evicted_by_size(self):
+        cache = LoadCache(self.cache_dir, max_bytes=3000)
+        cache.put('first', b'1' * 1000)
+        cache.put('second', b'2' * 1000)
+        first_path = os.path.join(self.cache_dir, 'first.pickle')
+        second_path = os.path.join(self.cache_dir, 'second.pickle')
+        os.utime(first_path, (time.time() - 20, time.time() - 20))
+        os.utime(second_path, (time.time() - 10, time.time() - 10))
+        cache.get('first')
+
+        cache.put('third', b'3' * 1000)
+
+        self.assertIsNotNone(cache.get('first'))
+        self.assertIsNone(cache.get('second'))
+        self.assertIsNotNone(cache.get('third'))
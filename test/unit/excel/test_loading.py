@@ -1,10 +1,61 @@
+import os
+import tempfile
 import unittest
+from datetime import datetime
+
+from openpyxl import Workbook
 
 from excel.load import ExcelLoader
 from excel.submission import ExcelSubmission
 
 
 class TestExcelLoading(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.excel_path = os.path.join(self.temp_dir.name, 'test.xlsx')
+        workbook = Workbook()
+        worksheet = workbook.active
+        worksheet['B1'] = 'Study'
+        worksheet['B2'] = 'study_alias'
+        worksheet['C1'] = 'Sample - Mandatory'
+        worksheet['C2'] = 'sample_alias'
+        worksheet['D2'] = 'collection_date'
+        worksheet['A5'] = '#Units'
+        worksheet.append([None, 'STUD1', 'SAME1', datetime(2020, 12, 25)])
+        worksheet.append([None, 'STUD1', 'SAME2', '  '])
+        workbook.save(self.excel_path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_iter_entities_streams_rows(self):
+        loader = ExcelLoader(self.excel_path)
+        expected_rows = [
+            (6, 'study', {'study_alias': 'STUD1'}),
+            (6, 'sample', {'sample_alias': 'SAME1', 'collection_date': '2020-12-25'}),
+            (7, 'study', {'study_alias': 'STUD1'}),
+            (7, 'sample', {'sample_alias': 'SAME2'})
+        ]
+        self.assertListEqual(expected_rows, list(loader.iter_entities()))
+
+    def test_data_built_from_streamed_rows(self):
+        loader = ExcelLoader(self.excel_path)
+        study = loader.data.get_entity('study', 'STUD1')
+
+        self.assertSetEqual({6, 7}, loader.data.get_rows('study', 'STUD1'))
+        self.assertSetEqual({'SAME1', 'SAME2'}, study.get_linked_indexes('sample'))
+
+    def test_column_plan_skips_columns_without_heading(self):
+        column_map = {
+            'B': {'object': 'study', 'attribute': 'study_alias'},
+            'E': {'object': 'sample', 'attribute': 'sample_alias', 'units': 'none'},
+            'C': {'attribute': 'no_object'}
+        }
+        plan = ExcelLoader.get_column_plan(column_map)
+
+        self.assertListEqual([(0, 'study', 'study_alias'), (3, 'sample', 'sample_alias')],
+                             [slot[:3] for slot in plan])
+
     def test_loading_accession_equality(self):
         submission = ExcelSubmission()
         study_entity1 = ExcelLoader.map_row_entity(submission, 1, 'study', {'study_accession': 'STUD1'})
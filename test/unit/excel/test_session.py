@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from openpyxl import Workbook, load_workbook
+
+from excel import session
+from excel.markup import ExcelMarkup
+from excel.session import WorkbookSession
+from validation.excel import ExcelValidator
+
+
+class TestWorkbookSession(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.excel_path = os.path.join(self.temp_dir.name, 'test.xlsx')
+        workbook = Workbook()
+        worksheet = workbook.active
+        worksheet['A6'] = '1 Errors'
+        worksheet['B1'] = 'Study'
+        worksheet['B2'] = 'study_alias'
+        worksheet['B3'] = 'M'
+        worksheet['C2'] = 'email_address'
+        worksheet['C3'] = 'M'
+        worksheet['A5'] = '#Units'
+        worksheet['B6'] = 'STUD1'
+        workbook.save(self.excel_path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_shared_session_parses_workbook_once(self):
+        with patch.object(session, 'load_workbook', wraps=session.load_workbook) as mock_load:
+            workbook_session = WorkbookSession(self.excel_path)
+            excel = ExcelMarkup(self.excel_path, session=workbook_session)
+            excel.validate(ExcelValidator(self.excel_path, session=workbook_session))
+            excel.markup_with_errors()
+            workbook_session.close()
+
+        mock_load.assert_called_once()
+        worksheet = load_workbook(self.excel_path).active
+        self.assertEqual('1 Errors', worksheet['A6'].value)
+        self.assertIn("should have required property 'email_address'.", worksheet['C6'].comment.text)
+
+    def test_markup_cleared_in_memory_and_saved_on_close(self):
+        excel = ExcelMarkup(self.excel_path)
+        self.assertEqual('1 Errors', load_workbook(self.excel_path).active['A6'].value)
+
+        excel.close()
+
+        self.assertIsNone(load_workbook(self.excel_path).active['A6'].value)
+
+    def test_unmodified_session_does_not_save(self):
+        workbook_session = WorkbookSession(self.excel_path)
+        with patch.object(workbook_session.workbook, 'save') as mock_save:
+            workbook_session.close()
+        mock_save.assert_not_called()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from openpyxl import Workbook
+
+from excel.validate import ValidatingExcel
+from submission.entity import Entity
+from validation.base import BaseValidator
+
+
+class CollectionDateValidator(BaseValidator):
+    def __init__(self):
+        self.validated = []
+
+    def validate_entity(self, entity: Entity):
+        self.validated.append(entity.identifier.index)
+        if entity.identifier.entity_type == 'sample' and 'collection_date' not in entity.attributes:
+            entity.add_error('collection_date', 'should have required property collection_date')
+
+
+class TestValidatingExcel(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.excel_path = os.path.join(self.temp_dir.name, 'test.xlsx')
+        workbook = Workbook()
+        worksheet = workbook.active
+        worksheet['B1'] = 'Study'
+        worksheet['B2'] = 'study_alias'
+        worksheet['C1'] = 'Sample - Mandatory'
+        worksheet['C2'] = 'sample_alias'
+        worksheet['D2'] = 'collection_date'
+        worksheet['A5'] = '#Units'
+        worksheet.append([None, 'STUD1', 'SAME1', datetime(2020, 12, 25)])
+        worksheet.append([None, 'STUD1', 'SAME2', '  '])
+        workbook.save(self.excel_path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_iter_validated_yields_rows_in_order_with_errors(self):
+        # Given
+        validator = CollectionDateValidator()
+        excel = ValidatingExcel(self.excel_path)
+
+        # When
+        validated = [(row_index, entity.identifier.entity_type, entity.identifier.index, entity.get_errors())
+                     for row_index, entity in excel.iter_validated(validator)]
+
+        # Then
+        self.assertListEqual([
+            (6, 'study', 'STUD1', {}),
+            (6, 'sample', 'SAME1', {}),
+            (7, 'study', 'STUD1', {}),
+            (7, 'sample', 'SAME2', {'collection_date': ['should have required property collection_date']})
+        ], validated)
+        self.assertListEqual(['STUD1', 'SAME1', 'STUD1', 'SAME2'], validator.validated)
+
+    def test_iter_validated_runs_every_validator(self):
+        validators = [CollectionDateValidator(), CollectionDateValidator()]
+
+        rows = list(ValidatingExcel(self.excel_path).iter_validated(*validators))
+
+        self.assertEqual(4, len(rows))
+        for validator in validators:
+            self.assertEqual(4, len(validator.validated))
+
+
+if __name__ == '__main__':
+    unittest.main()
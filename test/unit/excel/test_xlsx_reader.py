@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from openpyxl import Workbook
+
+from excel.load import ExcelLoader
+from excel.reader import openpyxl_worksheet, xlsx_worksheet
+
+EXAMPLE_PATH = os.path.join(os.path.dirname(__file__), '../../../examples/blank_v3_raw_reads.xlsx')
+
+
+class TestXlsxReaderParity(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.excel_path = os.path.join(self.temp_dir.name, 'test.xlsx')
+        workbook = Workbook()
+        worksheet = workbook.active
+        worksheet['B1'] = 'Study'
+        worksheet['B2'] = 'study_alias'
+        worksheet['C1'] = 'Sample - Mandatory'
+        worksheet['C2'] = 'sample_alias'
+        worksheet['D2'] = 'collection_date'
+        worksheet['E2'] = 'coverage'
+        worksheet['F2'] = 'is_paired'
+        worksheet['G2'] = 'total'
+        worksheet['E5'] = 'x'
+        worksheet.append([None, 'STUD1', 'SAME1', datetime(2020, 12, 25), 1.5, True, '=E6*2'])
+        worksheet.append([None, 'STUD1', 'SAME2', '  ', 42, False, None])
+        worksheet.append([])
+        worksheet.append([None, 'STUD2', 'SAME1', 'not collected', '1e3', None, None])
+        workbook.save(self.excel_path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def assert_same_values(self, excel_path: str, **kwargs):
+        with openpyxl_worksheet(excel_path) as reference, xlsx_worksheet(excel_path) as worksheet:
+            expected = list(reference.iter_rows(values_only=True, **kwargs))
+            actual = list(worksheet.iter_rows(values_only=True, **kwargs))
+        self.assertListEqual(expected, actual)
+
+    def assert_same_loading(self, excel_path: str):
+        reference = ExcelLoader(excel_path)
+        loader = ExcelLoader(excel_path, reader='xlsx')
+        self.assertDictEqual(reference.column_map, loader.column_map)
+        self.assertListEqual(list(reference.iter_entities()), list(loader.iter_entities()))
+        self.assertDictEqual(reference.data.as_dict(), loader.data.as_dict())
+
+    def test_example_values_match_openpyxl(self):
+        self.assert_same_values(EXAMPLE_PATH)
+        self.assert_same_values(EXAMPLE_PATH, min_col=2, max_row=5)
+        self.assert_same_values(EXAMPLE_PATH, min_row=6, min_col=2, max_col=20)
+
+    def test_example_loading_matches_openpyxl(self):
+        self.assert_same_loading(EXAMPLE_PATH)
+
+    def test_populated_values_match_openpyxl(self):
+        self.assert_same_values(self.excel_path)
+        self.assert_same_values(self.excel_path, min_row=6, min_col=2, max_col=7)
+
+    def test_populated_loading_matches_openpyxl(self):
+        self.assert_same_loading(self.excel_path)
+
+    def test_accepted_values_sheet_matches_openpyxl(self):
+        with openpyxl_worksheet(EXAMPLE_PATH, 1) as reference, xlsx_worksheet(EXAMPLE_PATH, 1) as worksheet:
+            self.assertListEqual(list(reference.iter_rows(values_only=True)), list(worksheet.iter_rows()))
+
+    def test_unknown_reader_rejected(self):
+        with self.assertRaises(ValueError):
+            ExcelLoader(self.excel_path, reader='unknown')
@@ -0,0 +1,53 @@
+import base64
+import json
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from services.aap import AapTokenCache, get_token_expiry
+
+
+def make_token(expires: float) -> str:
+    def encode(content: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(content).encode('utf-8')).decode('utf-8').rstrip('=')
+    return f"{encode({'alg': 'RS256'})}.{encode({'sub': 'usr-1', 'exp': expires})}.signature"
+
+
+class TestAapTokenCache(unittest.TestCase):
+    def test_token_is_reused_until_near_expiry(self):
+        # Given
+        aap_client = MagicMock()
+        aap_client.get_token.return_value = make_token(time.time() + 3600)
+        tokens = AapTokenCache(aap_client)
+
+        # When
+        threads = [threading.Thread(target=tokens.get_token) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Then
+        self.assertEqual(1, aap_client.get_token.call_count)
+
+    def test_token_is_refreshed_near_expiry(self):
+        aap_client = MagicMock()
+        aap_client.get_token.side_effect = [make_token(time.time() + 60), make_token(time.time() + 3600)]
+        tokens = AapTokenCache(aap_client, refresh_margin=300)
+
+        first_token = tokens.get_token()
+        second_token = tokens.get_token()
+        third_token = tokens.get_token()
+
+        self.assertNotEqual(first_token, second_token)
+        self.assertEqual(second_token, third_token)
+        self.assertEqual(2, tokens.refreshes)
+
+    def test_expiry_is_read_from_the_token(self):
+        self.assertEqual(1600000000, get_token_expiry(make_token(1600000000)))
+        self.assertGreater(get_token_expiry('not a jwt'), time.time())
+
+
+if __name__ == '__main__':
+    unittest.main()
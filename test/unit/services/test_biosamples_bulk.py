@@ -0,0 +1,129 @@
+import tempfile
+import unittest
+from os.path import join
+from unittest.mock import MagicMock
+
+from cli import CovidExcelUtils
+from conversion.biosamples import BioSamplesConverter
+from services.biosamples import BioSamples
+from submission.journal import SubmissionJournal
+from submission.submission import Submission
+from test.stub_biosamples import stub_biosamples
+
+
+class TestBioSamplesBulk(unittest.TestCase):
+    def setUp(self):
+        self.aap_client = MagicMock()
+        self.aap_client.get_token.return_value = 'not.a.token'
+        self.converter = BioSamplesConverter({}, 'self.test-domain')
+        self.excel_utils = CovidExcelUtils('', [])
+        self.excel_utils.excel = MagicMock()
+        self.excel_utils.excel.data = Submission()
+
+    def add_samples(self, names):
+        for name in names:
+            self.excel_utils.excel.data.map('sample', name, {
+                'sample_title': name,
+                'tax_id': '2697049',
+                'scientific_name': 'Severe acute respiratory syndrome coronavirus 2'
+            })
+
+    def test_samples_are_sent_in_chunks_and_mapped_back_by_name(self):
+        # Given
+        names = [f'sample_{number}' for number in range(10)]
+        self.add_samples(names)
+
+        with stub_biosamples() as server:
+            service = BioSamples(self.aap_client, server.url)
+
+            # When
+            report = self.excel_utils.submit_to_biosamples(self.converter, service, workers=2, bulk_size=4)
+
+            # Then
+            self.assertEqual(3, server.requests)
+            self.assertEqual(10, server.samples)
+            self.assertSetEqual({'Bearer not.a.token'}, server.tokens)
+        self.assertEqual(10, report['submitted'])
+        for name in names:
+            self.assertEqual(f'SAMEA_{name}', self.excel_utils.excel.data.get_entity('sample', name).get_accession('BioSamples'))
+
+    def test_rejected_samples_get_errors_without_failing_the_batch(self):
+        self.add_samples(['sample_1', 'invalid_2', 'sample_3'])
+
+        with stub_biosamples() as server:
+            report = self.excel_utils.submit_to_biosamples(self.converter, BioSamples(self.aap_client, server.url), bulk_size=3)
+
+        self.assertEqual(2, report['submitted'])
+        self.assertDictEqual(
+            {'invalid_2': {'sample_accession': ['BioSamples Error: Sample invalid_2 is not valid']}},
+            self.excel_utils.excel.data.get_errors('sample')
+        )
+        self.assertEqual('SAMEA_sample_3', self.excel_utils.excel.data.get_entity('sample', 'sample_3').get_accession('BioSamples'))
+
+    def test_repeated_names_are_matched_by_position(self):
+        payloads = [{'name': 'same'}, {'name': 'same'}]
+        stored_samples = [{'name': 'same', 'accession': 'SAMEA1'}, {'name': 'same', 'accession': 'SAMEA2'}]
+
+        responses = BioSamples.map_bulk_response(payloads, stored_samples)
+
+        self.assertListEqual(['SAMEA1', 'SAMEA2'], [response['accession'] for response in responses])
+
+    def test_repeated_names_get_errors_when_samples_are_missing(self):
+        # Given
+        payloads = [{'name': 'same'}, {'name': 'other'}, {'name': 'same'}]
+        stored_samples = [{'name': 'same', 'accession': 'SAMEA1'}, {'name': 'other', 'accession': 'SAMEA2'}]
+
+        # When
+        responses = BioSamples.map_bulk_response(payloads, stored_samples)
+
+        # Then
+        self.assertIn('not unique', responses[0]['error'])
+        self.assertEqual('SAMEA2', responses[1]['accession'])
+        self.assertIn('not unique', responses[2]['error'])
+
+    def test_rejected_batch_is_sent_again_one_sample_at_a_time(self):
+        # Given
+        self.add_samples(['sample_1', 'invalid_2', 'sample_3'])
+
+        def send_sample(sample):
+            if sample.name.startswith('invalid'):
+                raise ValueError(f'Sample {sample.name} is not valid')
+            return {'accession': f'SAMEA_{sample.name}'}
+
+        with stub_biosamples(item_errors=False) as server:
+            service = BioSamples(self.aap_client, server.url)
+            service.send_sample = MagicMock(side_effect=send_sample)
+
+            # When
+            report = self.excel_utils.submit_to_biosamples(self.converter, service, bulk_size=3)
+
+        # Then
+        self.assertEqual(3, service.send_sample.call_count)
+        self.assertEqual(2, report['submitted'])
+        self.assertListEqual(['invalid_2'], list(self.excel_utils.excel.data.get_errors('sample')))
+
+    def test_samples_in_the_journal_are_not_submitted_again(self):
+        # Given
+        self.add_samples(['sample_1', 'sample_2', 'sample_3'])
+        with tempfile.TemporaryDirectory() as temp_dir:
+            journal_path = join(temp_dir, 'submission.journal.ndjson')
+            interrupted_journal = SubmissionJournal(journal_path)
+            interrupted_journal.record(self.excel_utils.excel.data.get_entity('sample', 'sample_2'), 'BioSamples', 'SAMEA_first_run')
+            interrupted_journal.close()
+            self.excel_utils.journal = SubmissionJournal(journal_path)
+            self.excel_utils.journal.replay(self.excel_utils.excel.data)
+
+            with stub_biosamples() as server:
+                # When
+                self.excel_utils.submit_to_biosamples(self.converter, BioSamples(self.aap_client, server.url), bulk_size=3)
+
+                # Then
+                self.assertEqual(2, server.samples)
+            self.excel_utils.journal.close()
+            with open(journal_path) as journal_file:
+                self.assertEqual(3, len(journal_file.readlines()))
+        self.assertEqual('SAMEA_first_run', self.excel_utils.excel.data.get_entity('sample', 'sample_2').get_accession('BioSamples'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -84,7 +84,7 @@ class TestBioStudiesService(unittest.TestCase):
         biostudies = BioStudies("url", "username", "password")
         biostudies.api.create_submission = MagicMock(return_value=response)
         biostudies.api.create_user_sub_folder = MagicMock()
-        biostudies.api.upload_file = MagicMock()
+        biostudies.upload_file = MagicMock()
 
         accession_from_response = biostudies.send_submission(TestBioStudiesService.__create_submission_with_files())
 
@@ -142,6 +142,32 @@ class TestBioStudiesService(unittest.TestCase):
             self.assertIn(expected_element, links_section)
         self.assertCountEqual(expected_links, links_section)
 
+    def test_when_study_has_all_links_then_submission_is_not_sent_again(self):
+        # Given
+        auth_response = AuthResponse(status=HTTPStatus(200))
+        auth_response.session_id = "test.session.id"
+        self.mock_auth.login = MagicMock(return_value=auth_response)
+        biostudies = BioStudies("url", "username", "password")
+
+        response = ResponseObject()
+        response.json = self.__create_submission()
+        biostudies.get_submission_by_accession = MagicMock(return_value=response)
+        biostudies.api.create_submission = MagicMock()
+
+        submission = Submission()
+        study = submission.map('study', 'test alias', attributes={})
+        study.add_accession('BioStudies', 'S-BSST1')
+        self.__link_entity_accessions(submission, study)
+
+        # When
+        first_update = biostudies.update_links(submission, study)
+        second_update = biostudies.update_links(submission, study)
+
+        # Then
+        self.assertTrue(first_update)
+        self.assertFalse(second_update)
+        biostudies.api.create_submission.assert_called_once()
+
     @staticmethod
     def __create_submission():
         return {
@@ -0,0 +1,43 @@
+import tempfile
+import unittest
+from http import HTTPStatus
+from os.path import join
+from unittest.mock import patch
+
+from services.ena import Ena, EnaAction
+from services.multipart import MultipartStream
+
+
+class TestEnaService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = join(self.temp_dir.name, '1_SAMPLE.xml')
+        with open(self.file_path, 'w') as open_file:
+            open_file.write('<SAMPLE_SET><SAMPLE alias="sample_0" /></SAMPLE_SET>')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    @patch('services.transport.TransportSession.post')
+    def test_files_are_streamed_from_disk(self, mock_post):
+        # Given
+        bodies = []
+        mock_post.side_effect = lambda url, auth, data, headers: bodies.append((headers, data.read())) or mock_post.return_value
+        mock_post.return_value.status_code = HTTPStatus(200)
+        mock_post.return_value.content = b'<RECEIPT success="true" />'
+
+        # When
+        response = Ena('user', 'password').submit_files({'SAMPLE': ('SAMPLE.xml', self.file_path)}, EnaAction.ADD)
+
+        # Then
+        self.assertEqual(b'<RECEIPT success="true" />', response)
+        data = mock_post.call_args.kwargs['data']
+        self.assertIsInstance(data, MultipartStream)
+        headers, body = bodies[0]
+        self.assertEqual(data.content_type, headers['Content-Type'])
+        self.assertIn(b'name="ACTION"\r\n\r\nADD\r\n', body)
+        self.assertIn(b'name="SAMPLE"; filename="SAMPLE.xml"\r\n\r\n<SAMPLE_SET><SAMPLE alias="sample_0" /></SAMPLE_SET>\r\n', body)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import tempfile
+import unittest
+from email.parser import BytesParser
+from os.path import exists, join
+from unittest.mock import MagicMock
+
+from services.file_upload import UploadError, UploadManager, UploadState
+from services.multipart import MultipartStream
+
+
+class TestMultipartStream(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = join(self.temp_dir.name, 'reads.fastq')
+        with open(self.file_path, 'wb') as open_file:
+            open_file.write(b'@read\nACGT\n+\nFFFF\n' * 1000)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def read_body(self, body: MultipartStream, size: int) -> bytes:
+        chunks = []
+        while True:
+            chunk = body.read(size)
+            if not chunk:
+                break
+            self.assertLessEqual(len(chunk), size)
+            chunks.append(chunk)
+        return b''.join(chunks)
+
+    def assert_body(self, body: MultipartStream, data: bytes):
+        message = BytesParser().parsebytes(b'Content-Type: ' + body.content_type.encode() + b'\r\n\r\n' + data)
+        parts = message.get_payload()
+        self.assertEqual('ADD', parts[0].get_payload())
+        self.assertEqual('reads.fastq', parts[1].get_filename())
+        with open(self.file_path, 'rb') as open_file:
+            self.assertEqual(open_file.read(), parts[1].get_payload(decode=True))
+
+
+    def test_body_is_read_in_small_chunks(self):
+        # Given
+        body = MultipartStream({'ACTION': 'ADD'}, [('files', 'reads.fastq', self.file_path)], chunk_size=100)
+
+        # When
+        data = self.read_body(body, 8192)
+
+        # Then
+        self.assertEqual(len(body), len(data))
+        self.assert_body(body, data)
+
+    def test_reads_smaller_than_a_chunk(self):
+        body = MultipartStream({'ACTION': 'ADD'}, [('files', 'reads.fastq', self.file_path)], chunk_size=8192)
+
+        data = self.read_body(body, 100)
+
+        self.assertEqual(len(body), len(data))
+        self.assert_body(body, data)
+
+    def test_whole_body_is_read_at_once(self):
+        body = MultipartStream({'ACTION': 'ADD'}, [('files', 'reads.fastq', self.file_path)], chunk_size=100)
+
+        data = body.read()
+
+        self.assertEqual(len(body), len(data))
+        self.assertEqual(b'', body.read())
+        self.assert_body(body, data)
+
+
+class TestUploadManager(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.state_path = join(self.temp_dir.name, 'submission.uploads.json')
+        self.file_paths = []
+        for number in range(3):
+            file_path = join(self.temp_dir.name, f'file_{number}.txt')
+            with open(file_path, 'w') as open_file:
+                open_file.write(f'file {number}')
+            self.file_paths.append(file_path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def upload_files(self, upload, state: UploadState, attempts: int = 3):
+        with UploadManager(upload, workers=2, state=state, attempts=attempts, backoff=0) as uploads:
+            for file_path in self.file_paths:
+                uploads.submit(file_path)
+            uploads.wait()
+        return uploads
+
+    def test_failed_uploads_are_retried(self):
+        upload = MagicMock(side_effect=[ConnectionError('reset'), None, None, None])
+
+        uploads = self.upload_files(upload, UploadState())
+
+        self.assertEqual(4, upload.call_count)
+        self.assertEqual(3, uploads.uploaded)
+
+    def test_interrupted_uploads_are_resumed(self):
+        # Given
+        def fail_last_file(file_path: str):
+            if file_path == self.file_paths[-1]:
+                raise ConnectionError('reset')
+
+        first_state = UploadState(self.state_path)
+        first_state.folder = 'upload-folder'
+        with self.assertRaises(UploadError):
+            self.upload_files(fail_last_file, first_state, attempts=1)
+
+        # When
+        upload = MagicMock()
+        state = UploadState(self.state_path)
+        uploads = self.upload_files(upload, state)
+
+        # Then
+        upload.assert_called_once_with(self.file_paths[-1])
+        self.assertEqual(2, uploads.skipped)
+        self.assertEqual('upload-folder', state.folder)
+        state.forget(self.file_paths)
+        self.assertFalse(exists(self.state_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
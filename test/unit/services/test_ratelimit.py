@@ -0,0 +1,115 @@
+import threading
+import time
+import unittest
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import requests
+
+from services.ratelimit import AdaptiveLimiter
+from services.transport import TransportMetrics, create_session
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    # Answers the first request with 429 and a Retry-After of 0 seconds
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.server.requests += 1
+        content = b'{}'
+        if self.server.requests == 1:
+            self.send_response(HTTPStatus.TOO_MANY_REQUESTS)
+            self.send_header('Retry-After', '0')
+        else:
+            self.send_response(HTTPStatus.CREATED)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def throttled_error(retry_after: str = None) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = HTTPStatus.TOO_MANY_REQUESTS
+    if retry_after:
+        response.headers['Retry-After'] = retry_after
+    return requests.HTTPError(response=response)
+
+
+class TestAdaptiveLimiter(unittest.TestCase):
+    def test_limit_increases_by_about_one_for_each_window(self):
+        limiter = AdaptiveLimiter('Test', initial_limit=4)
+
+        for _ in range(5):
+            limiter.release(limiter.acquire())
+
+        self.assertEqual(5, int(limiter.limit))
+
+    def test_requests_in_flight_only_halve_the_limit_once(self):
+        # Given
+        limiter = AdaptiveLimiter('Test', initial_limit=8)
+        tickets = [limiter.acquire() for _ in range(8)]
+
+        # When
+        for ticket in tickets:
+            limiter.release(ticket, throttled=True)
+
+        # Then
+        self.assertEqual(4, limiter.limit)
+        self.assertEqual(8, limiter.throttled)
+        limiter.release(limiter.acquire(), throttled=True)
+        self.assertEqual(2, limiter.limit)
+
+    def test_requests_wait_for_the_limit(self):
+        limiter = AdaptiveLimiter('Test', initial_limit=1)
+        ticket = limiter.acquire()
+        acquired = threading.Event()
+        threading.Thread(target=lambda: acquired.set() if limiter.acquire() else None, daemon=True).start()
+
+        self.assertFalse(acquired.wait(0.05))
+        limiter.release(ticket)
+        self.assertTrue(acquired.wait(1))
+
+    def test_retry_after_pauses_every_request(self):
+        limiter = AdaptiveLimiter('Test')
+        limiter.release(limiter.acquire(), throttled=True, retry_after=0.2)
+
+        start = time.monotonic()
+        limiter.acquire()
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+
+    def test_client_errors_for_too_many_requests_are_sent_again(self):
+        limiter = AdaptiveLimiter('Test')
+        send = MagicMock(side_effect=[throttled_error('0'), {'accession': 'SAMEA1'}])
+
+        self.assertDictEqual({'accession': 'SAMEA1'}, limiter.call(send))
+        self.assertEqual(2, send.call_count)
+        self.assertEqual(1, limiter.throttled)
+
+    def test_session_sends_throttled_submissions_again(self):
+        # Given
+        server = ThreadingHTTPServer(('127.0.0.1', 0), ThrottlingHandler)
+        server.requests = 0
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        limiter = AdaptiveLimiter('Test')
+        session = create_session('Test', metrics=TransportMetrics(), limiter=limiter)
+
+        # When
+        response = session.post(f'http://127.0.0.1:{server.server_address[1]}/samples', json={'name': 'sample'})
+
+        # Then
+        server.shutdown()
+        server.server_close()
+        self.assertEqual(HTTPStatus.CREATED, response.status_code)
+        self.assertEqual(2, server.requests)
+        self.assertEqual(1, limiter.throttled)
+        self.assertEqual(0, limiter.in_flight)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import tempfile
+import time
+import unittest
+from http import HTTPStatus
+from os.path import join
+from unittest.mock import patch
+
+from services.ena_taxonomy import EnaTaxonomy
+from services.taxonomy_cache import TaxonomyCache
+
+SARS_COV_2 = {'taxId': '2697049', 'scientificName': 'Severe acute respiratory syndrome coronavirus 2', 'submittable': 'true'}
+
+
+class TestTaxonomyCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = join(self.temp_dir.name, 'taxonomy.sqlite')
+        self.cache = TaxonomyCache(self.cache_path)
+        self.ena_taxonomy = EnaTaxonomy(ena_url='', cache=self.cache)
+
+    def tearDown(self):
+        self.cache.close()
+        self.temp_dir.cleanup()
+
+    @patch('services.transport.TransportSession.get')
+    def test_taxonomy_is_only_requested_once(self, mock_get):
+        # Given
+        mock_get.return_value.status_code = HTTPStatus(200)
+        mock_get.return_value.text = ''
+        mock_get.return_value.json.return_value = [SARS_COV_2]
+
+        # When
+        for _ in range(3):
+            result = self.ena_taxonomy.validate_taxonomy(SARS_COV_2['scientificName'], SARS_COV_2['taxId'])
+
+        # Then
+        self.assertNotIn('error', result)
+        self.assertEqual(2, mock_get.call_count)
+        self.assertEqual(4, self.cache.hits)
+
+    @patch('services.transport.TransportSession.get')
+    def test_answers_are_kept_between_runs(self, mock_get):
+        mock_get.return_value.status_code = HTTPStatus(200)
+        mock_get.return_value.text = 'No results.'
+        first_result = self.ena_taxonomy.validate_tax_id('999999999999')
+        self.cache.close()
+
+        self.cache = TaxonomyCache(self.cache_path)
+        second_result = EnaTaxonomy(ena_url='', cache=self.cache).validate_tax_id('999999999999')
+
+        self.assertEqual(1, mock_get.call_count)
+        self.assertDictEqual(first_result, second_result)
+
+    @patch('services.transport.TransportSession.get')
+    def test_errors_expire_with_their_own_ttl(self, mock_get):
+        self.cache.close()
+        self.cache = TaxonomyCache(self.cache_path, error_ttl=0)
+        self.ena_taxonomy = EnaTaxonomy(ena_url='', cache=self.cache)
+        mock_get.return_value.status_code = HTTPStatus(400)
+        mock_get.return_value.text = 'Taxon Id must be numeric.'
+
+        self.ena_taxonomy.validate_tax_id('NOT_NUMERIC_TAX_ID')
+        time.sleep(0.01)
+        self.ena_taxonomy.validate_tax_id('NOT_NUMERIC_TAX_ID')
+
+        self.assertEqual(2, mock_get.call_count)
+
+    @patch('services.transport.TransportSession.get')
+    def test_server_errors_are_not_cached(self, mock_get):
+        mock_get.return_value.status_code = HTTPStatus(503)
+        mock_get.return_value.text = 'Service Unavailable'
+
+        self.ena_taxonomy.validate_tax_id('2697049')
+        self.ena_taxonomy.validate_tax_id('2697049')
+
+        self.assertEqual(2, mock_get.call_count)
+
+    @patch('services.transport.TransportSession.get')
+    def test_throttled_requests_are_not_cached(self, mock_get):
+        for status in (HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.REQUEST_TIMEOUT):
+            mock_get.return_value.status_code = status
+            mock_get.return_value.text = 'Too Many Requests'
+
+            self.ena_taxonomy.validate_tax_id('2697049')
+
+        mock_get.return_value.status_code = HTTPStatus(200)
+        mock_get.return_value.text = ''
+        mock_get.return_value.json.return_value = [SARS_COV_2]
+        result = self.ena_taxonomy.validate_tax_id('2697049')
+
+        self.assertNotIn('error', result)
+        self.assertEqual(3, mock_get.call_count)
+
+    def test_least_recently_used_answers_leave_memory_but_not_the_file(self):
+        cache = TaxonomyCache(self.cache_path, memory_entries=1)
+        cache.put('first', SARS_COV_2)
+        cache.put('second', {'error': 'Not valid tax_id: second.'}, error=True)
+
+        # First was forgotten in memory, so it is read back from the file
+        self.assertDictEqual(SARS_COV_2, cache.get('first'))
+        self.assertEqual(1, cache.hits)
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import tempfile
+import unittest
+from os.path import join
+
+from services.ena_taxonomy import EnaTaxonomy
+from services.taxonomy_index import TaxonomyIndex, build_index
+from submission.submission import Submission
+from validation.taxonomy import TaxonomyValidator
+
+NODES = [
+    # tax_id, parent, rank, embl code, division, inherited division, genetic code, inherited, mitochondrial genetic code
+    ['1', '1', 'no rank', '', '8', '0', '1', '0', '0'],
+    ['10239', '1', 'superkingdom', '', '9', '0', '1', '0', '0'],
+    ['694009', '10239', 'species', '', '9', '1', '1', '1', '0'],
+    ['2697049', '694009', 'no rank', '', '9', '1', '1', '1', '0'],
+    ['9605', '1', 'genus', '', '5', '0', '1', '0', '2'],
+    ['9606', '9605', 'species', 'HS', '5', '1', '1', '1', '2']
+]
+NAMES = [
+    ['1', 'root', '', 'scientific name'],
+    ['10239', 'Viruses', '', 'scientific name'],
+    ['694009', 'Severe acute respiratory syndrome-related coronavirus', '', 'scientific name'],
+    ['2697049', 'Severe acute respiratory syndrome coronavirus 2', '', 'scientific name'],
+    ['2697049', 'SARS-CoV-2', '', 'equivalent name'],
+    ['9605', 'Homo', '', 'scientific name'],
+    ['9606', 'Homo sapiens', '', 'scientific name'],
+    ['9606', 'man', '', 'common name'],
+    ['9606', 'human', '', 'genbank common name']
+]
+DIVISIONS = [
+    ['5', 'PRI', 'Primates', ''],
+    ['8', 'UNA', 'Unassigned', ''],
+    ['9', 'VRL', 'Viruses', '']
+]
+
+
+def write_dump(file_path: str, rows):
+    with open(file_path, 'w') as dump_file:
+        for fields in rows:
+            dump_file.write('\t|\t'.join(fields) + '\t|\n')
+
+
+class TestTaxonomyIndex(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        write_dump(join(self.temp_dir.name, 'nodes.dmp'), NODES)
+        write_dump(join(self.temp_dir.name, 'names.dmp'), NAMES)
+        write_dump(join(self.temp_dir.name, 'division.dmp'), DIVISIONS)
+        index_path = join(self.temp_dir.name, 'taxonomy.sqlite')
+        build_index(self.temp_dir.name, index_path)
+        self.index = TaxonomyIndex(index_path)
+        self.ena_taxonomy = EnaTaxonomy(index=self.index)
+
+    def tearDown(self):
+        self.index.close()
+        self.temp_dir.cleanup()
+
+    def test_tax_id_is_answered_like_ena(self):
+        self.assertDictEqual({
+            'taxId': '9606',
+            'scientificName': 'Homo sapiens',
+            'commonName': 'human',
+            'rank': 'species',
+            'division': 'PRI',
+            'geneticCode': '1',
+            'mitochondrialGeneticCode': '2',
+            'submittable': 'true'
+        }, self.ena_taxonomy.validate_tax_id('9606'))
+
+    def test_scientific_name_is_matched_without_case(self):
+        response = self.ena_taxonomy.validate_scientific_name('severe acute respiratory syndrome coronavirus 2')
+
+        self.assertEqual('2697049', response['taxId'])
+        self.assertEqual('VRL', response['division'])
+
+    def test_taxa_above_species_are_not_submittable(self):
+        self.assertDictEqual(
+            {'error': 'Not valid tax_id: 9605. It is not submittable.'},
+            self.ena_taxonomy.validate_tax_id('9605')
+        )
+
+    def test_unknown_taxonomy_returns_errors(self):
+        self.assertDictEqual({'error': 'Not valid tax_id: 999999999999.'}, self.ena_taxonomy.validate_tax_id('999999999999'))
+        self.assertDictEqual({'error': 'Not valid tax_id: NOT_NUMERIC. Taxon Id must be numeric.'}, self.ena_taxonomy.validate_tax_id('NOT_NUMERIC'))
+        self.assertDictEqual({'error': 'Not valid scientific_name: SARS-CoV-2.'}, self.ena_taxonomy.validate_scientific_name('SARS-CoV-2'))
+
+    def test_validator_checks_consistency_from_index(self):
+        # Given
+        submission = Submission()
+        submission.map('sample', 'consistent', {'tax_id': '2697049', 'scientific_name': 'Severe acute respiratory syndrome coronavirus 2'})
+        submission.map('sample', 'inconsistent', {'tax_id': '9606', 'scientific_name': 'Severe acute respiratory syndrome coronavirus 2'})
+
+        # When
+        TaxonomyValidator(taxonomy_index=self.index).validate_data(submission)
+
+        # Then
+        self.assertListEqual(['inconsistent'], list(submission.get_errors('sample')))
+
+
+if __name__ == '__main__':
+    unittest.main()
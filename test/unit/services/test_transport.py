@@ -0,0 +1,86 @@
+import threading
+import unittest
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from services.transport import SETTINGS, TransportMetrics, create_session, get_percentile
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    # Answers each path with 503 until it has been asked for it "failures" times
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.answer()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.answer()
+
+    def answer(self):
+        with self.server.lock:
+            self.server.requests += 1
+            requests = self.server.requests
+        status = HTTPStatus.SERVICE_UNAVAILABLE if requests <= self.server.failures else HTTPStatus.OK
+        content = b'{"answer": 42}'
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestTransport(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = 0
+        self.server.failures = 2
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.settings = dict(SETTINGS)
+        SETTINGS['backoff'] = 0
+        self.metrics = TransportMetrics()
+
+    def tearDown(self):
+        SETTINGS.update(self.settings)
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_server_errors_are_retried(self):
+        session = create_session('Test', metrics=self.metrics)
+
+        response = session.get(f'{self.url}/taxon/2697049', endpoint='taxon')
+
+        self.assertEqual(HTTPStatus.OK, response.status_code)
+        self.assertEqual(3, self.server.requests)
+        metrics = self.metrics.get_metrics()['Test GET taxon']
+        self.assertEqual(1, metrics['requests'])
+        self.assertEqual(14, metrics['received'])
+
+    def test_submissions_are_not_sent_twice(self):
+        session = create_session('Test', metrics=self.metrics)
+
+        response = session.post(f'{self.url}/samples', json={'name': 'sample'})
+
+        self.assertEqual(HTTPStatus.SERVICE_UNAVAILABLE, response.status_code)
+        self.assertEqual(1, self.server.requests)
+        metrics = self.metrics.get_metrics()['Test POST /samples']
+        self.assertEqual(1, metrics['errors'])
+        self.assertEqual(len(b'{"name": "sample"}'), metrics['sent'])
+
+    def test_report_has_latency_percentiles(self):
+        for seconds in range(1, 101):
+            self.metrics.record('Test GET taxon', seconds / 1000)
+
+        self.assertEqual(0.095, get_percentile(sorted(self.metrics.get_metrics()['Test GET taxon']['latencies']), 95))
+        self.assertListEqual(
+            ['Test GET taxon: 100 request(s), 0 error(s), 0B sent, 0B received, p50 50ms p95 95ms p99 99ms'],
+            self.metrics.report()
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
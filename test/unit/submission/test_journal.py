@@ -0,0 +1,88 @@
+import tempfile
+import unittest
+from os.path import exists, join
+
+from submission.journal import SubmissionJournal, get_journal_path
+from submission.submission import Submission
+
+
+class TestSubmissionJournal(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.journal_path = get_journal_path(join(self.temp_dir.name, 'submission.xlsx'))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    @staticmethod
+    def make_submission() -> Submission:
+        submission = Submission()
+        for number in range(3):
+            submission.map('sample', f'sample_{number}', {'sample_title': f'title {number}'})
+        submission.map('study', 'study_1', {'study_title': 'title'})
+        return submission
+
+    def test_accessions_are_replayed_after_an_interrupted_run(self):
+        # Given
+        first_run = self.make_submission()
+        journal = SubmissionJournal(self.journal_path)
+        journal.replay(first_run)
+        journal.record(first_run.get_entity('sample', 'sample_0'), 'BioSamples', 'SAMEA1')
+        journal.record(first_run.get_entity('study', 'study_1'), 'BioStudies', 'S-BSST1')
+        # The run is killed while writing the next line
+        journal.close()
+        with open(self.journal_path, 'a') as journal_file:
+            journal_file.write('{"entity_type": "sample", "ind')
+
+        # When
+        second_run = self.make_submission()
+        journal = SubmissionJournal(self.journal_path)
+        replayed = journal.replay(second_run)
+
+        # Then
+        self.assertEqual(2, replayed)
+        self.assertEqual('SAMEA1', second_run.get_entity('sample', 'sample_0').get_accession('BioSamples'))
+        self.assertEqual('S-BSST1', second_run.get_entity('study', 'study_1').get_accession('BioStudies'))
+        self.assertTrue(journal.is_recorded(second_run.get_entity('sample', 'sample_0'), 'BioSamples'))
+        self.assertFalse(journal.is_recorded(second_run.get_entity('sample', 'sample_1'), 'BioSamples'))
+        self.assertFalse(journal.is_recorded(second_run.get_entity('sample', 'sample_0'), 'BioStudies'))
+        journal.close()
+
+    def test_records_after_a_torn_line_are_replayed_after_every_restart(self):
+        # Given
+        journal = SubmissionJournal(self.journal_path)
+        journal.record(self.make_submission().get_entity('sample', 'sample_0'), 'BioSamples', 'SAMEA1')
+        journal.close()
+        with open(self.journal_path, 'a') as journal_file:
+            journal_file.write('{"entity_type": "sample", "ind')
+
+        # When
+        first_restart = self.make_submission()
+        journal = SubmissionJournal(self.journal_path)
+        journal.replay(first_restart)
+        journal.record(first_restart.get_entity('sample', 'sample_1'), 'BioSamples', 'SAMEA2')
+        journal.close()
+        second_restart = self.make_submission()
+        journal = SubmissionJournal(self.journal_path)
+        replayed = journal.replay(second_restart)
+
+        # Then
+        self.assertEqual(2, replayed)
+        self.assertEqual('SAMEA2', second_restart.get_entity('sample', 'sample_1').get_accession('BioSamples'))
+        self.assertTrue(journal.is_recorded(second_restart.get_entity('sample', 'sample_1'), 'BioSamples'))
+        journal.close()
+
+    def test_completed_journal_is_removed(self):
+        journal = SubmissionJournal(self.journal_path)
+        journal.record(self.make_submission().get_entity('sample', 'sample_0'), 'BioSamples', 'SAMEA1')
+
+        journal.complete()
+
+        self.assertFalse(exists(self.journal_path))
+
+    def test_journal_is_next_to_the_excel_file(self):
+        self.assertEqual(join('data', 'submission.journal.ndjson'), get_journal_path(join('data', 'submission.xlsx')))
+
+
+if __name__ == '__main__':
+    unittest.main()
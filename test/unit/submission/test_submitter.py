@@ -0,0 +1,81 @@
+import threading
+import time
+import unittest
+
+from submission.entity import Entity
+from submission.submission import Submission
+from submission.submitter import submit_batches, submit_entities
+
+
+class TestSubmitter(unittest.TestCase):
+    def setUp(self):
+        self.submission = Submission()
+        for number in range(8):
+            self.submission.map('sample', f'sample_{number}', {'sample_title': f'title {number}'})
+        self.samples = list(self.submission.get_entities('sample'))
+
+    def test_entities_are_submitted_concurrently(self):
+        # Given
+        lock = threading.Lock()
+        in_flight = []
+        active = [0]
+
+        def submit(sample: Entity):
+            with lock:
+                active[0] += 1
+                in_flight.append(active[0])
+            time.sleep(0.05)
+            sample.add_accession('BioSamples', f'SAMEA{sample.identifier.index[-1]}')
+            with lock:
+                active[0] -= 1
+
+        # When
+        report = submit_entities(self.samples, submit, 4, 'BioSamples', 'sample_accession')
+
+        # Then
+        self.assertEqual(4, max(in_flight))
+        self.assertEqual(8, report['submitted'])
+        self.assertEqual(0, report['errors'])
+        self.assertEqual('SAMEA3', self.submission.get_entity('sample', 'sample_3').get_accession('BioSamples'))
+
+    def test_errors_are_added_to_the_entity_that_failed(self):
+        def submit(sample: Entity):
+            if sample.identifier.index == 'sample_5':
+                raise ValueError('Bad Request')
+            sample.add_accession('BioSamples', 'SAMEA1')
+
+        report = submit_entities(self.samples, submit, 3, 'BioSamples', 'sample_accession')
+
+        self.assertEqual(7, report['submitted'])
+        self.assertEqual(1, report['errors'])
+        self.assertDictEqual(
+            {'sample_5': {'sample_accession': ['BioSamples Error: Bad Request']}},
+            self.submission.get_errors('sample')
+        )
+
+    def test_batches_report_errors_for_each_entity(self):
+        # Given
+        batches = []
+
+        def submit_batch(samples):
+            batches.append(len(samples))
+            if samples[0].identifier.index == 'sample_6':
+                raise ConnectionError('Connection reset')
+            return ['Not valid' if sample.identifier.index == 'sample_1' else None for sample in samples]
+
+        # When
+        report = submit_batches(self.samples, submit_batch, 3, 2, 'BioSamples', 'sample_accession')
+
+        # Then
+        self.assertListEqual([3, 3, 2], sorted(batches, reverse=True))
+        self.assertEqual(5, report['submitted'])
+        self.assertEqual(3, report['requests'])
+        self.assertDictEqual({
+            'sample_1': {'sample_accession': ['BioSamples Error: Not valid']},
+            'sample_6': {'sample_accession': ['BioSamples Error: Connection reset']},
+            'sample_7': {'sample_accession': ['BioSamples Error: Connection reset']}
+        }, self.submission.get_errors('sample'))
+
+
+if __name__ == '__main__':
+    unittest.main()
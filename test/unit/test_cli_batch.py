@@ -0,0 +1,150 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import MagicMock, patch
+
+from openpyxl import Workbook
+
+import cli
+from cli import close_batch_worker, find_excel_files, init_batch_worker, print_batch_summary, process_batch, \
+    process_batch_file
+
+BATCH_ARGS = {'no_cache': True, 'excel_reader': 'openpyxl', 'webin_manifests': False, 'secure_key': None}
+HTTP_OPTIONS = {'retries': 5, 'backoff': 2.0, 'read_timeout': 30}
+
+
+def make_summary(file_path: str, status: str = 'OK', entities: int = 2, issues: dict = None) -> dict:
+    return {
+        'file': file_path, 'entities': entities, 'issues': issues or {}, 'status': status, 'seconds': 1.0,
+        'cache_hits': 0, 'cache_misses': 0
+    }
+
+
+class TestFindExcelFiles(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        for file_name in ('b.xlsx', 'a.xlsx', '~$a.xlsx', 'notes.txt'):
+            open(os.path.join(self.temp_dir.name, file_name), 'w').close()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def path(self, file_name: str) -> str:
+        return os.path.join(self.temp_dir.name, file_name)
+
+    def test_directories_are_searched_for_workbooks(self):
+        file_paths = find_excel_files([self.temp_dir.name])
+
+        self.assertListEqual([self.path('a.xlsx'), self.path('b.xlsx')], file_paths)
+
+    def test_patterns_are_expanded(self):
+        file_paths = find_excel_files([self.path('*.xlsx')])
+
+        self.assertListEqual([self.path('a.xlsx'), self.path('b.xlsx')], file_paths)
+
+    def test_files_are_kept_as_given(self):
+        file_paths = find_excel_files([self.path('b.xlsx'), self.path('missing.xlsx')])
+
+        self.assertListEqual([self.path('b.xlsx'), self.path('missing.xlsx')], file_paths)
+
+
+class TestBatchSummary(unittest.TestCase):
+    def test_summary_table(self):
+        summaries = [
+            make_summary('first.xlsx'),
+            make_summary('second.xlsx', 'Issues', 3, {'sample': 2})
+        ]
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            print_batch_summary(summaries)
+
+        lines = output.getvalue().splitlines()
+        self.assertEqual(3, len(lines))
+        self.assertListEqual(['File', 'Entities', 'Seconds', 'Status'], lines[0].split())
+        self.assertListEqual(['first.xlsx', '2', '1.0', 'OK'], lines[1].split())
+        self.assertTrue(lines[2].endswith('Issues: 2 sample(s)'))
+
+    @patch('cli.run_batch')
+    def test_exit_code_when_a_file_errors(self, mock_run_batch):
+        mock_run_batch.return_value = [make_summary('first.xlsx'), make_summary('second.xlsx', 'Error: corrupt file')]
+
+        with redirect_stdout(io.StringIO()):
+            exit_code = process_batch(['first.xlsx', 'second.xlsx'], [], BATCH_ARGS)
+
+        self.assertEqual(2, exit_code)
+
+    @patch('cli.run_batch')
+    def test_exit_code_when_files_have_issues(self, mock_run_batch):
+        mock_run_batch.return_value = [make_summary('first.xlsx', 'Issues', issues={'sample': 1})]
+
+        with redirect_stdout(io.StringIO()):
+            exit_code = process_batch(['first.xlsx'], [], BATCH_ARGS)
+
+        self.assertEqual(0, exit_code)
+
+
+class TestBatchWorker(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.excel_path = os.path.join(self.temp_dir.name, 'test.xlsx')
+        workbook = Workbook()
+        worksheet = workbook.active
+        worksheet['B1'] = 'Study'
+        worksheet['B2'] = 'study_alias'
+        worksheet['C1'] = 'Sample'
+        worksheet['C2'] = 'sample_alias'
+        worksheet['A5'] = '#Units'
+        worksheet.append([None, 'STUD1', 'SAME1'])
+        worksheet.append([None, 'STUD1', 'SAME2'])
+        workbook.save(self.excel_path)
+
+    def tearDown(self):
+        cli.batch_validators.clear()
+        self.temp_dir.cleanup()
+
+    @patch('cli.CovidExcelUtils.validate')
+    def test_entities_are_counted_when_validation_fails(self, mock_validate):
+        # Given
+        cli.batch_validators.update({'cache': None, 'json': None, 'taxonomy': MagicMock()})
+        mock_validate.side_effect = ConnectionError('reset')
+
+        # When
+        summary = process_batch_file(self.excel_path, [], BATCH_ARGS)
+
+        # Then
+        self.assertEqual('Error: reset', summary['status'])
+        self.assertEqual(3, summary['entities'])
+
+    @patch('cli.log_limiters')
+    @patch('cli.HTTP_METRICS')
+    @patch('cli.Finalize')
+    @patch('cli.TaxonomyCache')
+    @patch('cli.ResultCache')
+    def test_worker_closes_caches_and_reports_on_exit(self, mock_result_cache, mock_taxonomy_cache, mock_finalize,
+                                                      mock_metrics, mock_log_limiters):
+        # Given
+        init_batch_worker('local', None, {}, False, {'cache_path': ':memory:'}, None, 'INFO', HTTP_OPTIONS)
+        mock_finalize.assert_called_once_with(None, close_batch_worker, exitpriority=10)
+
+        # When
+        close_batch_worker()
+
+        # Then
+        mock_result_cache.return_value.close.assert_called_once()
+        mock_taxonomy_cache.return_value.close.assert_called_once()
+        mock_metrics.log_report.assert_called_once()
+        mock_log_limiters.assert_called_once()
+
+    @patch('cli.Finalize', MagicMock())
+    @patch('cli.configure_http')
+    def test_worker_uses_the_http_settings_of_the_run(self, mock_configure_http):
+        init_batch_worker('local', None, {}, True, None, None, 'INFO', HTTP_OPTIONS)
+
+        mock_configure_http.assert_called_once_with(retries=5, backoff=2.0, read_timeout=30)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from http import HTTPStatus
+from http.client import HTTPConnection
+from unittest.mock import MagicMock
+
+from openpyxl import Workbook
+
+from serve import ValidationService, make_server
+
+
+class TestValidationServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.service = ValidationService(json_validator='local')
+        # Taxonomy is looked up on the ENA Taxonomy service, which is not part of these tests
+        cls.service.taxonomy_validator = MagicMock()
+        cls.server = make_server(cls.service, '127.0.0.1', 0, max_upload_bytes=1024 * 1024)
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.server_thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.service.close()
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        excel_path = os.path.join(self.temp_dir.name, 'test.xlsx')
+        workbook = Workbook()
+        worksheet = workbook.active
+        worksheet['B1'] = 'Study'
+        worksheet['B2'] = 'study_alias'
+        worksheet['C2'] = 'email_address'
+        worksheet['A5'] = '#Units'
+        worksheet.append([None, 'STUD1', 'not an email address'])
+        workbook.save(excel_path)
+        with open(excel_path, 'rb') as excel_file:
+            self.excel_bytes = excel_file.read()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def request(self, method: str, path: str, body: bytes = None, headers: dict = None):
+        connection = HTTPConnection('127.0.0.1', self.server.server_address[1], timeout=60)
+        try:
+            connection.request(method, path, body, headers or {})
+            response = connection.getresponse()
+            return response.status, json.loads(response.read())
+        finally:
+            connection.close()
+
+    def post_headers_only(self, path: str, headers: dict):
+        # The server answers before reading any body, so only the headers are sent
+        connection = HTTPConnection('127.0.0.1', self.server.server_address[1], timeout=60)
+        try:
+            connection.putrequest('POST', path)
+            for header, value in headers.items():
+                connection.putheader(header, value)
+            connection.endheaders()
+            response = connection.getresponse()
+            return response.status, json.loads(response.read())
+        finally:
+            connection.close()
+
+    def test_health(self):
+        status, body = self.request('GET', '/health')
+
+        self.assertEqual(HTTPStatus.OK, status)
+        self.assertDictEqual({'status': 'OK'}, body)
+
+    def test_validate_returns_json(self):
+        status, body = self.request('POST', '/validate', self.excel_bytes)
+
+        self.assertEqual(HTTPStatus.OK, status)
+        self.assertEqual('STUD1', body['study']['STUD1']['attributes']['study_alias'])
+        self.assertIn('errors', body['study']['STUD1'])
+
+    def test_validate_returns_issues(self):
+        status, body = self.request('POST', '/validate?output=issues', self.excel_bytes)
+
+        self.assertEqual(HTTPStatus.OK, status)
+        self.assertListEqual(['rows:[6]'], list(body['study']))
+        self.assertIn('center_name', body['study']['rows:[6]'])
+
+    def test_unknown_path_is_not_found(self):
+        get_status, _ = self.request('GET', '/unknown')
+        post_status, _ = self.request('POST', '/unknown', self.excel_bytes)
+
+        self.assertEqual(HTTPStatus.NOT_FOUND, get_status)
+        self.assertEqual(HTTPStatus.NOT_FOUND, post_status)
+
+    def test_missing_content_length_is_refused(self):
+        status, body = self.post_headers_only('/validate', {})
+
+        self.assertEqual(HTTPStatus.LENGTH_REQUIRED, status)
+        self.assertIn('error', body)
+
+    def test_oversized_body_is_refused(self):
+        status, body = self.post_headers_only('/validate', {'Content-Length': str(1024 * 1024 + 1)})
+
+        self.assertEqual(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, status)
+        self.assertIn('error', body)
+
+    def test_invalid_output_is_refused(self):
+        status, body = self.request('POST', '/validate?output=xml', self.excel_bytes)
+
+        self.assertEqual(HTTPStatus.BAD_REQUEST, status)
+        self.assertIn('xml', body['error'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import json
+import unittest
+from os.path import dirname, join
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from submission.submission import Submission
+from test.stub_validator import stub_validator
+from validation.json import JsonValidator
+
+
+class TestBatchValidation(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        with open(join(dirname(__file__), '../../resources/data_for_test_issues.json')) as test_data_file:
+            self.test_data = json.load(test_data_file)
+
+    def make_submission(self) -> Submission:
+        # Alternate valid and invalid samples so that errors must reach the right entity
+        submission = Submission()
+        for entity_type, attributes in self.test_data.items():
+            submission.map(entity_type, attributes['index'], dict(attributes))
+        for number in range(7):
+            attributes = dict(self.test_data['sample'])
+            attributes['index'] = f'sample_{number}'
+            # Distinct dates keep the samples from being validated as one
+            attributes['receipt_date'] = f'2020-04-{number + 1:02d}'
+            if number % 2:
+                attributes['host_sex'] = 'female'
+                attributes['geographic_location_country_and_or_sea'] = 'sweden'
+                attributes['collecting_institution'] = 'karolinska'
+            submission.map('sample', attributes['index'], attributes)
+        return submission
+
+    def test_when_validating_in_batches_errors_should_match_single_requests(self):
+        # Given
+        single_submission = self.make_submission()
+        batch_submission = self.make_submission()
+
+        with stub_validator() as server:
+            JsonValidator(server.url).validate_data(single_submission)
+            single_requests = server.requests
+            server.requests = 0
+
+            # When
+            JsonValidator(server.url, batch_size=3).validate_data(batch_submission)
+
+            # Then
+            self.assertEqual(11, single_requests)
+            # one isolate, one study, one run_experiment and three batches of eight samples
+            self.assertEqual(6, server.requests)
+        self.assertTrue(batch_submission.has_errors())
+        self.assertDictEqual(single_submission.get_all_errors(), batch_submission.get_all_errors())
+
+    def test_when_validator_does_not_accept_batches_should_validate_one_entity_per_request(self):
+        # Given
+        single_submission = self.make_submission()
+        batch_submission = self.make_submission()
+
+        with stub_validator(batching=False) as server:
+            JsonValidator(server.url).validate_data(single_submission)
+            validator = JsonValidator(server.url, batch_size=3)
+
+            # When
+            with self.assertLogs(level='WARNING'):
+                validator.validate_data(batch_submission)
+
+        # Then
+        self.assertEqual(1, validator.batch_size)
+        self.assertDictEqual(single_submission.get_all_errors(), batch_submission.get_all_errors())
+
+
+def make_response(status_code: int, body=None) -> MagicMock:
+    response = MagicMock()
+    response.status_code = status_code
+    response.ok = status_code < 400
+    response.json.return_value = body
+    return response
+
+
+@patch('validation.json.time.sleep')
+@patch('services.transport.TransportSession.post')
+class TestBatchFallback(unittest.TestCase):
+    def setUp(self):
+        self.validator = JsonValidator('http://localhost:3020/validate', batch_size=3)
+        self.objects = [{'index': 'sample_1'}, {'index': 'sample_2'}]
+        self.batch_errors = [[], [{'dataPath': '.sample_title', 'errors': ['is required']}]]
+
+    def test_rejected_batch_falls_back_to_single_requests(self, mock_post, mock_sleep):
+        mock_post.side_effect = [make_response(400), make_response(200, []), make_response(200, [])]
+
+        with self.assertLogs(level='WARNING'):
+            errors = self.validator.validate_batch('sample', self.objects)
+
+        self.assertListEqual([[], []], errors)
+        self.assertEqual(1, self.validator.batch_size)
+
+    def test_unexpected_body_falls_back_to_single_requests(self, mock_post, mock_sleep):
+        mock_post.side_effect = [make_response(200, {'errors': []}), make_response(200, []), make_response(200, [])]
+
+        with self.assertLogs(level='WARNING'):
+            errors = self.validator.validate_batch('sample', self.objects)
+
+        self.assertListEqual([[], []], errors)
+        self.assertEqual(1, self.validator.batch_size)
+
+    def test_server_error_is_retried_as_a_batch(self, mock_post, mock_sleep):
+        mock_post.side_effect = [make_response(503), make_response(200, self.batch_errors)]
+
+        errors = self.validator.validate_batch('sample', self.objects)
+
+        self.assertListEqual(self.batch_errors, errors)
+        self.assertEqual(2, mock_post.call_count)
+        self.assertEqual(3, self.validator.batch_size)
+
+    def test_dropped_connection_is_retried_as_a_batch(self, mock_post, mock_sleep):
+        mock_post.side_effect = [requests.ConnectionError('reset'), make_response(200, self.batch_errors)]
+
+        errors = self.validator.validate_batch('sample', self.objects)
+
+        self.assertListEqual(self.batch_errors, errors)
+        self.assertEqual(3, self.validator.batch_size)
+
+    def test_server_errors_are_raised_once_retries_are_exhausted(self, mock_post, mock_sleep):
+        mock_post.return_value = make_response(500)
+
+        with self.assertRaises(requests.HTTPError):
+            self.validator.validate_batch('sample', self.objects)
+
+        self.assertEqual(3, mock_post.call_count)
+        self.assertEqual(3, self.validator.batch_size)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import json
+import unittest
+from os.path import dirname, join
+
+from submission.submission import Submission
+from test.stub_validator import stub_validator
+from validation.json import JsonValidator
+
+
+class TestConcurrentValidation(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        with open(join(dirname(__file__), '../../resources/data_for_test_issues.json')) as test_data_file:
+            self.test_data = json.load(test_data_file)
+
+    def make_submission(self) -> Submission:
+        submission = Submission()
+        for entity_type, attributes in self.test_data.items():
+            submission.map(entity_type, attributes['index'], dict(attributes))
+        for number in range(12):
+            attributes = dict(self.test_data['sample'])
+            attributes['index'] = f'sample_{number}'
+            # Distinct dates keep the samples from being validated as one
+            attributes['receipt_date'] = f'2020-04-{number + 1:02d}'
+            if number % 3:
+                attributes['host_sex'] = 'female'
+            submission.map('sample', attributes['index'], attributes)
+        return submission
+
+    def test_concurrent_validation_should_match_sequential_validation(self):
+        # Given
+        sequential_submission = self.make_submission()
+        concurrent_submission = self.make_submission()
+
+        with stub_validator(latency=0.01) as server:
+            JsonValidator(server.url).validate_data(sequential_submission)
+            server.max_in_flight = 0
+
+            # When
+            JsonValidator(server.url, concurrency=4).validate_data(concurrent_submission)
+
+            # Then
+            self.assertGreater(server.max_in_flight, 1)
+            self.assertLessEqual(server.max_in_flight, 4)
+        # Errors are compared in order, not only by content
+        self.assertEqual(
+            json.dumps(sequential_submission.as_dict()),
+            json.dumps(concurrent_submission.as_dict())
+        )
+
+    def test_concurrent_batches_should_match_sequential_validation(self):
+        sequential_submission = self.make_submission()
+        concurrent_submission = self.make_submission()
+
+        with stub_validator(latency=0.01) as server:
+            JsonValidator(server.url).validate_data(sequential_submission)
+            JsonValidator(server.url, batch_size=5, concurrency=3).validate_data(concurrent_submission)
+
+        self.assertEqual(
+            json.dumps(sequential_submission.as_dict()),
+            json.dumps(concurrent_submission.as_dict())
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+
+import requests
+
+from validation.docker import JsonValidatorDocker, wait_until_ready
+
+
+class TestDockerReadiness(unittest.TestCase):
+    @patch('validation.docker.time.sleep')
+    @patch('validation.docker.requests.post')
+    def test_when_validator_starts_listening_should_stop_polling(self, mock_post, mock_sleep):
+        # Given
+        refused = requests.exceptions.ConnectionError('Connection refused')
+        mock_post.side_effect = [refused, refused, refused, MagicMock()]
+
+        # When
+        wait_until_ready('http://localhost:3020/validate', timeout=60, initial_delay=0.1, max_delay=0.3)
+
+        # Then
+        self.assertEqual(4, mock_post.call_count)
+        delays = [call.args[0] for call in mock_sleep.call_args_list]
+        self.assertEqual([0.1, 0.2, 0.3], [round(delay, 3) for delay in delays])
+
+    @patch('validation.docker.time.sleep')
+    @patch('validation.docker.requests.post')
+    def test_when_validator_never_listens_should_raise_timeout(self, mock_post, mock_sleep):
+        mock_post.side_effect = requests.exceptions.ConnectionError('Connection refused')
+
+        with self.assertRaises(TimeoutError):
+            wait_until_ready('http://localhost:3020/validate', timeout=0)
+
+    @patch('validation.docker.time.sleep')
+    @patch('validation.docker.requests.post')
+    def test_when_container_exits_should_not_wait_for_timeout(self, mock_post, mock_sleep):
+        mock_post.side_effect = requests.exceptions.ConnectionError('Connection refused')
+        container = MagicMock()
+        container.status = 'exited'
+
+        with self.assertRaises(RuntimeError):
+            wait_until_ready('http://localhost:3020/validate', timeout=60, container=container)
+        mock_sleep.assert_not_called()
+
+    @patch('validation.docker.requests.post')
+    def test_when_stopped_should_not_wait_for_timeout(self, mock_post):
+        stop = threading.Event()
+        stop.set()
+
+        with self.assertRaises(RuntimeError):
+            wait_until_ready('http://localhost:3020/validate', timeout=60, stop=stop)
+        mock_post.assert_not_called()
+
+    def test_pool_urls_use_consecutive_ports(self):
+        validator_url = 'http://localhost:3020/validate'
+
+        pool_urls = [JsonValidatorDocker.get_pool_url(validator_url, port) for port in range(3020, 3023)]
+
+        self.assertEqual([
+            'http://localhost:3020/validate',
+            'http://localhost:3021/validate',
+            'http://localhost:3022/validate'
+        ], pool_urls)
+
+
+@patch('validation.docker.docker.from_env', MagicMock())
+@patch.object(JsonValidatorDocker, '_JsonValidatorDocker__launch')
+class TestDockerPool(unittest.TestCase):
+    def test_containers_are_started_before_waiting_for_them_together(self, mock_launch):
+        # Given
+        mock_launch.side_effect = lambda client, image_name, port: MagicMock(name=f'container_{port}')
+        # Each wait only returns once every container is being waited for at the same time
+        waiting = threading.Barrier(3, timeout=5)
+
+        def wait(validator_url, timeout, container, stop):
+            self.assertEqual(3, mock_launch.call_count)
+            waiting.wait()
+
+        # When
+        with patch('validation.docker.wait_until_ready', side_effect=wait) as mock_wait:
+            validator = JsonValidatorDocker('image', 'http://localhost:3020/validate', pool_size=3)
+
+        # Then
+        self.assertEqual(3, mock_wait.call_count)
+        self.assertEqual([
+            'http://localhost:3020/validate',
+            'http://localhost:3021/validate',
+            'http://localhost:3022/validate'
+        ], validator.validator_urls)
+
+    def test_started_containers_are_stopped_when_one_is_not_ready(self, mock_launch):
+        # Given
+        containers = [MagicMock(), MagicMock(), MagicMock()]
+        mock_launch.side_effect = containers
+
+        def wait(validator_url, timeout, container, stop):
+            if container is containers[1]:
+                raise TimeoutError('not ready')
+            # The others wait until they are told to stop
+            if not stop.wait(5):
+                raise AssertionError('Waiting was not stopped')
+            raise RuntimeError('stopped')
+
+        # When
+        with patch('validation.docker.wait_until_ready', side_effect=wait):
+            with self.assertRaises(TimeoutError):
+                JsonValidatorDocker('image', 'http://localhost:3020/validate', pool_size=3)
+
+        # Then
+        for container in containers:
+            container.stop.assert_called_once()
+            container.remove.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
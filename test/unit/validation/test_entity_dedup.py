@@ -0,0 +1,113 @@
+import json
+import unittest
+from os.path import dirname, join
+from unittest.mock import patch
+
+from submission.entity import Entity
+from submission.submission import Submission
+from test.stub_validator import stub_validator
+from validation.base import BaseValidator
+from validation.json import JsonValidator
+
+
+class CountingValidator(BaseValidator):
+    def __init__(self):
+        self.validated = 0
+
+    def validate_entity(self, entity: Entity):
+        self.validated += 1
+        entity.add_error('name', f"{entity.attributes['name']} is not valid")
+
+    def get_fingerprint(self, entity: Entity):
+        return entity.attributes['name']
+
+
+class TestEntityDedup(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        with open(join(dirname(__file__), '../../resources/data_for_test_issues.json')) as test_data_file:
+            self.test_data = json.load(test_data_file)
+
+    def make_submission(self, samples: int) -> Submission:
+        # Samples only differ in their index and alias, which cannot change their errors
+        submission = Submission()
+        for number in range(samples):
+            attributes = dict(self.test_data['sample'])
+            attributes['index'] = f'sample_{number}'
+            attributes['sample_alias'] = f'sample_{number}'
+            submission.map('sample', attributes['index'], attributes)
+        return submission
+
+    def test_entities_with_the_same_fingerprint_are_validated_once(self):
+        # Given
+        submission = Submission()
+        for index, name in enumerate(['a', 'b', 'a', 'a']):
+            submission.map('thing', str(index), {'name': name})
+        validator = CountingValidator()
+
+        # When
+        validator.validate_data(submission)
+
+        # Then
+        self.assertEqual(2, validator.validated)
+        self.assertDictEqual({
+            'thing': {
+                '0': {'name': ['a is not valid']},
+                '1': {'name': ['b is not valid']},
+                '2': {'name': ['a is not valid']},
+                '3': {'name': ['a is not valid']}
+            }
+        }, submission.get_all_errors())
+
+    @patch('services.transport.TransportSession.post')
+    def test_duplicate_samples_are_sent_once_and_share_errors(self, mock_post):
+        # Given
+        mock_post.return_value.json.return_value = [
+            {'dataPath': '.host_sex', 'errors': ['should be equal to one of the allowed values']}
+        ]
+        submission = self.make_submission(5)
+
+        # When
+        JsonValidator('').validate_data(submission)
+
+        # Then
+        self.assertEqual(1, mock_post.call_count)
+        self.assertEqual(5, len(submission.get_all_errors()['sample']))
+        for errors in submission.get_all_errors()['sample'].values():
+            self.assertDictEqual({'host_sex': ['should be equal to one of the allowed values']}, errors)
+
+    def test_duplicate_samples_are_sent_once_when_validating_concurrently(self):
+        single_submission = self.make_submission(6)
+        concurrent_submission = self.make_submission(6)
+
+        with stub_validator() as server:
+            JsonValidator(server.url).validate_data(single_submission)
+            server.objects = 0
+            JsonValidator(server.url, batch_size=3, concurrency=2).validate_data(concurrent_submission)
+
+            self.assertEqual(1, server.objects)
+        self.assertTrue(concurrent_submission.has_errors())
+        self.assertDictEqual(single_submission.get_all_errors(), concurrent_submission.get_all_errors())
+
+    def test_fingerprint_keeps_values_that_can_change_the_errors(self):
+        validator = JsonValidator('')
+        sample = Entity('sample', 'sample_1', dict(self.test_data['sample']))
+        fingerprint = validator.get_fingerprint(sample)
+
+        def changed(attribute: str, value):
+            attributes = dict(self.test_data['sample'])
+            attributes[attribute] = value
+            return validator.get_fingerprint(Entity('sample', 'sample_2', attributes))
+
+        # Formats, combinators and enums are kept apart
+        self.assertNotEqual(fingerprint, changed('collection_date', '2020-13-40'))
+        self.assertNotEqual(fingerprint, changed('receipt_date', '2020-04-27'))
+        self.assertNotEqual(fingerprint, changed('host_sex', 'female'))
+        self.assertNotEqual(fingerprint, changed('sample_title', 42))
+        # Free text and attributes the schema does not declare are not
+        self.assertEqual(fingerprint, changed('sample_title', 'Another title'))
+        self.assertEqual(fingerprint, changed('index', 'sample_2'))
+
+
+if __name__ == '__main__':
+    unittest.main()
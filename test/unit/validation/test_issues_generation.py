@@ -20,7 +20,7 @@ class TestIssuesGeneration(unittest.TestCase):
         for entity_type, attributes in test_data.items():
             self.submission.map(entity_type, attributes["index"], attributes)
 
-    @patch('validation.json.requests.post')
+    @patch('services.transport.TransportSession.post')
     def test_when_validate_invalid_entity_with_valid_schema_should_return_errors(self, mock_post):
         # Given
         mock_post.return_value.json.side_effect = ([
@@ -0,0 +1,59 @@
+import json
+import unittest
+from os.path import dirname, join
+from unittest.mock import patch
+
+from submission.entity import Entity
+from validation.json import JsonValidator
+from validation.local import LocalJsonValidator
+
+
+class TestLocalJsonValidator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.local_validator = LocalJsonValidator()
+
+    def setUp(self):
+        self.maxDiff = None
+        # Responses recorded from the json-schema-validator container
+        with open(join(dirname(__file__), '../../resources/json_validator_responses.json')) as responses_file:
+            self.recorded_responses = json.load(responses_file)
+
+    def test_errors_match_recorded_responses(self):
+        for recorded in self.recorded_responses:
+            with self.subTest(recorded['description']):
+                response = self.local_validator.validate_attributes(recorded['entity_type'], recorded['object'])
+                self.assertDictEqual(self.by_data_path(recorded['response']), self.by_data_path(response))
+
+    @patch('services.transport.TransportSession.post')
+    def test_entity_errors_match_json_validator(self, mock_post):
+        json_validator = JsonValidator('')
+        for recorded in self.recorded_responses:
+            with self.subTest(recorded['description']):
+                # Given
+                mock_post.return_value.json.return_value = recorded['response']
+                json_entity = Entity(recorded['entity_type'], 'index', recorded['object'])
+                local_entity = Entity(recorded['entity_type'], 'index', recorded['object'])
+
+                # When
+                json_validator.validate_entity(json_entity)
+                self.local_validator.validate_entity(local_entity)
+
+                # Then
+                self.assertDictEqual(json_entity.get_errors(), local_entity.get_errors())
+
+    def test_schemas_are_compiled_once(self):
+        self.assertEqual(set(self.local_validator.schema_by_type), set(self.local_validator.validator_by_type))
+
+    def test_data_path_quotes_properties_that_are_not_identifiers(self):
+        data_path = LocalJsonValidator.get_data_path(['geographic_location_(latitude)', 0, 'units'])
+
+        self.assertEqual("['geographic_location_(latitude)'][0].units", data_path)
+
+    @staticmethod
+    def by_data_path(response: list) -> dict:
+        return {schema_error['dataPath']: schema_error['errors'] for schema_error in response}
+
+
+if __name__ == '__main__':
+    unittest.main()
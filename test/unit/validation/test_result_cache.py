@@ -0,0 +1,110 @@
+import json
+import tempfile
+import time
+import unittest
+from os.path import dirname, join
+from unittest.mock import patch, MagicMock
+
+from submission.submission import Submission
+from validation.cache import ResultCache
+from validation.json import JsonValidator
+from validation.taxonomy import TaxonomyValidator
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = join(self.temp_dir.name, 'validation.sqlite')
+        self.cache = ResultCache(self.cache_path)
+        with open(join(dirname(__file__), '../../resources/data_for_test_issues.json')) as test_data_file:
+            self.test_data = json.load(test_data_file)
+
+    def tearDown(self):
+        self.cache.close()
+        self.temp_dir.cleanup()
+
+    def make_submission(self) -> Submission:
+        submission = Submission()
+        for entity_type, attributes in self.test_data.items():
+            submission.map(entity_type, attributes['index'], dict(attributes))
+        return submission
+
+    def test_stored_errors_are_returned_and_counted(self):
+        key = ResultCache.key('validator', 'v1', {'attribute': 'value'})
+
+        self.assertIsNone(self.cache.get('validator', key))
+        self.cache.put(key, {'attribute': ['error']})
+
+        self.assertDictEqual({'attribute': ['error']}, self.cache.get('validator', key))
+        self.assertDictEqual({'validator': {'hits': 1, 'misses': 1}}, self.cache.counts)
+
+    def test_key_changes_with_version_and_attributes(self):
+        key = ResultCache.key('validator', 'v1', {'attribute': 'value'})
+
+        self.assertEqual(key, ResultCache.key('validator', 'v1', {'attribute': 'value'}))
+        self.assertNotEqual(key, ResultCache.key('validator', 'v2', {'attribute': 'value'}))
+        self.assertNotEqual(key, ResultCache.key('validator', 'v1', {'attribute': 'other value'}))
+
+    def test_expired_results_are_not_returned(self):
+        cache = ResultCache(self.cache_path, max_age=0)
+        key = ResultCache.key('validator', 'v1', {})
+        cache.put(key, {})
+        time.sleep(0.01)
+
+        self.assertIsNone(cache.get('validator', key))
+        cache.close()
+
+    def test_least_recently_used_results_are_evicted(self):
+        cache = ResultCache(self.cache_path, max_bytes=250)
+        keys = [ResultCache.key('validator', 'v1', {'row': row}) for row in range(3)]
+        for key in keys:
+            cache.put(key, {'attribute': ['error']})
+            time.sleep(0.01)
+        cache.get('validator', keys[0])
+
+        cache.evict()
+
+        self.assertIsNotNone(cache.get('validator', keys[0]))
+        self.assertIsNone(cache.get('validator', keys[1]))
+        self.assertIsNotNone(cache.get('validator', keys[2]))
+        cache.close()
+
+    @patch('services.transport.TransportSession.post')
+    def test_unchanged_entities_are_not_sent_to_validator(self, mock_post):
+        # Given
+        mock_post.return_value.json.return_value = [
+            {'dataPath': '.release_date', 'errors': ["should have required property 'release_date'"]}
+        ]
+        validator = JsonValidator('')
+        validator.cache = self.cache
+        first_submission = self.make_submission()
+        validator.validate_data(first_submission)
+        first_posts = mock_post.call_count
+        second_submission = self.make_submission()
+        second_submission.get_entity('study', 'PRJEB39632').attributes['release_date'] = '2020-09-30'
+
+        # When
+        validator.validate_data(second_submission)
+
+        # Then
+        self.assertEqual(4, first_posts)
+        self.assertEqual(5, mock_post.call_count)
+        self.assertDictEqual(first_submission.get_all_errors(), second_submission.get_all_errors())
+        self.assertDictEqual({'hits': 3, 'misses': 5}, self.cache.counts['json_schema'])
+
+    def test_taxonomy_errors_are_not_stored(self):
+        validator = TaxonomyValidator()
+        validator.cache = self.cache
+        validator.ena_taxonomy = MagicMock()
+        validator.ena_taxonomy.validate_scientific_name.return_value = {'error': 'Not valid scientific_name'}
+        validator.ena_taxonomy.validate_tax_id.return_value = {'error': 'Not valid tax_id'}
+
+        validator.validate_data(self.make_submission())
+        validator.validate_data(self.make_submission())
+
+        self.assertEqual(2, validator.ena_taxonomy.validate_tax_id.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
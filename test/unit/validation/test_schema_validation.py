@@ -19,7 +19,7 @@ class TestSchemaValidation(unittest.TestCase):
         for entity_type, attributes in test_data.items():
             self.submission.map(entity_type, attributes["index"], attributes)
 
-    @patch('validation.json.requests.post')
+    @patch('services.transport.TransportSession.post')
     def test_when_entity_valid_should_return_no_errors(self, mock_post):
         # Given
         mock_post.return_value.json.return_value = []
@@ -32,7 +32,7 @@ class TestSchemaValidation(unittest.TestCase):
         self.assertFalse(self.submission.has_errors())
         self.assertDictEqual({}, self.submission.get_all_errors())
 
-    @patch('validation.json.requests.post')
+    @patch('services.transport.TransportSession.post')
     def test_when_entity_invalid_entity_with_valid_schema_should_return_errors(self, mock_post):
         # Given
         mock_post.return_value.json.return_value = [
@@ -3,6 +3,7 @@ from unittest.mock import MagicMock
 
 from validation.taxonomy import TaxonomyValidator
 from submission.entity import Entity
+from submission.submission import Submission
 
 
 class TestTaxonomyValidator(unittest.TestCase):
@@ -185,6 +186,35 @@ class TestTaxonomyValidator(unittest.TestCase):
         self.assertTrue(sample.has_errors())
         self.assertDictEqual(expected_error, sample.get_errors())
 
+    def test_each_distinct_taxonomy_is_looked_up_once(self):
+        # Given
+        submission = Submission()
+        for number in range(10):
+            submission.map('sample', f'sarscov2_{number}', {
+                'scientific_name': 'Severe acute respiratory syndrome coronavirus 2',
+                'tax_id': '2697049'
+            })
+        submission.map('sample', 'human_with_sarscov2_name', {
+            'scientific_name': 'Severe acute respiratory syndrome coronavirus 2',
+            'tax_id': '9606'
+        })
+        submission.map('sample', 'human_tax_id', {'tax_id': '9606'})
+        responses = {'2697049': self.valid_sarscov2, '9606': self.valid_human}
+        self.taxonomy_validator.ena_taxonomy.validate_scientific_name = MagicMock(return_value=self.valid_sarscov2)
+        self.taxonomy_validator.ena_taxonomy.validate_tax_id = MagicMock(side_effect=responses.get)
+
+        # When
+        self.taxonomy_validator.validate_data(submission)
+
+        # Then
+        self.assertEqual(1, self.taxonomy_validator.ena_taxonomy.validate_scientific_name.call_count)
+        self.assertEqual(2, self.taxonomy_validator.ena_taxonomy.validate_tax_id.call_count)
+        self.assertListEqual(['human_with_sarscov2_name'], list(submission.get_errors('sample')))
+        self.assertEqual(
+            'Information is not consistent between taxId: 9606 and scientificName: Severe acute respiratory syndrome coronavirus 2',
+            submission.get_errors('sample')['human_with_sarscov2_name']['tax_id'][-1]
+        )
+
 
 if __name__ == '__main__':
     unittest.main()
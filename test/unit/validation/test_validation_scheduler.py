@@ -0,0 +1,74 @@
+import time
+import unittest
+
+from submission.submission import Submission
+from validation.scheduler import run_validations
+
+
+def slow_validation(attribute: str, seconds: float):
+    def validate(data: Submission):
+        time.sleep(seconds)
+        for entity in data.get_entities('sample'):
+            entity.add_error(attribute, f'{attribute} error')
+        return attribute
+    return validate
+
+
+class TestValidationScheduler(unittest.TestCase):
+    def setUp(self):
+        self.data = Submission()
+        self.sample = self.data.map('sample', 'sample_1', {'sample_title': 'title'})
+        self.run = self.data.map('run_experiment', 'run_1', {'uploaded_file_1': 'file.fastq'})
+        self.run.add_link('sample', 'sample_1')
+
+    def test_validations_run_at_the_same_time(self):
+        # Given
+        validations = [slow_validation(f'attribute_{number}', 0.2) for number in range(3)]
+
+        # When
+        start = time.perf_counter()
+        results = run_validations(self.data, validations)
+        seconds = time.perf_counter() - start
+
+        # Then
+        self.assertLess(seconds, 0.5)
+        self.assertListEqual(['attribute_0', 'attribute_1', 'attribute_2'], results)
+
+    def test_errors_are_merged_in_the_order_of_the_validations(self):
+        # The first validation finishes last
+        validations = [
+            slow_validation('sample_title', 0.1),
+            slow_validation('sample_title', 0),
+            slow_validation('tax_id', 0)
+        ]
+
+        run_validations(self.data, validations)
+
+        self.assertDictEqual({
+            'sample_title': ['sample_title error', 'sample_title error'],
+            'tax_id': ['tax_id error']
+        }, self.sample.get_errors())
+
+    def test_added_attributes_are_merged(self):
+        def add_checksum(data: Submission):
+            run = data.get_entity('run_experiment', 'run_1')
+            self.assertIsNot(self.run, run)
+            self.assertSetEqual({'sample_1'}, run.get_linked_indexes('sample'))
+            run.attributes['uploaded_file_1_checksum'] = 'checksum'
+
+        run_validations(self.data, [slow_validation('sample_title', 0), add_checksum])
+
+        self.assertEqual('checksum', self.run.attributes['uploaded_file_1_checksum'])
+
+    def test_exception_is_raised_after_earlier_validations_are_merged(self):
+        def fail(data: Submission):
+            raise ValueError('Service unavailable')
+
+        with self.assertRaises(ValueError):
+            run_validations(self.data, [slow_validation('sample_title', 0), fail, slow_validation('tax_id', 0)])
+
+        self.assertDictEqual({'sample_title': ['sample_title error']}, self.sample.get_errors())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,15 +1,24 @@
 import logging
+from typing import Collection, Dict, Iterable, List, Optional
 
 from submission.entity import Entity
 from submission.submission import Submission
+from .cache import ResultCache
 
 
 class BaseValidator:
+    # Set a ResultCache to reuse the errors of entities validated before, validators opt in with get_cache_key
+    cache: ResultCache = None
+    cache_id = None
+    # Validators whose errors may not be permanent only remember entities without errors
+    cache_errors = True
+
     def validate_data(self, data: Submission):
         for entity_type, entities in data.get_all_entities().items():
-            logging.info(f'Validating {len(entities)} {entity_type}(s) with {self.__class__}')
-            for entity in entities:
-                self.validate_entity(entity)
+            groups = self.group_entities(entities)
+            self.log_validation(entity_type, entities, groups)
+            for group in groups:
+                self.validate_group(group)
 
     def validate_entity(self, entity: Entity):
         # identify which attribute cases the error
@@ -20,3 +29,61 @@ class BaseValidator:
         error_msgs = ['error 1', 'error 2']
         entity.add_errors(attribute, error_msgs)
         raise NotImplementedError('Example validate entity used')
+
+    def validate_group(self, group: List[Entity]):
+        if len(group) == 1:
+            self.validate_entity_with_cache(group[0])
+            return
+        # The first entity is validated on a copy and the errors are copied to every entity in the group
+        validated = self.copy_entity(group[0])
+        self.validate_entity_with_cache(validated)
+        errors = validated.get_errors()
+        for entity in group:
+            self.copy_errors(errors, entity)
+
+    def validate_entity_with_cache(self, entity: Entity):
+        cache_key = self.get_cache_key(entity) if self.cache else None
+        if not cache_key:
+            self.validate_entity(entity)
+            return
+        errors = self.cache.get(self.cache_id, cache_key)
+        if errors is None:
+            # Validated on a copy so that only the errors from this validator are stored
+            validated = self.copy_entity(entity)
+            self.validate_entity(validated)
+            errors = validated.get_errors()
+            self.store_errors(cache_key, errors)
+        self.copy_errors(errors, entity)
+
+    def group_entities(self, entities: Iterable[Entity]) -> List[List[Entity]]:
+        # Entities with the same fingerprint get the same errors, so are grouped to be validated once
+        groups: Dict[object, List[Entity]] = {}
+        for entity in entities:
+            fingerprint = self.get_fingerprint(entity)
+            groups.setdefault(id(entity) if fingerprint is None else fingerprint, []).append(entity)
+        return list(groups.values())
+
+    def get_fingerprint(self, entity: Entity) -> Optional[str]:
+        return None
+
+    def get_cache_key(self, entity: Entity) -> Optional[str]:
+        return None
+
+    def store_errors(self, cache_key: str, errors: Dict[str, List[str]]):
+        if self.cache_errors or not errors:
+            self.cache.put(cache_key, errors)
+
+    def log_validation(self, entity_type: str, entities: Collection[Entity], groups: List[List[Entity]]):
+        message = f'Validating {len(entities)} {entity_type}(s) with {self.__class__}'
+        if len(groups) < len(entities):
+            message = f'{message} as {len(groups)} distinct {entity_type}(s)'
+        logging.info(message)
+
+    @staticmethod
+    def copy_entity(entity: Entity) -> Entity:
+        return Entity(entity.identifier.entity_type, entity.identifier.index, entity.attributes)
+
+    @staticmethod
+    def copy_errors(errors: Dict[str, List[str]], entity: Entity):
+        for attribute, attribute_errors in errors.items():
+            entity.add_errors(attribute, attribute_errors)
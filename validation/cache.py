@@ -0,0 +1,101 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from os.path import dirname, expanduser, join
+from typing import Dict, List, Optional
+
+DEFAULT_CACHE_PATH = join(expanduser('~'), '.cache', 'covid-excel-utils', 'validation.sqlite')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60
+# Eviction scans the whole table, so it only runs after this many new results
+EVICT_EVERY = 1000
+
+
+class ResultCache:
+    # On-disk cache of validation errors, keyed by the validator, the version of its schema and the validated attributes
+    def __init__(self, cache_path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES, max_age: float = DEFAULT_MAX_AGE):
+        self.cache_path = cache_path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.counts: Dict[str, Dict[str, int]] = {}
+        self.__puts = 0
+        self.__lock = threading.Lock()
+        os.makedirs(dirname(cache_path) or '.', exist_ok=True)
+        # Shared by threads of one process and safe to share between processes
+        self.__connection = sqlite3.connect(cache_path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.__connection.execute('PRAGMA journal_mode=WAL')
+        self.__connection.execute(
+            'CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, errors TEXT NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)'
+        )
+        self.__connection.execute('CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)')
+
+    @staticmethod
+    def key(validator_id: str, version: str, attributes) -> str:
+        content = json.dumps([validator_id, version, attributes], sort_keys=True, default=str)
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def get(self, validator_id: str, key: str) -> Optional[Dict[str, List[str]]]:
+        now = time.time()
+        with self.__lock:
+            row = self.__connection.execute('SELECT errors, accessed FROM results WHERE key = ?', (key,)).fetchone()
+            if row and now - row[1] > self.max_age:
+                self.__connection.execute('DELETE FROM results WHERE key = ?', (key,))
+                row = None
+            counts = self.counts.setdefault(validator_id, {'hits': 0, 'misses': 0})
+            if not row:
+                counts['misses'] += 1
+                return None
+            counts['hits'] += 1
+            # Recently used results are the last to be evicted
+            self.__connection.execute('UPDATE results SET accessed = ? WHERE key = ?', (now, key))
+        return json.loads(row[0])
+
+    def put(self, key: str, errors: Dict[str, List[str]]):
+        content = json.dumps(errors)
+        with self.__lock:
+            self.__connection.execute(
+                'INSERT OR REPLACE INTO results (key, errors, size, accessed) VALUES (?, ?, ?, ?)',
+                (key, content, len(key) + len(content), time.time())
+            )
+            self.__puts += 1
+            evict = self.__puts % EVICT_EVERY == 0
+        if evict:
+            self.evict()
+
+    def evict(self):
+        with self.__lock:
+            self.__connection.execute('DELETE FROM results WHERE accessed < ?', (time.time() - self.max_age,))
+            total_bytes = self.__connection.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+            if total_bytes <= self.max_bytes:
+                return
+            removed_bytes = 0
+            oldest_accessed = None
+            for size, accessed in self.__connection.execute('SELECT size, accessed FROM results ORDER BY accessed'):
+                removed_bytes += size
+                oldest_accessed = accessed
+                if total_bytes - removed_bytes <= self.max_bytes:
+                    break
+            self.__connection.execute('DELETE FROM results WHERE accessed <= ?', (oldest_accessed,))
+
+    def total(self, count: str) -> int:
+        return sum(counts[count] for counts in self.counts.values())
+
+    def report(self) -> str:
+        if not self.counts:
+            return 'Validation cache not used'
+        counts = ', '.join(
+            f"{validator_id}: {count['hits']} hit(s) {count['misses']} miss(es)" for validator_id, count in self.counts.items()
+        )
+        return f'Validation cache {counts}'
+
+    def close(self):
+        logging.info(self.report())
+        try:
+            self.evict()
+        except sqlite3.Error as error:
+            logging.warning(f'Could not evict from validation cache {self.cache_path}: {error}')
+        self.__connection.close()
@@ -1,43 +1,112 @@
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
 
 import docker
+import requests
 from .json import JsonValidator
 
+CONTAINER_PORT = 3020
+
 
 class JsonValidatorDocker(JsonValidator):
-    def __init__(self, image_name, validator_url, port=3020):
+    def __init__(self, image_name, validator_url, port=3020, pool_size=1, ready_timeout=60.0, batch_size=1, concurrency=1):
+        # A pool of containers is started on consecutive ports, validation requests are spread across them
         self.__client = docker.from_env()
-        self.container = self.__launch(self.__client, image_name, port)
-        super().__init__(validator_url)
-    
+        self.containers = []
+        pool_ports = list(range(port, port + pool_size))
+        validator_urls = [self.get_pool_url(validator_url, pool_port) for pool_port in pool_ports]
+        try:
+            # Every container is started before waiting, so that they start up at the same time
+            start = time.perf_counter()
+            for pool_port in pool_ports:
+                self.containers.append(self.__launch(self.__client, image_name, pool_port))
+            stop = threading.Event()
+            with ThreadPoolExecutor(max_workers=pool_size) as pool:
+                futures = {
+                    pool.submit(wait_until_ready, pool_url, ready_timeout, container, stop=stop): pool_port
+                    for pool_port, pool_url, container in zip(pool_ports, validator_urls, self.containers)
+                }
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                        logging.info(f'JSON Validator ready on port {futures[future]} after {time.perf_counter() - start:.2f} seconds')
+                except Exception:
+                    # The other containers are not waited for once one of them fails
+                    stop.set()
+                    raise
+        except Exception:
+            self.close()
+            raise
+        self.container = self.containers[0]
+        super().__init__(validator_urls[0], validator_urls, batch_size, concurrency)
+
     def close(self):
-        self.container.reload()
-        if self.container:
-            logging.debug(f'Stop running container: {self.container.name}')
-            self.container.stop()
-            logging.info(f'Removing container: {self.container.name}')
-            self.container.remove()
-            self.__client.close()
-    
+        for container in self.containers:
+            container.reload()
+            logging.debug(f'Stop running container: {container.name}')
+            container.stop()
+            logging.info(f'Removing container: {container.name}')
+            container.remove()
+        self.containers = []
+        self.__client.close()
+
+    @staticmethod
+    def get_pool_url(validator_url: str, port: int) -> str:
+        url = urlparse(validator_url)
+        return url._replace(netloc=f'{url.hostname}:{port}').geturl()
+
     @staticmethod
     def __launch(docker_client, image_name, port):
         if not docker_client.images.list(image_name):
             logging.info(f'Pulling image: {image_name}')
             docker_client.images.pull(image_name)
             logging.debug(f'Pulled image: {image_name}')
-        containers = docker_client.containers.list(filters={'ancestor': image_name})
-        if containers:
-            logging.debug(f'Attaching to existing container from image: {image_name}')
-            container = containers[0]
+        container = JsonValidatorDocker.__find_container(docker_client, image_name, port)
+        if container:
+            logging.debug(f'Attaching to existing container from image: {image_name} on port: {port}')
         else:
-            logging.debug(f'Starting container from image: {image_name}')
+            logging.debug(f'Starting container from image: {image_name} on port: {port}')
             container = docker_client.containers.run(
                 image_name,
-                ports={f'{port}/tcp': port},
+                ports={f'{CONTAINER_PORT}/tcp': port},
                 detach=True
             )
-            time.sleep(5)
         logging.info(f'Running Container: {container.name} from image: {image_name}')
         container.reload()
         return container
+
+    @staticmethod
+    def __find_container(docker_client, image_name, port):
+        for container in docker_client.containers.list(filters={'ancestor': image_name}):
+            for bindings in container.ports.values():
+                for binding in bindings or []:
+                    if binding.get('HostPort') == str(port):
+                        return container
+        return None
+
+
+def wait_until_ready(validator_url: str, timeout: float, container=None, initial_delay=0.1, max_delay=2.0,
+                     stop: threading.Event = None):
+    # Any HTTP response means the validator is listening, connection errors are retried with exponential backoff
+    # until the timeout, or until stop is set
+    deadline = time.monotonic() + timeout
+    delay = initial_delay
+    while True:
+        if stop is not None and stop.is_set():
+            raise RuntimeError(f'Stopped waiting for JSON Validator at {validator_url}.')
+        try:
+            requests.post(validator_url, json={'schema': {}, 'object': {}}, timeout=max_delay)
+            return
+        except requests.exceptions.RequestException as error:
+            if container is not None:
+                container.reload()
+                if container.status in ('exited', 'dead'):
+                    raise RuntimeError(f'JSON Validator container {container.name} stopped before it was ready.') from error
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f'JSON Validator not ready at {validator_url} after {timeout} seconds.') from error
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, max_delay)
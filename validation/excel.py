@@ -1,17 +1,25 @@
 from typing import List
 
-from openpyxl import load_workbook
+from openpyxl.workbook import Workbook
 from openpyxl.worksheet.datavalidation import DataValidationList
 from openpyxl.worksheet.worksheet import Worksheet
 from excel.clean import (entity_has_attribute, clean_validation, clean_entity_name, clean_key,
                          clean_name, clean_formula_list, clean_validation_list, is_valid_date)
+from excel.session import WorkbookSession
 from submission.entity import Entity
 from .base import BaseValidator
 
 
 class ExcelValidator(BaseValidator):
-    def __init__(self, file_path, sheet_index=0):
-        self.validation_map = self.__get_validation(file_path, sheet_index)
+    def __init__(self, file_path, sheet_index=0, session: WorkbookSession = None):
+        if session:
+            self.validation_map = self.__get_validation(session.workbook, sheet_index)
+        else:
+            validation_session = WorkbookSession(file_path)
+            try:
+                self.validation_map = self.__get_validation(validation_session.workbook, sheet_index)
+            finally:
+                validation_session.close()
         # ToDo: Accept param for number of header rows, columns / mapping of headers
 
     def validate_entity(self, entity: Entity):
@@ -48,17 +56,13 @@ class ExcelValidator(BaseValidator):
         return attribute_errors
 
     @staticmethod
-    def __get_validation(file_path, sheet_index=0):
-        workbook = load_workbook(filename=file_path, read_only=False, keep_links=False)
+    def __get_validation(workbook: Workbook, sheet_index=0):
         worksheet = workbook.worksheets[sheet_index]
-        try:
-            validations = ExcelValidator.__get_excel_validations(worksheet.data_validations.dataValidation)
-            if 'Accepted_Values' in workbook.sheetnames:
-                accepted_lists = ExcelValidator.__get_accepted_lists(workbook['Accepted_Values'])
-                ExcelValidator.__merge_accepted_lists(validations, accepted_lists)
-            return ExcelValidator.__load_validation_map(worksheet, validations)
-        finally:
-            workbook.close()
+        validations = ExcelValidator.__get_excel_validations(worksheet.data_validations.dataValidation)
+        if 'Accepted_Values' in workbook.sheetnames:
+            accepted_lists = ExcelValidator.__get_accepted_lists(workbook['Accepted_Values'])
+            ExcelValidator.__merge_accepted_lists(validations, accepted_lists)
+        return ExcelValidator.__load_validation_map(worksheet, validations)
     
     @staticmethod
     def __get_excel_validations(validations: DataValidationList):
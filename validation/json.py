@@ -1,34 +1,237 @@
+import hashlib
 import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle
 from fnmatch import fnmatch
 from os import listdir
 from os.path import dirname, join, splitext
-from typing import Dict
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
 import requests
 
+from services.transport import create_session
 from submission.entity import Entity
+from submission.submission import Submission
 from .base import BaseValidator
 
+COMBINATOR_KEYWORDS = ('anyOf', 'oneOf', 'allOf', 'not', 'if', 'then', 'else')
+OBJECT_KEYWORDS = ('additionalProperties', 'patternProperties', 'propertyNames', 'minProperties', 'maxProperties')
+VALUE_INSENSITIVE_KEYWORDS = {'description', 'title', 'type', 'enum', 'not'}
+BATCH_ATTEMPTS = 3
+BATCH_BACKOFF = 1.0
+
+
+def get_schema_names(schema) -> Iterator[str]:
+    # Every key and string in a schema, which includes every property name it refers to
+    if isinstance(schema, dict):
+        for key, value in schema.items():
+            yield key
+            yield from get_schema_names(value)
+    elif isinstance(schema, list):
+        for value in schema:
+            yield from get_schema_names(value)
+    elif isinstance(schema, str):
+        yield schema
+
+
+def get_json_type(value) -> str:
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'boolean'
+    if isinstance(value, int) or (isinstance(value, float) and value.is_integer()):
+        return 'integer'
+    if isinstance(value, float):
+        return 'number'
+    if isinstance(value, str):
+        return 'string'
+    if isinstance(value, list):
+        return 'array'
+    return 'object'
+
 
 class JsonValidator(BaseValidator):
-    def __init__(self, validator_url: str):
+    cache_id = 'json_schema'
+
+    def __init__(self, validator_url: str, validator_urls: List[str] = None, batch_size=1, concurrency=1):
         self.validator_url = validator_url
+        # Up to batch_size entities of the same type are sent in one request, with the schema sent once
+        self.batch_size = batch_size
+        # Up to concurrency requests are in flight at once
+        self.concurrency = concurrency
+        # Requests are spread across every validator url in turn
+        self.validator_urls = validator_urls if validator_urls else [validator_url]
+        self.__next_url = cycle(self.validator_urls)
         self.schema_by_type = self.__load_schema_files()
+        # Cached errors are only reused while the schema is unchanged
+        self.schema_versions = {
+            entity_type: hashlib.sha256(json.dumps(schema, sort_keys=True).encode('utf-8')).hexdigest()
+            for entity_type, schema in self.schema_by_type.items()
+        }
+        # Attributes that cannot change the errors of an entity are left out of its fingerprint
+        self.fingerprint_rules = {
+            entity_type: self.get_fingerprint_rules(schema) for entity_type, schema in self.schema_by_type.items()
+        }
+        # Connections to the validator are kept alive between requests and shared by concurrent requests.
+        # Validating is safe to repeat, so requests that fail with a server error are sent again.
+        self.session = create_session(
+            'JSON Validator', pool_size=max(concurrency, 10), pool_connections=len(self.validator_urls), retry_post=True)
+
+    def validate_data(self, data: Submission):
+        if self.batch_size <= 1 and self.concurrency <= 1:
+            super().validate_data(data)
+            return
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for entity_type, entities in data.get_all_entities().items():
+                if entity_type not in self.schema_by_type:
+                    continue
+                batch_size = max(self.batch_size, 1)
+                groups = self.group_entities(entities)
+                self.log_validation(entity_type, entities, groups)
+                logging.info(f'Sending {entity_type}(s) in batches of {batch_size}, {self.concurrency} at a time')
+                pending = []
+                for group in groups:
+                    cache_key = self.get_cache_key(group[0]) if self.cache else None
+                    errors = self.cache.get(self.cache_id, cache_key) if cache_key else None
+                    if errors is None:
+                        pending.append((group, cache_key))
+                        continue
+                    for entity in group:
+                        self.copy_errors(errors, entity)
+                batches = [pending[start:start + batch_size] for start in range(0, len(pending), batch_size)]
+                # Results are returned in the order the batches were sent, so errors are always added in entity order
+                batch_results = pool.map(self.validate_batch, [entity_type] * len(batches),
+                                         [[self.get_validation_attributes(group[0]) for group, _ in batch] for batch in batches])
+                for batch, batch_errors in zip(batches, batch_results):
+                    for (group, cache_key), schema_errors in zip(batch, batch_errors):
+                        validated = self.copy_entity(group[0])
+                        self.__add_errors_to_entity(validated, schema_errors)
+                        errors = validated.get_errors()
+                        if cache_key:
+                            self.store_errors(cache_key, errors)
+                        for entity in group:
+                            self.copy_errors(errors, entity)
 
     def validate_entity(self, entity: Entity):
         if entity.identifier.entity_type not in self.schema_by_type:
             return
-        schema = self.schema_by_type[entity.identifier.entity_type]
+        schema_errors = self.validate_attributes(entity.identifier.entity_type, self.get_validation_attributes(entity))
+        self.__add_errors_to_entity(entity, schema_errors)
+
+    def get_fingerprint(self, entity: Entity) -> Optional[str]:
+        entity_type = entity.identifier.entity_type
+        if entity_type not in self.schema_by_type:
+            return None
+        return json.dumps([entity_type, self.get_fingerprint_attributes(entity)], sort_keys=True, default=str)
+
+    def get_cache_key(self, entity: Entity) -> Optional[str]:
+        entity_type = entity.identifier.entity_type
+        if entity_type not in self.schema_by_type:
+            return None
+        return self.cache.key(self.cache_id, self.schema_versions[entity_type], [entity_type, self.get_fingerprint_attributes(entity)])
+
+    def get_fingerprint_attributes(self, entity: Entity) -> dict:
+        # Entities with the same fingerprint attributes are given the same errors by the schema of their type
+        properties, drop_undeclared, referenced = self.fingerprint_rules[entity.identifier.entity_type]
+        fingerprint = {}
+        for name, value in self.get_validation_attributes(entity).items():
+            if name in properties:
+                property_schema = properties[name]
+                fingerprint[name] = value if property_schema is None else self.get_value_surrogate(property_schema, value)
+            elif not drop_undeclared or name in referenced:
+                fingerprint[name] = value
+        return fingerprint
+
+    def validate_attributes(self, entity_type: str, entity_attributes: dict) -> List[dict]:
+        # Errors are returned as json-schema-validator responds: [{'dataPath': '.attribute', 'errors': ['message']}]
+        return self.__validate(self.schema_by_type[entity_type], entity_attributes)
+
+    def validate_batch(self, entity_type: str, attributes_list: List[dict]) -> List[List[dict]]:
+        # Returns the errors of each object, in the order they were sent
+        if self.batch_size > 1:
+            batch_errors = self.__validate_batch_with_retry(self.schema_by_type[entity_type], attributes_list)
+            if batch_errors is not None:
+                return batch_errors
+            logging.warning('JSON Validator does not accept batches, validating one entity per request.')
+            self.batch_size = 1
+        return [self.validate_attributes(entity_type, entity_attributes) for entity_attributes in attributes_list]
+
+    @staticmethod
+    def get_validation_attributes(entity: Entity) -> dict:
         entity_string = json.dumps(entity.attributes)
         if entity.identifier.entity_type != 'run_experiment':
             entity_string = entity_string.lower()
-        schema_errors = self.__validate(schema, json.loads(entity_string))
-        self.__add_errors_to_entity(entity, schema_errors)
+        return json.loads(entity_string)
+
+    @staticmethod
+    def get_fingerprint_rules(schema: dict) -> Tuple[Dict[str, Optional[dict]], bool, Set[str]]:
+        # Names used anywhere outside the properties of the schema may change the errors by their presence or value
+        value_referenced = set()
+        for keyword in COMBINATOR_KEYWORDS:
+            value_referenced.update(get_schema_names(schema.get(keyword)))
+        dependencies = schema.get('dependencies', {})
+        for dependency in dependencies.values():
+            value_referenced.update(get_schema_names(dependency))
+        referenced = value_referenced | set(schema.get('required', [])) | set(dependencies)
+        # Undeclared attributes, such as the index of an entity, only matter if the schema restricts them
+        drop_undeclared = not any(keyword in schema for keyword in OBJECT_KEYWORDS)
+        properties = {}
+        for name, property_schema in schema.get('properties', {}).items():
+            # Only the type of the value and whether it is one of the enums can change the errors of these properties
+            value_insensitive = name not in value_referenced and \
+                set(property_schema) <= VALUE_INSENSITIVE_KEYWORDS and \
+                set(property_schema.get('not', {})) <= {'enum'}
+            properties[name] = property_schema if value_insensitive else None
+        return properties, drop_undeclared, referenced
+
+    @staticmethod
+    def get_value_surrogate(property_schema: dict, value) -> list:
+        enum = property_schema.get('enum')
+        not_enum = property_schema.get('not', {}).get('enum')
+        return [
+            get_json_type(value),
+            None if enum is None else value in enum,
+            None if not_enum is None else value in not_enum
+        ]
 
     def __validate(self, schema: dict, entity_attributes: dict):
-        schema.pop('id', None)
         payload = self.__create_validator_payload(schema, entity_attributes)
-        return requests.post(self.validator_url, json=payload).json()
+        return self.session.post(next(self.__next_url), json=payload).json()
+
+    def __validate_batch_with_retry(self, schema: dict, attributes_list: List[dict]):
+        # Server errors and dropped connections do not mean that batches are not accepted, so the batch is sent again
+        for attempt in range(1, BATCH_ATTEMPTS + 1):
+            try:
+                return self.__validate_batch(schema, attributes_list)
+            except (requests.ConnectionError, requests.HTTPError) as error:
+                if attempt == BATCH_ATTEMPTS:
+                    raise
+                delay = BATCH_BACKOFF * 2 ** (attempt - 1)
+                logging.warning(f'JSON Validator batch failed, attempt {attempt} of {BATCH_ATTEMPTS}, retrying in {delay:.1f}s: {error}')
+                time.sleep(delay)
+
+    def __validate_batch(self, schema: dict, attributes_list: List[dict]):
+        # Returns None when the validator rejects the batch, which means it only accepts single objects
+        payload = {
+            "schema": schema,
+            "objects": attributes_list
+        }
+        response = self.session.post(next(self.__next_url), json=payload)
+        if response.status_code >= 500:
+            raise requests.HTTPError(f'{response.status_code} Server Error from {response.url}', response=response)
+        if not response.ok:
+            return None
+        try:
+            batch_errors = response.json()
+        except ValueError:
+            return None
+        # A validator that only accepts single objects does not answer with one list of errors per object
+        if not isinstance(batch_errors, list) or len(batch_errors) != len(attributes_list) or \
+                not all(isinstance(schema_errors, list) for schema_errors in batch_errors):
+            return None
+        return batch_errors
 
     @staticmethod
     def __load_schema_files() -> Dict[str, dict]:
@@ -40,6 +243,8 @@ class JsonValidator(BaseValidator):
                 file_path = join(schema_dir, file)
                 with open(file_path) as schema_file:
                     schema_by_type[entity_type] = json.load(schema_file)
+                # The validator does not accept the schema id
+                schema_by_type[entity_type].pop('id', None)
         return schema_by_type
 
     @staticmethod
@@ -0,0 +1,147 @@
+import re
+from typing import Dict, Iterator, List
+
+from jsonschema import Draft7Validator, FormatChecker
+from jsonschema.exceptions import ValidationError
+from jsonschema.validators import validator_for
+
+from .json import JsonValidator
+
+IDENTIFIER = re.compile(r'^[a-z$_][a-z$_0-9]*$', re.IGNORECASE)
+# ajv's default "fast" date format
+DATE_FORMAT = re.compile(r'^\d\d\d\d-[0-1]\d-[0-3]\d$')
+
+# Order in which ajv checks keywords, errors are reported in the same order
+KEYWORD_ORDER = [
+    'type', '$ref', 'const', 'enum', 'not', 'anyOf', 'oneOf', 'allOf', 'if',
+    'maximum', 'minimum', 'exclusiveMaximum', 'exclusiveMinimum', 'multipleOf',
+    'maxLength', 'minLength', 'pattern', 'format',
+    'maxItems', 'minItems', 'uniqueItems', 'items', 'additionalItems', 'contains',
+    'maxProperties', 'minProperties', 'required', 'dependencies', 'propertyNames',
+    'properties', 'patternProperties', 'additionalProperties'
+]
+
+# Messages as written by ajv, the validator used by json-schema-validator
+MESSAGES = {
+    'type': lambda value: f'should be {",".join(value) if isinstance(value, list) else value}',
+    'const': lambda value: 'should be equal to constant',
+    'enum': lambda value: f'should be equal to one of the allowed values: {value}',
+    'not': lambda value: 'should NOT be valid',
+    'anyOf': lambda value: 'should match some schema in anyOf',
+    'oneOf': lambda value: 'should match exactly one schema in oneOf',
+    'maximum': lambda value: f'should be <= {value}',
+    'minimum': lambda value: f'should be >= {value}',
+    'exclusiveMaximum': lambda value: f'should be < {value}',
+    'exclusiveMinimum': lambda value: f'should be > {value}',
+    'multipleOf': lambda value: f'should be multiple of {value}',
+    'maxLength': lambda value: f'should NOT be longer than {value} characters',
+    'minLength': lambda value: f'should NOT be shorter than {value} characters',
+    'pattern': lambda value: f'should match pattern "{value}"',
+    'format': lambda value: f'should match format "{value}"',
+    'maxItems': lambda value: f'should NOT have more than {value} items',
+    'minItems': lambda value: f'should NOT have fewer than {value} items',
+    'uniqueItems': lambda value: 'should NOT have duplicate items',
+    'maxProperties': lambda value: f'should NOT have more than {value} properties',
+    'minProperties': lambda value: f'should NOT have fewer than {value} properties',
+    'additionalProperties': lambda value: 'should NOT have additional properties'
+}
+
+
+class LocalJsonValidator(JsonValidator):
+    # Validates in process, each schema is compiled once and errors match the Docker validator's responses
+    def __init__(self):
+        super().__init__('')
+        self.format_checker = self.get_format_checker()
+        self.validator_by_type = {}
+        for entity_type, schema in self.schema_by_type.items():
+            self.validator_by_type[entity_type] = self.compile_schema(schema, self.format_checker)
+
+    def validate_attributes(self, entity_type: str, entity_attributes: dict) -> List[dict]:
+        errors_by_path: Dict[str, List[str]] = {}
+        for data_path, message in self.iter_messages(self.validator_by_type[entity_type], entity_attributes):
+            errors_by_path.setdefault(data_path, []).append(message)
+        return [{'dataPath': data_path, 'errors': errors} for data_path, errors in errors_by_path.items()]
+
+    def validate_batch(self, entity_type: str, attributes_list: List[dict]) -> List[List[dict]]:
+        return [self.validate_attributes(entity_type, entity_attributes) for entity_attributes in attributes_list]
+
+    @staticmethod
+    def compile_schema(schema: dict, format_checker: FormatChecker) -> Draft7Validator:
+        schema = {key: value for key, value in schema.items() if key not in ('id', '$async')}
+        validator_class = validator_for(schema, default=Draft7Validator)
+        validator_class.check_schema(schema)
+        return validator_class(schema, format_checker=format_checker)
+
+    @staticmethod
+    def get_format_checker() -> FormatChecker:
+        format_checker = FormatChecker()
+
+        @format_checker.checks('date')
+        def is_date(value) -> bool:
+            return not isinstance(value, str) or bool(DATE_FORMAT.match(value))
+
+        return format_checker
+
+    @staticmethod
+    def iter_messages(validator: Draft7Validator, instance: dict) -> Iterator[tuple]:
+        reported_required = set()
+        for error in LocalJsonValidator.__iter_errors(validator.iter_errors(instance)):
+            if error.validator in ('required', 'dependencies'):
+                # Reported against the missing property, as ajv does with errorDataPath: 'property'
+                required_key = (tuple(error.absolute_path), tuple(error.absolute_schema_path))
+                if required_key in reported_required:
+                    continue
+                reported_required.add(required_key)
+                for data_path, message in LocalJsonValidator.__missing_property_messages(error):
+                    yield data_path, message
+            else:
+                message_template = MESSAGES.get(error.validator)
+                message = message_template(error.validator_value) if message_template else error.message
+                yield LocalJsonValidator.get_data_path(error.absolute_path), message
+
+    @staticmethod
+    def get_data_path(path) -> str:
+        data_path = ''
+        for key in path:
+            if isinstance(key, int):
+                data_path += f'[{key}]'
+            elif IDENTIFIER.match(key):
+                data_path += f'.{key}'
+            else:
+                escaped_key = key.replace('\\', '\\\\').replace("'", "\\'")
+                data_path += f"['{escaped_key}']"
+        return data_path
+
+    @staticmethod
+    def __missing_property_messages(error: ValidationError) -> Iterator[tuple]:
+        path = list(error.absolute_path)
+        if error.validator == 'required':
+            for required_property in error.validator_value:
+                if required_property not in error.instance:
+                    data_path = LocalJsonValidator.get_data_path(path + [required_property])
+                    yield data_path, f"should have required property '{required_property}'"
+        else:
+            for property_name, dependencies in error.validator_value.items():
+                if property_name not in error.instance or not isinstance(dependencies, list):
+                    continue
+                for dependency in dependencies:
+                    if dependency not in error.instance:
+                        data_path = LocalJsonValidator.get_data_path(path + [dependency])
+                        yield data_path, f'should have property {dependency} when property {property_name} is present'
+
+    @staticmethod
+    def __iter_errors(errors: Iterator[ValidationError]) -> Iterator[ValidationError]:
+        # Errors from the schemas of anyOf / oneOf are reported before the error of the combining keyword
+        for error in sorted(errors, key=LocalJsonValidator.__error_order):
+            if error.context and error.validator in ('anyOf', 'oneOf'):
+                yield from LocalJsonValidator.__iter_errors(error.context)
+            yield error
+
+    @staticmethod
+    def __error_order(error: ValidationError) -> tuple:
+        relative_path = list(error.relative_schema_path)
+        # Errors from within a combining keyword are kept in the order of the schemas that produced them
+        branch = relative_path.pop(0) if relative_path and isinstance(relative_path[0], int) else 0
+        keyword = relative_path[0] if relative_path else error.validator
+        rank = KEYWORD_ORDER.index(keyword) if keyword in KEYWORD_ORDER else len(KEYWORD_ORDER)
+        return branch, rank
@@ -0,0 +1,50 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List
+
+from submission.entity import Entity
+from submission.submission import Submission
+
+
+def run_validations(data: Submission, validations: List[Callable[[Submission], Any]]) -> List[Any]:
+    # Validations that call different services run at the same time, each on its own copy of the submission.
+    # Their errors, and any attributes they add, are merged in the order the validations are listed,
+    # so the result is the same as running them one after another. Returns what each validation returned.
+    if len(validations) <= 1:
+        return [validate(data) for validate in validations]
+    copies = [copy_submission(data) for _ in validations]
+    with ThreadPoolExecutor(max_workers=len(validations)) as pool:
+        futures = [pool.submit(validate, data_copy) for validate, data_copy in zip(validations, copies)]
+        results = []
+        for future, data_copy in zip(futures, copies):
+            # An exception is raised once the validations before it are merged, as it would be when run in turn
+            results.append(future.result())
+            merge_submission(data_copy, data)
+    return results
+
+
+def copy_submission(data: Submission) -> Submission:
+    data_copy = Submission()
+    entity_types = list(data.get_entity_types())
+    for entity_type, entities in data.get_all_entities().items():
+        for entity in entities:
+            entity_copy = data_copy.map(entity_type, entity.identifier.index, dict(entity.attributes))
+            for service, accession in entity.get_accessions():
+                entity_copy.add_accession(service, accession)
+            for linked_type in entity_types:
+                for index in entity.get_linked_indexes(linked_type):
+                    entity_copy.add_link(linked_type, index)
+    return data_copy
+
+
+def merge_submission(data_copy: Submission, data: Submission):
+    for entity_type, entities in data_copy.get_all_entities().items():
+        for entity_copy in entities:
+            merge_entity(entity_copy, data.get_entity(entity_type, entity_copy.identifier.index))
+
+
+def merge_entity(entity_copy: Entity, entity: Entity):
+    # Validators only add attributes, such as the checksum of an uploaded file
+    for attribute, value in entity_copy.attributes.items():
+        entity.attributes.setdefault(attribute, value)
+    for attribute, errors in entity_copy.get_errors().items():
+        entity.add_errors(attribute, errors)
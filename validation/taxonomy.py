@@ -1,37 +1,96 @@
+import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
-from services.ena_taxonomy import EnaTaxonomy
+from services.ena_taxonomy import EnaTaxonomy, SPECIES_KEY, TAX_ID_KEY
+from services.taxonomy_cache import TaxonomyCache
+from services.taxonomy_index import TaxonomyIndex
 from submission.entity import Entity
 from submission.submission import Submission
 from validation.base import BaseValidator
 
+DEFAULT_CONCURRENCY = 8
+
 
 class TaxonomyValidator(BaseValidator):
-    def __init__(self):
-        self.ena_taxonomy = EnaTaxonomy()
+    cache_id = 'ena_taxonomy'
+    # A taxonomy that is not found may be registered later
+    cache_errors = False
+
+    def __init__(self, taxonomy_cache: TaxonomyCache = None, concurrency=DEFAULT_CONCURRENCY, taxonomy_index: TaxonomyIndex = None):
+        self.ena_taxonomy = EnaTaxonomy(cache=taxonomy_cache, index=taxonomy_index)
+        # Up to concurrency lookups are sent to the ENA Taxonomy service at once
+        self.concurrency = concurrency
 
     def validate_data(self, data: Submission):
         entities = data.get_entities('sample')
+        groups = self.group_entities(entities)
         logging.info(f'Validating taxonomy against scientific name in {len(entities)} sample(s)')
-        for entity in entities:
-            self.validate_entity(entity)
+        pending = []
+        for group in groups:
+            cache_key = self.get_cache_key(group[0]) if self.cache else None
+            errors = self.cache.get(self.cache_id, cache_key) if cache_key else None
+            if errors is None:
+                pending.append((group, cache_key))
+                continue
+            for entity in group:
+                self.copy_errors(errors, entity)
+        # Each distinct tax_id and scientific_name is looked up once, however many samples use it
+        lookups = list(dict.fromkeys(lookup for group, _ in pending for lookup in self.get_lookups(group[0])))
+        sample_lookups = sum(len(self.get_lookups(entity)) for group, _ in pending for entity in group)
+        logging.info(f'Looking up {len(lookups)} distinct taxonomy value(s) instead of {sample_lookups}')
+        if self.ena_taxonomy.index:
+            # Lookups in a local index are faster than starting threads
+            responses = {lookup: self.lookup(lookup) for lookup in lookups}
+        else:
+            with ThreadPoolExecutor(max_workers=max(self.concurrency, 1)) as pool:
+                responses = dict(zip(lookups, pool.map(self.lookup, lookups)))
+        for group, cache_key in pending:
+            validated = self.copy_entity(group[0])
+            self.add_taxonomy_errors(validated, responses)
+            errors = validated.get_errors()
+            if cache_key:
+                self.store_errors(cache_key, errors)
+            for entity in group:
+                self.copy_errors(errors, entity)
+
+    def get_fingerprint(self, entity: Entity) -> Optional[str]:
+        return json.dumps(self.get_lookups(entity))
+
+    def get_cache_key(self, entity: Entity) -> Optional[str]:
+        sample = entity.attributes
+        taxonomy = {key: sample[key] for key in (TAX_ID_KEY, SPECIES_KEY) if key in sample}
+        return self.cache.key(self.cache_id, '1', taxonomy) if taxonomy else None
 
     def validate_entity(self, entity: Entity):
+        responses = {lookup: self.lookup(lookup) for lookup in self.get_lookups(entity)}
+        self.add_taxonomy_errors(entity, responses)
+
+    @staticmethod
+    def get_lookups(entity: Entity) -> List[Tuple[str, str]]:
+        sample = entity.attributes
+        return [(key, sample[key]) for key in (SPECIES_KEY, TAX_ID_KEY) if key in sample]
+
+    def lookup(self, lookup: Tuple[str, str]) -> dict:
+        key, value = lookup
+        if key == TAX_ID_KEY:
+            return self.ena_taxonomy.validate_tax_id(value)
+        return self.ena_taxonomy.validate_scientific_name(value)
+
+    def add_taxonomy_errors(self, entity: Entity, responses: Dict[Tuple[str, str], dict]):
         sample = entity.attributes
         sample_errors = {}
-        if 'tax_id' in sample and 'scientific_name' in sample:
-            tax_response = self.ena_taxonomy.validate_taxonomy(
-                tax_id=sample['tax_id'],
-                scientific_name=sample['scientific_name']
+        if TAX_ID_KEY in sample and SPECIES_KEY in sample:
+            tax_id, scientific_name = sample[TAX_ID_KEY], sample[SPECIES_KEY]
+            tax_response = EnaTaxonomy.compare_taxonomy(
+                scientific_name, tax_id, responses[(SPECIES_KEY, scientific_name)], responses[(TAX_ID_KEY, tax_id)]
             )
             sample_errors = self.get_taxonomy_errors(tax_response)
-        else:
-            if 'tax_id' in sample:
-                tax_response = self.ena_taxonomy.validate_tax_id(sample['tax_id'])
-                sample_errors = self.get_errors(tax_response, 'tax_id')
-            elif 'scientific_name' in sample:
-                tax_response = self.ena_taxonomy.validate_scientific_name(sample['scientific_name'])
-                sample_errors = self.get_errors(tax_response, 'scientific_name')
+        elif TAX_ID_KEY in sample:
+            sample_errors = self.get_errors(responses[(TAX_ID_KEY, sample[TAX_ID_KEY])], TAX_ID_KEY)
+        elif SPECIES_KEY in sample:
+            sample_errors = self.get_errors(responses[(SPECIES_KEY, sample[SPECIES_KEY])], SPECIES_KEY)
         for attribute, errors in sample_errors.items():
             entity.add_errors(attribute, errors)
 
@@ -1,3 +1,4 @@
+import hashlib
 import logging
 import re
 from fnmatch import fnmatch
@@ -14,9 +15,13 @@ from .base import BaseValidator
 
 class XMLSchemaValidator(BaseValidator):
     ena_schema = {}
+    schema_version = None
+    cache_id = 'ena_xml_schema'
 
     def __init__(self, ena_converter: EnaSubmissionConverter):
-        self.__load_schema_files()
+        # Schemas are shared by every instance and only parsed once per process
+        if not self.ena_schema:
+            self.__load_schema_files()
         self.converter = ena_converter
         self.regex = re.compile(r'^Element \'(?P<element>.+)\':( \[(?P<type>.+)\])? (?P<error>.*)$')
 
@@ -29,9 +34,23 @@ class XMLSchemaValidator(BaseValidator):
                 schema = self.ena_schema[ena_type]
                 ena_set = etree.XML(f'<{ena_type}_SET />')
                 ena_set.append(self.converter.convert_entity(converter, data, entity))
-
+                # Converted entities include linked entities, so the key is the converted xml
+                cache_key = None
+                if self.cache:
+                    cache_key = self.cache.key(self.cache_id, self.schema_version, [
+                        ena_type, etree.tostring(ena_set, encoding='unicode'), sorted(entity.attributes)
+                    ])
+                    errors = self.cache.get(self.cache_id, cache_key)
+                    if errors is not None:
+                        self.copy_errors(errors, entity)
+                        continue
+                validated = self.copy_entity(entity) if cache_key else entity
                 if not schema(ena_set):
-                    self.add_errors(schema, ena_type, entity_type, entity)
+                    self.add_errors(schema, ena_type, entity_type, validated)
+                if cache_key:
+                    errors = validated.get_errors()
+                    self.store_errors(cache_key, errors)
+                    self.copy_errors(errors, entity)
 
     def add_errors(self, schema, ena_type: str, entity_type: str, entity: Entity):
         for error in schema.error_log:
@@ -45,7 +64,11 @@ class XMLSchemaValidator(BaseValidator):
 
     def __load_schema_files(self):
         schema_dir = join(dirname(__file__), 'schema')
-        for file in listdir(schema_dir):
+        version = hashlib.sha256()
+        for file in sorted(listdir(schema_dir)):
             if fnmatch(file, '*.xsd'):
                 ena_type = splitext(file)[0]
                 self.ena_schema[ena_type] = etree.XMLSchema(etree.parse(join(schema_dir, file)))
+                with open(join(schema_dir, file), 'rb') as schema_file:
+                    version.update(schema_file.read())
+        XMLSchemaValidator.schema_version = version.hexdigest()